@@ -1,6 +1,7 @@
 """Caso de uso para análisis completo de seguridad."""
 
 from typing import Dict, Any, Optional, List
+import asyncio
 import json
 import os
 from datetime import datetime
@@ -25,11 +26,16 @@ class CompleteSecurityAnalysisUseCase:
         self,
         pdf_use_case: ReadPDFUseCase,
         triage_use_case: TriageVulnerabilitiesUseCase,
-        report_exporter: Optional[ReportExporterInterface] = None
+        report_exporter: Optional[ReportExporterInterface] = None,
+        static_agent: Optional[Any] = None,
+        dynamic_agent: Optional[Any] = None
     ):
         self._pdf_use_case = pdf_use_case
         self._triage_use_case = triage_use_case
         self._report_exporter = report_exporter
+        # Agentes opcionales de validación (análisis estático y dinámico)
+        self._static_agent = static_agent
+        self._dynamic_agent = dynamic_agent
     
     def execute(self, pdf_path: str, include_suggestions: bool = True) -> Dict[str, Any]:
         """Ejecuta análisis completo: PDF + Triage.
@@ -70,6 +76,72 @@ class CompleteSecurityAnalysisUseCase:
         except Exception as e:
             raise Exception(f"Error en análisis completo de seguridad: {str(e)}")
     
+    async def aexecute(
+        self,
+        pdf_path: str,
+        source_path: Optional[str] = None,
+        target_url: Optional[str] = None,
+        include_suggestions: bool = True
+    ) -> Dict[str, Any]:
+        """Versión asíncrona de execute con validación estática y dinámica.
+        
+        El análisis del PDF y las validaciones estática (si hay source_path) y
+        dinámica (si hay target_url) se ejecutan concurrentemente; los agentes
+        esperan el mismo análisis del PDF en lugar de repetirlo. El triage se
+        realiza al final, sobre el reporte del PDF.
+        
+        Un fallo en una validación no detiene el análisis: su resultado se
+        registra como {"error": ...}. Un fallo en el análisis del PDF sí.
+        """
+        analysis_start_time = datetime.now()
+        
+        try:
+            print("📄 Analizando reporte PDF y validando vulnerabilidades...")
+            pdf_task = asyncio.ensure_future(self._pdf_use_case.aexecute(pdf_path))
+            
+            async def security_report() -> Dict[str, Any]:
+                return (await pdf_task)["security_report"]
+            
+            report_task = asyncio.ensure_future(security_report())
+            phases = {}
+            if self._static_agent is not None and source_path:
+                phases["static_analysis"] = self._static_agent.avalidate_vulnerabilities(
+                    pdf_path, source_path, report_task
+                )
+            if self._dynamic_agent is not None and target_url:
+                phases["dynamic_analysis"] = self._dynamic_agent.avalidate_vulnerabilities(
+                    pdf_path, target_url, report_task
+                )
+            
+            pdf_analysis, _, *validations = await asyncio.gather(
+                pdf_task, report_task, *phases.values(), return_exceptions=True
+            )
+            if isinstance(pdf_analysis, BaseException):
+                raise pdf_analysis
+            
+            print("🎯 Realizando triage de vulnerabilidades...")
+            triage_analysis = await asyncio.to_thread(
+                self._triage_use_case.execute, pdf_analysis["security_report"]
+            )
+            
+            print("📊 Consolidando análisis...")
+            complete_analysis = self._consolidate_analysis(
+                pdf_analysis,
+                triage_analysis,
+                analysis_start_time,
+                include_suggestions
+            )
+            for name, result in zip(phases, validations):
+                complete_analysis["detailed_analysis"][name] = (
+                    {"error": str(result)} if isinstance(result, BaseException) else result
+                )
+            
+            print("✅ Análisis completo finalizado")
+            return complete_analysis
+            
+        except Exception as e:
+            raise Exception(f"Error en análisis completo de seguridad: {str(e)}")
+    
     def execute_with_export(
         self, 
         pdf_path: str, 
@@ -230,7 +302,7 @@ class CompleteSecurityAnalysisUseCase:
             "overall_risk_score": risk_analysis.get("overall_risk_score", 0.0),
             "avg_confidence": risk_analysis.get("avg_confidence_score", 0.0),
             "severity_breakdown": risk_analysis.get("severity_distribution", {}),
-            "key_recommendations_count": len(triage_report.get("vulnerabilities", [])),
+            "key_recommendations_count": len(triage_report.get("vulnerabilidades", [])),
             "quality_indicators": {
                 "pdf_valid": pdf_analysis["quality_metrics"]["is_valid"],
                 "triage_valid": triage_analysis["quality_metrics"]["is_valid"],
@@ -248,24 +320,23 @@ class CompleteSecurityAnalysisUseCase:
     
     def _generate_security_priorities(self, triage_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Genera prioridades de seguridad basadas en el triage."""
-        vulnerabilities = triage_analysis["triage_report"].get("vulnerabilities", [])
+        vulnerabilities = triage_analysis["triage_report"].get("vulnerabilidades", [])
         
-        # Ordenar por severidad y confianza
+        # Ordenar por prioridad (P0 primero) y confianza
         sorted_vulns = sorted(
             vulnerabilities,
-            key=lambda v: (v["analysis"]["severity_score"], v["analysis"]["confidence_score"]),
-            reverse=True
+            key=lambda v: (v["prioridad"], -v["confianza_analisis"])
         )
         
         priorities = []
         for i, vuln in enumerate(sorted_vulns[:5]):  # Top 5 prioridades
             priorities.append({
                 "rank": i + 1,
-                "vulnerability": vuln["original_finding"]["nombre"],
-                "severity": vuln["analysis"]["final_severity"],
-                "priority": vuln["analysis"]["final_priority"],
-                "confidence": vuln["analysis"]["confidence_score"],
-                "key_recommendation": vuln["recommendations"][0]["description"] if vuln["recommendations"] else "No disponible"
+                "vulnerability": vuln["nombre"],
+                "severity": vuln["severidad_triage"],
+                "priority": vuln["prioridad"],
+                "confidence": vuln["confianza_analisis"],
+                "key_recommendation": vuln["recomendaciones"][0]["descripcion"] if vuln["recomendaciones"] else "No disponible"
             })
         
         return priorities
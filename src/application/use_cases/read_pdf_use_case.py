@@ -1,9 +1,11 @@
 """Caso de uso para lectura y análisis de reportes PDF."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterator, Optional
+import asyncio
 import json
 from datetime import datetime
 
+from ...domain.exceptions import PDFAnalyzerException
 from ...domain.interfaces import DocumentReaderInterface, SecurityAnalyzerInterface
 from ...domain.models import SecurityReport
 from ...domain.services import SecurityAnalysisService, ReportValidationService
@@ -31,60 +33,119 @@ class ReadPDFUseCase:
         self._analysis_service = analysis_service
         self._validation_service = validation_service
     
-    def execute(self, file_path: str) -> Dict[str, Any]:
+    def execute(
+        self,
+        file_path: str,
+        progress_cb: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
         """Ejecuta el caso de uso de lectura y análisis de PDF.
         
         Args:
             file_path: Ruta al archivo PDF
+            progress_cb: Callback opcional que recibe un mensaje en cada cambio de etapa
             
         Returns:
             Dict con el reporte de seguridad y métricas de calidad
             
         Raises:
-            Exception: Si hay errores en la lectura o análisis
+            PDFAnalyzerException: Errores de dominio (archivo inexistente, PDF inválido, LLM...)
+            Exception: Si hay otros errores en la lectura o análisis
         """
         try:
             # Paso 1: Leer el documento PDF
+            if progress_cb:
+                progress_cb("Leyendo archivo PDF...")
             pdf_document = self._pdf_reader.read_pdf(file_path)
             
             # Paso 2: Analizar el contenido de seguridad
+            if progress_cb:
+                progress_cb("Analizando contenido con el modelo de IA...")
             security_report = self._security_analyzer.analyze_content(pdf_document.content)
             
-            # Paso 3: Validar la calidad del reporte
-            is_valid, validation_errors = self._validation_service.validate_security_report(security_report)
+            return self._build_result(file_path, pdf_document, security_report, progress_cb)
             
-            # Paso 4: Extraer indicadores técnicos
-            technical_indicators = self._analysis_service.extract_technical_indicators(security_report)
+        except PDFAnalyzerException:
+            # Errores de dominio (p. ej. PDFNotFoundError) se propagan sin envolver
+            raise
+        except Exception as e:
+            raise Exception(f"Error procesando el archivo PDF '{file_path}': {str(e)}")
+    
+    async def aexecute(
+        self,
+        file_path: str,
+        progress_cb: Optional[Callable[[str], None]] = None,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """Versión asíncrona de execute.
+        
+        La lectura del PDF se delega a un hilo y la llamada al modelo se
+        espera mediante el adaptador asíncrono del analizador. Con stream la
+        respuesta del modelo se recibe por fragmentos y se informa su avance.
+        """
+        try:
+            if progress_cb:
+                progress_cb("Leyendo archivo PDF...")
+            pdf_document = await asyncio.to_thread(self._pdf_reader.read_pdf, file_path)
             
-            # Paso 5: Calcular score de cobertura
-            coverage_score = self._analysis_service.calculate_testing_coverage_score(security_report)
+            if progress_cb:
+                progress_cb("Analizando contenido con el modelo de IA...")
+            if stream:
+                security_report = await self._security_analyzer.astream_analyze_content(
+                    pdf_document.content, progress_cb
+                )
+            else:
+                security_report = await self._security_analyzer.aanalyze_content(pdf_document.content)
             
-            # Paso 6: Obtener sugerencias de mejora
-            improvement_suggestions = self._validation_service.suggest_improvements(security_report)
-            
-            return {
-                "security_report": security_report.model_dump(),
-                "quality_metrics": {
-                    "is_valid": is_valid,
-                    "validation_errors": validation_errors,
-                    "validation_score": self._validation_service.get_validation_score(security_report),
-                    "coverage_score": coverage_score,
-                    "technical_indicators": technical_indicators
-                },
-                "recommendations": {
-                    "improvement_suggestions": improvement_suggestions,
-                    "additional_tests": self._analysis_service.suggest_additional_tests(security_report)
-                },
-                "metadata": {
-                    "analysis_date": datetime.now().isoformat(),
-                    "file_path": file_path,
-                    "document_info": pdf_document.metadata if pdf_document.metadata else None
-                }
-            }
+            return self._build_result(file_path, pdf_document, security_report, progress_cb)
             
+        except PDFAnalyzerException:
+            # Errores de dominio (p. ej. PDFNotFoundError) se propagan sin envolver
+            raise
         except Exception as e:
             raise Exception(f"Error procesando el archivo PDF '{file_path}': {str(e)}")
     
+    def _build_result(
+        self,
+        file_path: str,
+        pdf_document: Any,
+        security_report: Any,
+        progress_cb: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """Valida el reporte y construye el diccionario de resultado."""
+        # Paso 3: Validar la calidad del reporte
+        if progress_cb:
+            progress_cb("Validando y generando JSON estructurado...")
+        is_valid, validation_errors = self._validation_service.validate_security_report(security_report)
+        
+        # Paso 4: Extraer indicadores técnicos
+        technical_indicators = self._analysis_service.extract_technical_indicators(security_report)
+        
+        # Paso 5: Calcular score de cobertura
+        coverage_score = self._analysis_service.calculate_testing_coverage_score(security_report)
+        
+        # Paso 6: Obtener sugerencias de mejora
+        improvement_suggestions = self._validation_service.suggest_improvements(security_report)
+        
+        return {
+            "security_report": security_report.model_dump(),
+            "quality_metrics": {
+                "is_valid": is_valid,
+                "validation_errors": validation_errors,
+                "validation_score": self._validation_service.get_validation_score(security_report),
+                "coverage_score": coverage_score,
+                "technical_indicators": technical_indicators
+            },
+            "recommendations": {
+                "improvement_suggestions": improvement_suggestions,
+                "additional_tests": self._analysis_service.suggest_additional_tests(security_report)
+            },
+            "metadata": {
+                "analysis_date": datetime.now().isoformat(),
+                "file_path": file_path,
+                "document_info": pdf_document.metadata if pdf_document.metadata else None
+            }
+        }
+    
     def execute_with_validation_only(self, file_path: str) -> Dict[str, Any]:
         """Ejecuta solo la lectura y validación básica del PDF.
         
@@ -118,23 +179,80 @@ class ReadPDFUseCase:
         except Exception as e:
             raise Exception(f"Error validando el archivo PDF '{file_path}': {str(e)}")
     
-    def execute_as_json(self, file_path: str, pretty: bool = True) -> str:
+    def execute_as_json(
+        self,
+        file_path: str,
+        pretty: bool = True,
+        progress_cb: Optional[Callable[[str], None]] = None
+    ) -> str:
         """Ejecuta el caso de uso y retorna el resultado como JSON.
         
         Args:
             file_path: Ruta al archivo PDF
             pretty: Si formatear el JSON de manera legible
+            progress_cb: Callback opcional para informar el avance por etapas
             
         Returns:
             String JSON con el resultado del análisis
         """
-        result = self.execute(file_path)
+        result = self.execute(file_path, progress_cb=progress_cb)
+        
+        if pretty:
+            return json.dumps(result, indent=2, ensure_ascii=False, default=str)
+        else:
+            return json.dumps(result, ensure_ascii=False, default=str)
+    
+    async def aexecute_as_json(
+        self,
+        file_path: str,
+        pretty: bool = True,
+        progress_cb: Optional[Callable[[str], None]] = None,
+        stream: bool = False
+    ) -> str:
+        """Versión asíncrona de execute_as_json."""
+        result = await self.aexecute(file_path, progress_cb=progress_cb, stream=stream)
         
         if pretty:
             return json.dumps(result, indent=2, ensure_ascii=False, default=str)
         else:
             return json.dumps(result, ensure_ascii=False, default=str)
     
+    def execute_as_json_stream(
+        self,
+        file_path: str,
+        pretty: bool = True,
+        progress_cb: Optional[Callable[[str], None]] = None
+    ) -> Iterator[str]:
+        """Ejecuta el caso de uso y retorna el JSON como un iterador de fragmentos.
+        
+        El análisis se ejecuta antes de retornar (los errores se propagan aquí);
+        solo la serialización es incremental, para escribirla a disco sin
+        construir el string completo en memoria.
+        
+        Args:
+            file_path: Ruta al archivo PDF
+            pretty: Si formatear el JSON de manera legible
+            progress_cb: Callback opcional para informar el avance por etapas
+            
+        Returns:
+            Iterador de fragmentos de texto JSON
+        """
+        result = self.execute(file_path, progress_cb=progress_cb)
+        encoder = json.JSONEncoder(indent=2 if pretty else None, ensure_ascii=False, default=str)
+        return encoder.iterencode(result)
+    
+    async def aexecute_as_json_stream(
+        self,
+        file_path: str,
+        pretty: bool = True,
+        progress_cb: Optional[Callable[[str], None]] = None,
+        stream: bool = False
+    ) -> Iterator[str]:
+        """Versión asíncrona de execute_as_json_stream (admite stream del modelo)."""
+        result = await self.aexecute(file_path, progress_cb=progress_cb, stream=stream)
+        encoder = json.JSONEncoder(indent=2 if pretty else None, ensure_ascii=False, default=str)
+        return encoder.iterencode(result)
+    
     def get_quick_summary(self, file_path: str) -> Dict[str, Any]:
         """Obtiene un resumen rápido del reporte sin análisis completo.
         
@@ -5,10 +5,21 @@ import json
 from datetime import datetime
 
 from ...domain.interfaces import TriageAnalyzerInterface, ReportRepositoryInterface
-from ...domain.models import SecurityReport, TriageReport, TriagedVulnerability
+from ...domain.models import SecurityReport, TriagedVulnerability
+from ...domain.models.security import SeverityLevel, PriorityLevel
 from ...domain.services import TriageService, ReportValidationService
 
 
+# Score de severidad (0-10) usado para promediar la severidad de un triage
+_SEVERITY_SCORES = {
+    SeverityLevel.CRITICAL: 10.0,
+    SeverityLevel.HIGH: 7.0,
+    SeverityLevel.MEDIUM: 4.0,
+    SeverityLevel.LOW: 2.0,
+    SeverityLevel.INFO: 0.5
+}
+
+
 class TriageVulnerabilitiesUseCase:
     """Caso de uso para realizar triage de vulnerabilidades.
     
@@ -44,43 +55,26 @@ class TriageVulnerabilitiesUseCase:
             Exception: Si hay errores en el análisis de triage
         """
         try:
-            # Paso 1: Convertir a modelo de dominio si es necesario
-            if isinstance(security_report, dict):
-                security_report_obj = SecurityReport.model_validate(security_report)
-            else:
-                security_report_obj = security_report
+            # Paso 1: El agente de triage trabaja sobre el diccionario del reporte
+            if isinstance(security_report, SecurityReport):
+                security_report = security_report.model_dump()
             
             # Paso 2: Realizar análisis de triage con IA
-            triage_report = self._triage_analyzer.analyze_vulnerabilities(security_report_obj)
+            final_triage_report = self._triage_analyzer.analyze_vulnerabilities(security_report)
+            vulnerabilities = final_triage_report.vulnerabilidades
             
-            # Paso 3: Aplicar lógica de negocio adicional
-            enhanced_vulnerabilities = []
-            for vuln in triage_report.vulnerabilities:
-                enhanced_vuln = self._enhance_vulnerability_analysis(vuln)
-                enhanced_vulnerabilities.append(enhanced_vuln)
-            
-            # Paso 4: Recalcular resumen con lógica de negocio
-            updated_summary = self._triage_service.calculate_summary_statistics(enhanced_vulnerabilities)
-            
-            # Paso 5: Crear reporte final
-            final_triage_report = TriageReport(
-                vulnerabilities=enhanced_vulnerabilities,
-                summary=updated_summary,
-                metadata=triage_report.metadata
-            )
-            
-            # Paso 6: Validar el reporte de triage
+            # Paso 3: Validar el reporte de triage
             is_valid, validation_errors = self._validation_service.validate_triage_report(final_triage_report)
             
-            # Paso 7: Calcular métricas adicionales
-            risk_metrics = self._calculate_risk_metrics(enhanced_vulnerabilities)
+            # Paso 4: Calcular métricas adicionales
+            risk_metrics = self._calculate_risk_metrics(vulnerabilities)
             
             result = {
                 "triage_report": final_triage_report.model_dump(),
                 "quality_metrics": {
                     "is_valid": is_valid,
                     "validation_errors": validation_errors,
-                    "total_vulnerabilities": len(enhanced_vulnerabilities),
+                    "total_vulnerabilities": len(vulnerabilities),
                     "avg_severity_score": risk_metrics["avg_severity_score"],
                     "avg_confidence_score": risk_metrics["avg_confidence_score"]
                 },
@@ -91,7 +85,7 @@ class TriageVulnerabilitiesUseCase:
                 }
             }
             
-            # Paso 8: Guardar en repositorio si está disponible
+            # Paso 5: Guardar en repositorio si está disponible
             if self._repository:
                 self._repository.save_triage_report(final_triage_report)
             
@@ -144,58 +138,6 @@ class TriageVulnerabilitiesUseCase:
         except Exception as e:
             raise Exception(f"Error en triage de vulnerabilidades específicas: {str(e)}")
     
-    def _enhance_vulnerability_analysis(self, vulnerability: TriagedVulnerability) -> TriagedVulnerability:
-        """Mejora el análisis de una vulnerabilidad con lógica de negocio."""
-        # Recalcular severidad con lógica de dominio
-        enhanced_severity = self._triage_service.calculate_severity_level(
-            vulnerability.analysis.severity_score,
-            vulnerability.analysis.impact_level,
-            vulnerability.analysis.exploit_probability
-        )
-        
-        # Recalcular prioridad
-        enhanced_priority = self._triage_service.calculate_priority_level(
-            enhanced_severity,
-            vulnerability.analysis.confidence_score,
-            vulnerability.evidence
-        )
-        
-        # Calcular score de confianza mejorado
-        enhanced_confidence = self._triage_service.calculate_confidence_score(
-            vulnerability.evidence,
-            vulnerability.original_finding.detailed_proof_of_concept is not None
-        )
-        
-        # Generar plan de remediación
-        remediation_plan = self._triage_service.generate_remediation_plan(
-            vulnerability.original_finding,
-            enhanced_severity,
-            enhanced_priority
-        )
-        
-        # Crear análisis mejorado
-        enhanced_analysis = vulnerability.analysis.model_copy(update={
-            "final_severity": enhanced_severity,
-            "final_priority": enhanced_priority,
-            "confidence_score": enhanced_confidence
-        })
-        
-        # Agregar recomendación de remediación si no existe
-        enhanced_recommendations = list(vulnerability.recommendations)
-        if remediation_plan and remediation_plan not in [rec.description for rec in enhanced_recommendations]:
-            from ...domain.models.triage import TriageRecommendation, RecommendationType
-            remediation_rec = TriageRecommendation(
-                type=RecommendationType.REMEDIATION,
-                description=remediation_plan,
-                priority="alta" if enhanced_priority in ["crítica", "alta"] else "media"
-            )
-            enhanced_recommendations.append(remediation_rec)
-        
-        return vulnerability.model_copy(update={
-            "analysis": enhanced_analysis,
-            "recommendations": enhanced_recommendations
-        })
-    
     def _calculate_risk_metrics(self, vulnerabilities: List[TriagedVulnerability]) -> Dict[str, Any]:
         """Calcula métricas de riesgo para el conjunto de vulnerabilidades."""
         if not vulnerabilities:
@@ -204,30 +146,26 @@ class TriageVulnerabilitiesUseCase:
                 "avg_confidence_score": 0.0,
                 "overall_risk_score": 0.0,
                 "critical_vulnerabilities": 0,
-                "high_confidence_vulnerabilities": 0
+                "high_confidence_vulnerabilities": 0,
+                "severity_distribution": self._get_severity_distribution(vulnerabilities),
+                "priority_distribution": self._get_priority_distribution(vulnerabilities)
             }
         
         # Calcular promedios
-        total_severity = sum(vuln.analysis.severity_score for vuln in vulnerabilities)
-        total_confidence = sum(vuln.analysis.confidence_score for vuln in vulnerabilities)
+        total_severity = sum(_SEVERITY_SCORES.get(vuln.severidad_triage, 0.0) for vuln in vulnerabilities)
+        total_confidence = sum(vuln.confianza_analisis for vuln in vulnerabilities)
         
         avg_severity = total_severity / len(vulnerabilities)
         avg_confidence = total_confidence / len(vulnerabilities)
         
         # Calcular riesgo general usando el servicio de dominio
-        overall_risk = self._triage_service.assess_overall_risk(vulnerabilities)
+        overall_risk = self._triage_service.calculate_overall_risk_score(vulnerabilities)
         
         # Contar vulnerabilidades críticas
-        critical_count = sum(
-            1 for vuln in vulnerabilities 
-            if vuln.analysis.final_severity.lower() in ['crítica', 'critical']
-        )
+        critical_count = sum(1 for vuln in vulnerabilities if vuln.severidad_triage == SeverityLevel.CRITICAL)
         
         # Contar vulnerabilidades con alta confianza
-        high_confidence_count = sum(
-            1 for vuln in vulnerabilities 
-            if vuln.analysis.confidence_score >= 0.8
-        )
+        high_confidence_count = sum(1 for vuln in vulnerabilities if vuln.confianza_analisis >= 0.8)
         
         return {
             "avg_severity_score": round(avg_severity, 2),
@@ -241,42 +179,16 @@ class TriageVulnerabilitiesUseCase:
     
     def _get_severity_distribution(self, vulnerabilities: List[TriagedVulnerability]) -> Dict[str, int]:
         """Obtiene la distribución de severidades."""
-        distribution = {"crítica": 0, "alta": 0, "media": 0, "baja": 0, "informativa": 0}
-        
+        distribution = {level.value: 0 for level in SeverityLevel}
         for vuln in vulnerabilities:
-            severity = vuln.analysis.final_severity.lower()
-            if severity in distribution:
-                distribution[severity] += 1
-            elif severity in ['critical']:
-                distribution['crítica'] += 1
-            elif severity in ['high']:
-                distribution['alta'] += 1
-            elif severity in ['medium']:
-                distribution['media'] += 1
-            elif severity in ['low']:
-                distribution['baja'] += 1
-            elif severity in ['info', 'informational']:
-                distribution['informativa'] += 1
-        
+            distribution[vuln.severidad_triage] += 1
         return distribution
     
     def _get_priority_distribution(self, vulnerabilities: List[TriagedVulnerability]) -> Dict[str, int]:
         """Obtiene la distribución de prioridades."""
-        distribution = {"crítica": 0, "alta": 0, "media": 0, "baja": 0}
-        
+        distribution = {level.value: 0 for level in PriorityLevel}
         for vuln in vulnerabilities:
-            priority = vuln.analysis.final_priority.lower()
-            if priority in distribution:
-                distribution[priority] += 1
-            elif priority in ['critical']:
-                distribution['crítica'] += 1
-            elif priority in ['high']:
-                distribution['alta'] += 1
-            elif priority in ['medium']:
-                distribution['media'] += 1
-            elif priority in ['low']:
-                distribution['baja'] += 1
-        
+            distribution[vuln.prioridad] += 1
         return distribution
     
     def execute_as_json(self, security_report: Dict[str, Any], pretty: bool = True) -> str:
@@ -3,8 +3,9 @@
 Cada interface tiene una responsabilidad específica y bien definida.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional
 from .models import PDFDocument, SecurityReport, TriageReport
 
 
@@ -42,6 +43,22 @@ class SecurityAnalyzerInterface(ABC):
     def analyze_content(self, content: str) -> SecurityReport:
         """Analiza contenido y genera un reporte de seguridad."""
         pass
+    
+    async def aanalyze_content(self, content: str) -> SecurityReport:
+        """Versión asíncrona de analyze_content (por defecto, en un hilo de trabajo)."""
+        return await asyncio.to_thread(self.analyze_content, content)
+    
+    async def astream_analyze_content(
+        self,
+        content: str,
+        progress_cb: Optional[Callable[[str], None]] = None
+    ) -> SecurityReport:
+        """Analiza el contenido recibiendo la respuesta del LLM por fragmentos.
+        
+        progress_cb recibe mensajes de avance mientras llega la respuesta. Por
+        defecto no hay streaming y equivale a aanalyze_content.
+        """
+        return await self.aanalyze_content(content)
 
 
 class TriageAnalyzerInterface(ABC):
@@ -63,6 +80,29 @@ class LLMInterface(ABC):
         """Genera una respuesta basada en el prompt y contenido opcional."""
         pass
     
+    async def agenerate_response(self, prompt: str, content: str = "") -> str:
+        """Versión asíncrona de generate_response (por defecto, en un hilo de trabajo)."""
+        return await asyncio.to_thread(self.generate_response, prompt, content)
+    
+    async def astream_response(self, prompt: str, content: str = "") -> AsyncIterator[str]:
+        """Genera la respuesta como fragmentos de texto a medida que llegan.
+        
+        Por defecto emite la respuesta completa como un único fragmento.
+        """
+        yield await self.agenerate_response(prompt, content)
+    
+    # Indica si generate_batch usa una Batch API del proveedor
+    supports_batch: bool = False
+    
+    def generate_batch(self, prompt: str, contents: List[str]) -> List[Optional[str]]:
+        """Genera una respuesta por contenido, todas con el mismo prompt.
+        
+        Por defecto realiza una llamada por contenido. Los adaptadores con
+        Batch API envían todo en un único lote; un elemento None indica una
+        petición que el lote no pudo completar.
+        """
+        return [self.generate_response(prompt, content) for content in contents]
+    
     @abstractmethod
     def is_available(self) -> bool:
         """Verifica si el LLM está disponible para uso."""
@@ -5,6 +5,7 @@ from datetime import datetime
 import re
 
 from ..models import SecurityReport, TriageReport, Finding, TriagedVulnerability
+from ..models.security import SeverityLevel
 
 
 class ReportValidationService:
@@ -32,11 +33,11 @@ class ReportValidationService:
     ]
     
     REQUIRED_TRIAGE_REPORT_FIELDS = [
-        'vulnerabilities',
-        'summary.total_vulnerabilities',
-        'summary.critical_count',
-        'summary.high_count',
-        'metadata.analysis_date'
+        'vulnerabilidades',
+        'total_vulnerabilidades',
+        'distribucion_severidad',
+        'distribucion_prioridad',
+        'fecha_generacion'
     ]
     
     def validate_security_report(self, report: SecurityReport) -> Tuple[bool, List[str]]:
@@ -67,9 +68,9 @@ class ReportValidationService:
         errors = []
         
         # Validaciones básicas
-        errors.extend(self._validate_triaged_vulnerabilities(report.vulnerabilities))
-        errors.extend(self._validate_triage_summary(report.summary))
-        errors.extend(self._validate_triage_metadata(report.metadata))
+        errors.extend(self._validate_triaged_vulnerabilities(report.vulnerabilidades))
+        errors.extend(self._validate_triage_summary(report))
+        errors.extend(self._validate_triage_metadata(report))
         
         # Validaciones de consistencia
         errors.extend(self._validate_triage_consistency(report))
@@ -200,67 +201,52 @@ class ReportValidationService:
         
         for i, vuln in enumerate(vulnerabilities, 1):
             # Validar campos obligatorios
-            if not vuln.original_finding.nombre:
-                errors.append(f"Vulnerabilidad {i}: El nombre del hallazgo original es obligatorio")
+            if not vuln.nombre or not vuln.nombre.strip():
+                errors.append(f"Vulnerabilidad {i}: El nombre es obligatorio")
             
-            if not vuln.analysis.severity_score or vuln.analysis.severity_score < 0 or vuln.analysis.severity_score > 10:
-                errors.append(f"Vulnerabilidad {i}: El score de severidad debe estar entre 0 y 10")
-            
-            if not vuln.analysis.confidence_score or vuln.analysis.confidence_score < 0 or vuln.analysis.confidence_score > 1:
-                errors.append(f"Vulnerabilidad {i}: El score de confianza debe estar entre 0 y 1")
+            if not vuln.justificacion_severidad or not vuln.justificacion_severidad.strip():
+                errors.append(f"Vulnerabilidad {i}: La justificación de severidad es obligatoria")
             
             # Validar que tenga al menos una recomendación
-            if not vuln.recommendations:
+            if not vuln.recomendaciones:
                 errors.append(f"Vulnerabilidad {i}: Debe tener al menos una recomendación")
             
             # Validar evidencia si existe
-            if vuln.evidence:
-                for j, evidence in enumerate(vuln.evidence, 1):
-                    if not evidence.description:
-                        errors.append(f"Vulnerabilidad {i}, Evidencia {j}: La descripción es obligatoria")
+            for j, evidence in enumerate(vuln.evidencias, 1):
+                if not evidence.descripcion:
+                    errors.append(f"Vulnerabilidad {i}, Evidencia {j}: La descripción es obligatoria")
         
         return errors
     
-    def _validate_triage_summary(self, summary) -> List[str]:
+    def _validate_triage_summary(self, report: TriageReport) -> List[str]:
         """Valida el resumen del triage."""
         errors = []
         
         # Validar que los conteos sean consistentes
-        total_calculated = (summary.critical_count + summary.high_count + 
-                          summary.medium_count + summary.low_count + summary.info_count)
-        
-        if summary.total_vulnerabilities != total_calculated:
-            errors.append(f"Inconsistencia en conteos: total ({summary.total_vulnerabilities}) != suma de severidades ({total_calculated})")
-        
-        # Validar que los conteos no sean negativos
-        counts = {
-            'total': summary.total_vulnerabilities,
-            'críticas': summary.critical_count,
-            'altas': summary.high_count,
-            'medias': summary.medium_count,
-            'bajas': summary.low_count,
-            'informativas': summary.info_count
-        }
-        
-        for name, count in counts.items():
-            if count < 0:
-                errors.append(f"El conteo de vulnerabilidades {name} no puede ser negativo")
+        for name, distribution in (('severidad', report.distribucion_severidad),
+                                   ('prioridad', report.distribucion_prioridad)):
+            total_calculated = sum(distribution.values())
+            if report.total_vulnerabilidades != total_calculated:
+                errors.append(f"Inconsistencia en conteos: total ({report.total_vulnerabilidades}) != suma por {name} ({total_calculated})")
+            
+            # Validar que los conteos no sean negativos
+            for key, count in distribution.items():
+                if count < 0:
+                    errors.append(f"El conteo de vulnerabilidades de {name} '{key}' no puede ser negativo")
         
         return errors
     
-    def _validate_triage_metadata(self, metadata) -> List[str]:
+    def _validate_triage_metadata(self, report: TriageReport) -> List[str]:
         """Valida los metadatos del triage."""
         errors = []
         
-        # Fecha de análisis
-        if not metadata.analysis_date:
-            errors.append("La fecha de análisis es obligatoria")
-        elif metadata.analysis_date > datetime.now():
-            errors.append("La fecha de análisis no puede ser futura")
+        # Fecha de generación
+        if report.fecha_generacion > datetime.now():
+            errors.append("La fecha de generación no puede ser futura")
         
-        # Analista
-        if not metadata.analyst or not metadata.analyst.strip():
-            errors.append("El analista es obligatorio")
+        # Reporte de origen
+        if not report.reporte_origen or not report.reporte_origen.strip():
+            errors.append("El reporte de origen es obligatorio")
         
         return errors
     
@@ -286,48 +272,25 @@ class ReportValidationService:
         """Valida la consistencia interna del reporte de triage."""
         errors = []
         
-        # Verificar que el resumen coincida con las vulnerabilidades
-        actual_counts = self._count_vulnerabilities_by_severity(report.vulnerabilities)
-        
-        if actual_counts['critical'] != report.summary.critical_count:
-            errors.append(f"Conteo de vulnerabilidades críticas inconsistente: esperado {report.summary.critical_count}, actual {actual_counts['critical']}")
-        
-        if actual_counts['high'] != report.summary.high_count:
-            errors.append(f"Conteo de vulnerabilidades altas inconsistente: esperado {report.summary.high_count}, actual {actual_counts['high']}")
-        
-        if actual_counts['medium'] != report.summary.medium_count:
-            errors.append(f"Conteo de vulnerabilidades medias inconsistente: esperado {report.summary.medium_count}, actual {actual_counts['medium']}")
+        if report.total_vulnerabilidades != len(report.vulnerabilidades):
+            errors.append(f"Total de vulnerabilidades inconsistente: esperado {report.total_vulnerabilidades}, actual {len(report.vulnerabilidades)}")
         
-        if actual_counts['low'] != report.summary.low_count:
-            errors.append(f"Conteo de vulnerabilidades bajas inconsistente: esperado {report.summary.low_count}, actual {actual_counts['low']}")
+        # Verificar que la distribución coincida con las vulnerabilidades
+        actual_counts = self._count_vulnerabilities_by_severity(report.vulnerabilidades)
         
-        if actual_counts['info'] != report.summary.info_count:
-            errors.append(f"Conteo de vulnerabilidades informativas inconsistente: esperado {report.summary.info_count}, actual {actual_counts['info']}")
+        for severity, actual in actual_counts.items():
+            expected = report.distribucion_severidad.get(severity, 0)
+            if actual != expected:
+                errors.append(f"Conteo de vulnerabilidades de severidad '{severity}' inconsistente: esperado {expected}, actual {actual}")
         
         return errors
     
     def _count_vulnerabilities_by_severity(self, vulnerabilities: List[TriagedVulnerability]) -> Dict[str, int]:
         """Cuenta vulnerabilidades por severidad."""
-        counts = {
-            'critical': 0,
-            'high': 0,
-            'medium': 0,
-            'low': 0,
-            'info': 0
-        }
+        counts = {level.value: 0 for level in SeverityLevel}
         
         for vuln in vulnerabilities:
-            severity = vuln.analysis.final_severity.lower()
-            if severity in ['crítica', 'critical']:
-                counts['critical'] += 1
-            elif severity in ['alta', 'high']:
-                counts['high'] += 1
-            elif severity in ['media', 'medium']:
-                counts['medium'] += 1
-            elif severity in ['baja', 'low']:
-                counts['low'] += 1
-            elif severity in ['informativa', 'info', 'informational']:
-                counts['info'] += 1
+            counts[vuln.severidad_triage] += 1
         
         return counts
     
@@ -2,19 +2,13 @@
 
 This package contains the infrastructure layer implementation,
 organized into adapters and services following Clean Architecture principles.
-"""
-
-# Import adapters
-from .adapters.llm import *
-from .adapters.persistence import *
-from .adapters.external import *
 
-# Import services
-from .services import *
+Los subpaquetes (adaptadores con LangChain, PyPDF2, PyMongo y los agentes) se
+cargan al acceder por primera vez a uno de sus nombres, de modo que importar
+un módulo concreto como `src.infrastructure.utils.config` no los arrastra.
+"""
 
-# Import utilities
-from .utils.factory import DependencyFactory, get_factory
-from .utils.config import get_settings, validate_environment, get_available_providers
+import importlib
 
 __all__ = [
     # Factory
@@ -24,4 +18,39 @@ __all__ = [
     'get_settings',
     'validate_environment', 
     'get_available_providers',
-]
\ No newline at end of file
+]
+
+# Nombre -> módulo que lo define
+_LAZY_NAMES = {
+    'DependencyFactory': '.utils.factory',
+    'get_factory': '.utils.factory',
+    'get_settings': '.utils.config',
+    'validate_environment': '.utils.config',
+    'get_available_providers': '.utils.config',
+}
+
+_SUBPACKAGES = ('adapters', 'services', 'utils')
+
+# Subpaquetes reexportados antes con `import *`, en orden de búsqueda
+_LAZY_PACKAGES = (
+    '.adapters.llm',
+    '.adapters.persistence',
+    '.adapters.external',
+    '.services',
+)
+
+
+def __getattr__(name: str):
+    """Importa perezosamente los nombres públicos de la capa de infraestructura."""
+    if name.startswith('__'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f'.{name}', __name__)
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is not None:
+        return getattr(importlib.import_module(module_name, __name__), name)
+    for package in _LAZY_PACKAGES:
+        value = getattr(importlib.import_module(package, __name__), name, None)
+        if value is not None:
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,15 @@
 """External adapters package.
 
 This package contains adapters for external tools and services.
+Las herramientas se importan al acceder a uno de sus nombres.
 """
 
-from .tools import *
\ No newline at end of file
+import importlib
+
+
+def __getattr__(name: str):
+    module = importlib.import_module(".tools", __name__)
+    try:
+        return getattr(module, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
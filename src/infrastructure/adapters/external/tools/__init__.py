@@ -1,8 +1,20 @@
 """Herramientas de infraestructura."""
 
-from .pdf_reader import PyPDF2Reader
-from .file_reader_tool import FileReaderTool
-from .semgrep_analyzer_tool import SemgrepAnalyzerTool
-from .network_tool import NetworkTool
+import importlib
 
-__all__ = ['PyPDF2Reader', 'FileReaderTool', 'SemgrepAnalyzerTool', 'NetworkTool']
\ No newline at end of file
+__all__ = ['PyPDF2Reader', 'FileReaderTool', 'SemgrepAnalyzerTool', 'NetworkTool']
+
+# Nombre -> submódulo que lo define (se importa al primer acceso)
+_LAZY_NAMES = {
+    'PyPDF2Reader': '.pdf_reader',
+    'FileReaderTool': '.file_reader_tool',
+    'SemgrepAnalyzerTool': '.semgrep_analyzer_tool',
+    'NetworkTool': '.network_tool',
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
@@ -4,8 +4,12 @@ import subprocess
 import json
 import tempfile
 import os
+import io
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 import urllib3
+import xml.etree.ElementTree as ET
 from typing import Dict, Any, List, Optional
 from urllib.parse import urlparse, urljoin, parse_qs
 import shlex
@@ -13,6 +17,125 @@ import shlex
 # Deshabilitar advertencias SSL para pruebas de penetración
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+def _decode(data: bytes) -> str:
+    """Decodifica la salida binaria de un proceso sin depender del locale."""
+    return data.decode('utf-8', 'replace')
+
+
+def _format_process_result(result: subprocess.CompletedProcess) -> str:
+    """Formatea la salida binaria de un proceso al estilo de las herramientas CLI."""
+    return f"Status Code: {result.returncode}\n\nSTDOUT:\n{_decode(result.stdout)}\n\nSTDERR:\n{_decode(result.stderr)}"
+
+
+# Máximo de peticiones concurrentes en las pruebas por lotes
+_BATCH_MAX_WORKERS = 16
+
+
+# Flags de nmap por tipo de escaneo
+_NMAP_SCAN_FLAGS = {
+    "basic": ['-sS', '-O', '-sV'],
+    "fast": ['-F'],
+    "comprehensive": ['-sS', '-sU', '-O', '-sV', '-sC'],
+    "vuln": ['--script=vuln'],
+}
+
+
+def _format_nmap_host(host_elem: ET.Element) -> str:
+    """Resume en texto legible el elemento <host> de la salida XML de nmap."""
+    address = host_elem.find('address')
+    status = host_elem.find('status')
+    lines = [
+        f"Host: {address.get('addr') if address is not None else 'desconocido'} "
+        f"({status.get('state') if status is not None else 'desconocido'})"
+    ]
+    
+    for port in host_elem.iterfind('ports/port'):
+        state = port.find('state')
+        service = port.find('service')
+        service_desc = ""
+        if service is not None:
+            service_desc = " ".join(
+                filter(None, [service.get('name'), service.get('product'), service.get('version')])
+            )
+        lines.append(
+            f"{port.get('portid')}/{port.get('protocol')} "
+            f"{state.get('state') if state is not None else 'unknown'} {service_desc}".rstrip()
+        )
+        for script in port.iterfind('script'):
+            lines.append(f"  |_{script.get('id')}: {script.get('output', '').strip()}")
+    
+    for script in host_elem.iterfind('hostscript/script'):
+        lines.append(f"|_{script.get('id')}: {script.get('output', '').strip()}")
+    
+    osmatch = host_elem.find('os/osmatch')
+    if osmatch is not None:
+        lines.append(f"OS: {osmatch.get('name')} ({osmatch.get('accuracy')}%)")
+    
+    return "\n".join(lines)
+
+
+def batch_nmap_scan(hosts: List[str], scan_type: str = "basic", ports: Optional[str] = None) -> Dict[str, str]:
+    """Escanea varios hosts con una única invocación de nmap.
+    
+    Comparte el arranque del proceso y el planificador de nmap entre todos los
+    objetivos y separa la salida XML (`-oX -`) por host.
+    
+    Args:
+        hosts: Hosts a escanear (sin puerto)
+        scan_type: Tipo de escaneo ('basic', 'fast', 'comprehensive', 'vuln')
+        ports: Puertos específicos a escanear (opcional)
+    
+    Returns:
+        Diccionario host -> resultado formateado del escaneo
+    """
+    cmd = ['nmap', '-oX', '-', '--min-parallelism', '64', '--max-retries', '2']
+    cmd.extend(_NMAP_SCAN_FLAGS.get(scan_type, []))
+    
+    # Agregar puertos específicos
+    if ports:
+        cmd.extend(['-p', ports])
+    
+    cmd.extend(hosts)
+    
+    # Ejecutar comando
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=300)
+    except subprocess.TimeoutExpired:
+        return {host: "Error: Timeout en el escaneo nmap" for host in hosts}
+    except Exception as e:
+        return {host: f"Error ejecutando nmap: {str(e)}" for host in hosts}
+    
+    # Sin XML (p. ej. argumentos inválidos): informar el código de salida y stderr tal cual
+    if not result.stdout.strip():
+        return {host: _format_process_result(result) for host in hosts}
+    
+    # Separar la salida XML por host
+    requested = set(hosts)
+    host_output = {}
+    try:
+        for _, elem in ET.iterparse(io.BytesIO(result.stdout)):
+            if elem.tag != 'host':
+                continue
+            names = [a.get('addr') for a in elem.iterfind('address')]
+            names += [h.get('name') for h in elem.iterfind('hostnames/hostname')]
+            key = next((n for n in names if n in requested), names[0] if names else None)
+            if key is not None:
+                host_output[key] = _format_nmap_host(elem)
+            elem.clear()
+    except ET.ParseError as e:
+        error = (
+            f"Error parseando salida XML de nmap: {str(e)}\n"
+            f"Status Code: {result.returncode}\n\nSTDERR:\n{_decode(result.stderr)}"
+        )
+        return {host: error for host in hosts}
+    
+    stderr = _decode(result.stderr)
+    return {
+        host: f"Status Code: {result.returncode}\n\nSTDOUT:\n"
+              f"{host_output.get(host, f'Host: {host} (sin resultados)')}\n\nSTDERR:\n{stderr}"
+        for host in hosts
+    }
+
 
 class NetworkTool:
     """Herramienta para realizar pruebas de red y explotación de vulnerabilidades."""
@@ -22,6 +145,8 @@ class NetworkTool:
         self.parsed_url = urlparse(target_url)
         self.base_host = self.parsed_url.netloc
         self.base_scheme = self.parsed_url.scheme
+        # Host sin puerto (urlparse ya resuelve también direcciones IPv6 como [::1]:8080)
+        self.bare_host = self.parsed_url.hostname or self.base_host.split(':')[0]
     
     def curl_request(self, curl_args: str) -> str:
         """Realiza una petición HTTP usando requests (simulando curl).
@@ -169,9 +294,9 @@ class NetworkTool:
             cmd.append(url)
             
             # Ejecutar comando
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            result = subprocess.run(cmd, capture_output=True, timeout=60)
             
-            return f"Status Code: {result.returncode}\n\nSTDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
+            return _format_process_result(result)
             
         except subprocess.TimeoutExpired:
             return "Error: Timeout en la descarga wget"
@@ -180,48 +305,18 @@ class NetworkTool:
     
     def nmap_scan(self, scan_type: str = "basic", ports: Optional[str] = None) -> str:
         """Realiza escaneo de puertos usando nmap."""
-        try:
-            host = self.base_host.split(':')[0]  # Remover puerto si existe
-            
-            # Construir comando nmap
-            cmd = ['nmap']
-            
-            if scan_type == "basic":
-                cmd.extend(['-sS', '-O', '-sV'])
-            elif scan_type == "fast":
-                cmd.extend(['-F'])
-            elif scan_type == "comprehensive":
-                cmd.extend(['-sS', '-sU', '-O', '-sV', '-sC'])
-            elif scan_type == "vuln":
-                cmd.extend(['--script=vuln'])
-            
-            # Agregar puertos específicos
-            if ports:
-                cmd.extend(['-p', ports])
-            
-            # Agregar host
-            cmd.append(host)
-            
-            # Ejecutar comando
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-            
-            return f"Status Code: {result.returncode}\n\nSTDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
-            
-        except subprocess.TimeoutExpired:
-            return "Error: Timeout en el escaneo nmap"
-        except Exception as e:
-            return f"Error ejecutando nmap: {str(e)}"
+        return batch_nmap_scan([self.bare_host], scan_type, ports)[self.bare_host]
     
     def ping_host(self, host: Optional[str] = None, count: int = 4) -> str:
         """Realiza ping al host objetivo."""
         try:
             # Usar el host proporcionado o el host base
-            target_host = host if host else self.base_host.split(':')[0]
+            target_host = host if host else self.bare_host
             
             cmd = ['ping', '-c', str(count), target_host]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = subprocess.run(cmd, capture_output=True, timeout=30)
             
-            return f"Status Code: {result.returncode}\n\nSTDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
+            return _format_process_result(result)
             
         except subprocess.TimeoutExpired:
             return "Error: Timeout en ping"
@@ -231,13 +326,11 @@ class NetworkTool:
     def telnet_connect(self, port: int = 80, timeout: int = 10) -> str:
         """Intenta conexión telnet al host y puerto especificado."""
         try:
-            host = self.base_host.split(':')[0]
-            
             # Usar timeout command para limitar la conexión telnet
-            cmd = ['timeout', str(timeout), 'telnet', host, str(port)]
-            result = subprocess.run(cmd, capture_output=True, text=True, input='\n')
+            cmd = ['timeout', str(timeout), 'telnet', self.bare_host, str(port)]
+            result = subprocess.run(cmd, capture_output=True, input=b'\n')
             
-            return f"Status Code: {result.returncode}\n\nSTDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
+            return _format_process_result(result)
             
         except Exception as e:
             return f"Error ejecutando telnet: {str(e)}"
@@ -245,14 +338,12 @@ class NetworkTool:
     def netcat_connect(self, port: int, data: Optional[str] = None, timeout: int = 10) -> str:
         """Realiza conexión usando netcat."""
         try:
-            host = self.base_host.split(':')[0]
-            
-            cmd = ['nc', '-w', str(timeout), host, str(port)]
+            cmd = ['nc', '-w', str(timeout), self.bare_host, str(port)]
             
-            input_data = data if data else '\n'
-            result = subprocess.run(cmd, capture_output=True, text=True, input=input_data, timeout=timeout + 5)
+            input_data = data.encode('utf-8') if data else b'\n'
+            result = subprocess.run(cmd, capture_output=True, input=input_data, timeout=timeout + 5)
             
-            return f"Status Code: {result.returncode}\n\nSTDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
+            return _format_process_result(result)
             
         except subprocess.TimeoutExpired:
             return "Error: Timeout en conexión netcat"
@@ -362,6 +453,129 @@ class NetworkTool:
         except Exception as e:
             return f"Error en prueba command injection: {str(e)}"
     
+    def _format_http_response(self, response: requests.Response) -> str:
+        """Construye una respuesta en texto similar a la salida de curl -i."""
+        response_headers = '\n'.join([f"{k}: {v}" for k, v in response.headers.items()])
+        stdout = f"HTTP/{response.raw.version/10:.1f} {response.status_code} {response.reason}\n"
+        stdout += response_headers + "\n\n"
+        stdout += response.text
+        return f"URL: {response.url}\nStatus Code: 0\nHTTP Status: {response.status_code}\n\nSTDOUT:\n{stdout}\n\nSTDERR:\n"
+    
+    def _run_batch(self, payloads: List[str], send, label: str) -> str:
+        """Envía un lote de payloads reutilizando una única sesión HTTP.
+        
+        La sesión mantiene las conexiones keep-alive abiertas, de modo que los
+        payloads contra el mismo host comparten DNS, TCP y TLS; las peticiones se
+        envían en paralelo hasta `_BATCH_MAX_WORKERS`.
+        
+        Args:
+            payloads: Lista de payloads a probar
+            send: Función (session, payload) -> requests.Response
+            label: Nombre de la prueba para los mensajes de error
+        """
+        if not payloads:
+            return f"Error en prueba {label}: no se proporcionaron payloads"
+        
+        workers = min(_BATCH_MAX_WORKERS, len(payloads))
+        with requests.Session() as session:
+            session.verify = False
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            
+            def _probe(payload: str) -> str:
+                try:
+                    return self._format_http_response(send(session, payload))
+                except Exception as e:
+                    return f"Error en prueba {label}: {str(e)}"
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outputs = list(executor.map(_probe, payloads))
+        
+        return "\n\n".join(
+            f"--- Payload {i}: {payload} ---\n{output}"
+            for i, (payload, output) in enumerate(zip(payloads, outputs), 1)
+        )
+    
+    def _parse_batch_input(self, tool_input: str, with_parameter: bool = True) -> tuple:
+        """Parsea la entrada de una herramienta por lotes.
+        
+        La entrada es un objeto JSON: {"endpoint": "/ruta", "parameter": "id",
+        "payloads": ["...", "..."]}; "parameter" no aplica a directory traversal.
+        
+        Returns:
+            (endpoint, parameter, payloads)
+        
+        Raises:
+            ValueError: Si la entrada no es un JSON con los campos requeridos
+        """
+        try:
+            data = json.loads(tool_input)
+        except (TypeError, json.JSONDecodeError) as e:
+            raise ValueError(f"se esperaba un objeto JSON ({str(e)})")
+        if not isinstance(data, dict):
+            raise ValueError("se esperaba un objeto JSON")
+        
+        endpoint = data.get("endpoint", "")
+        parameter = data.get("parameter")
+        payloads = data.get("payloads")
+        if with_parameter and not parameter:
+            raise ValueError("falta el campo 'parameter'")
+        if not isinstance(payloads, list) or not all(isinstance(p, str) for p in payloads):
+            raise ValueError("'payloads' debe ser una lista de strings")
+        return endpoint, parameter, payloads
+    
+    def sql_injection_batch(self, tool_input: str) -> str:
+        """Prueba varios payloads de SQL injection reutilizando la conexión."""
+        try:
+            endpoint, parameter, payloads = self._parse_batch_input(tool_input)
+        except ValueError as e:
+            return f"Error en prueba SQL injection: {str(e)}"
+        base_url = urljoin(self.target_url, endpoint)
+        return self._run_batch(
+            payloads,
+            lambda session, payload: session.get(base_url, params={parameter: payload}, timeout=30),
+            "SQL injection"
+        )
+    
+    def xss_batch(self, tool_input: str) -> str:
+        """Prueba varios payloads de XSS reutilizando la conexión."""
+        try:
+            endpoint, parameter, payloads = self._parse_batch_input(tool_input)
+        except ValueError as e:
+            return f"Error en prueba XSS: {str(e)}"
+        base_url = urljoin(self.target_url, endpoint)
+        return self._run_batch(
+            payloads,
+            lambda session, payload: session.get(base_url, params={parameter: payload}, timeout=30),
+            "XSS"
+        )
+    
+    def directory_traversal_batch(self, tool_input: str) -> str:
+        """Prueba varios payloads de directory traversal reutilizando la conexión."""
+        try:
+            endpoint, _, payloads = self._parse_batch_input(tool_input, with_parameter=False)
+        except ValueError as e:
+            return f"Error en prueba directory traversal: {str(e)}"
+        return self._run_batch(
+            payloads,
+            lambda session, payload: session.get(urljoin(self.target_url, endpoint + payload), timeout=30),
+            "directory traversal"
+        )
+    
+    def command_injection_batch(self, tool_input: str) -> str:
+        """Prueba varios payloads de command injection reutilizando la conexión."""
+        try:
+            endpoint, parameter, payloads = self._parse_batch_input(tool_input)
+        except ValueError as e:
+            return f"Error en prueba command injection: {str(e)}"
+        url = urljoin(self.target_url, endpoint)
+        return self._run_batch(
+            payloads,
+            lambda session, payload: session.post(url, data={parameter: payload}, timeout=30),
+            "command injection"
+        )
+    
     def check_service_availability(self, url: Optional[str] = None) -> str:
         """Verifica si el servicio objetivo está disponible."""
         try:
@@ -1,5 +1,7 @@
+import functools
+import mmap
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from PyPDF2 import PdfReader
 from src.domain.interfaces import PDFReaderInterface
 from src.domain.entities import PDFDocument
@@ -25,47 +27,63 @@ class PyPDF2Reader(PDFReaderInterface):
     
     def read_pdf(self, file_path: str) -> PDFDocument:
         """Lee un archivo PDF y extrae su contenido."""
-        if not os.path.exists(file_path):
-            raise PDFNotFoundError(f"El archivo {file_path} no existe")
-        
         if not file_path.lower().endswith('.pdf'):
             raise InvalidPDFError("El archivo debe tener extensión .pdf")
         
         try:
-            reader = PdfReader(file_path)
-            
-            # Extraer texto de todas las páginas
-            content = ""
-            for page in reader.pages:
-                content += page.extract_text() + "\n"
-            
-            # Extraer metadata
-            metadata = {
-                "num_pages": len(reader.pages),
-                "file_size": os.path.getsize(file_path),
-                "file_name": os.path.basename(file_path)
-            }
-            
-            # Agregar metadata del PDF si está disponible
-            if reader.metadata:
-                pdf_metadata = {
-                    "title": reader.metadata.get('/Title', 'Desconocido'),
-                    "author": reader.metadata.get('/Author', 'Desconocido'),
-                    "subject": reader.metadata.get('/Subject', ''),
-                    "creator": reader.metadata.get('/Creator', ''),
-                    "producer": reader.metadata.get('/Producer', ''),
-                    "creation_date": str(reader.metadata.get('/CreationDate', 'Desconocida')),
-                    "modification_date": str(reader.metadata.get('/ModDate', 'Desconocida'))
-                }
-                metadata.update(pdf_metadata)
+            # Huella barata del archivo (sin hashear su contenido): si no cambió
+            # desde la última lectura en este proceso se reutiliza el texto extraído
+            st = os.stat(file_path)
+            content, metadata = _extract_pdf(file_path, st.st_mtime_ns, st.st_size)
             
             return PDFDocument(
                 file_path=file_path,
-                content=content.strip(),
-                metadata=metadata
+                content=content,
+                metadata=dict(metadata)
             )
             
+        except FileNotFoundError:
+            raise PDFNotFoundError(f"El archivo {file_path} no existe")
         except (PDFNotFoundError, InvalidPDFError):
             raise
         except Exception as e:
-            raise PDFReadError(f"Error leyendo el archivo PDF: {str(e)}")
\ No newline at end of file
+            raise PDFReadError(f"Error leyendo el archivo PDF: {str(e)}")
+
+
+@functools.lru_cache(maxsize=8)
+def _extract_pdf(file_path: str, mtime_ns: int, size: int) -> Tuple[str, Dict[str, Any]]:
+    """Extrae (texto, metadata) de un PDF; cacheado por ruta, mtime y tamaño.
+    
+    Así los agentes que reciben la misma ruta (análisis completo: lectura,
+    análisis estático y dinámico) no vuelven a parsear el PDF.
+    """
+    # Mapear el archivo en memoria para que el SO cargue solo las páginas que se leen
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        file_size = len(mm)
+        reader = PdfReader(mm)
+        
+        # Extraer texto de todas las páginas
+        content = "".join(page.extract_text() + "\n" for page in reader.pages)
+        
+        # Extraer metadata
+        metadata = {
+            "num_pages": len(reader.pages),
+            "file_size": file_size,
+            "file_name": os.path.basename(file_path)
+        }
+        
+        # Agregar metadata del PDF si está disponible
+        pdf_info = reader.metadata
+        if pdf_info:
+            pdf_metadata = {
+                "title": pdf_info.get('/Title', 'Desconocido'),
+                "author": pdf_info.get('/Author', 'Desconocido'),
+                "subject": pdf_info.get('/Subject', ''),
+                "creator": pdf_info.get('/Creator', ''),
+                "producer": pdf_info.get('/Producer', ''),
+                "creation_date": str(pdf_info.get('/CreationDate', 'Desconocida')),
+                "modification_date": str(pdf_info.get('/ModDate', 'Desconocida'))
+            }
+            metadata.update(pdf_metadata)
+    
+    return content.strip(), metadata
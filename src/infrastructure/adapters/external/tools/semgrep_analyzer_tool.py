@@ -3,7 +3,32 @@
 import subprocess
 import json
 import os
-from typing import Dict, Any, List
+import tempfile
+import threading
+from typing import Dict, Any, Iterable, List
+
+try:
+    import ijson
+except ImportError:  # ijson es opcional; sin él se parsea la salida completa
+    ijson = None
+
+# Mapeo de nombres/extensiones comunes a lenguajes de Semgrep
+_LANG_MAP = {
+    'python': 'python',
+    'py': 'python',
+    'javascript': 'javascript',
+    'js': 'javascript',
+    'php': 'php',
+    'java': 'java',
+    'go': 'go',
+    'ruby': 'ruby',
+    'rb': 'ruby',
+    'typescript': 'typescript',
+    'ts': 'typescript'
+}
+
+_SEVERITY_ORDER = ('ERROR', 'WARNING', 'INFO')
+_SEVERITY_ICON = {'ERROR': '🚨', 'WARNING': '⚠️', 'INFO': 'ℹ️'}
 
 
 class SemgrepAnalyzerTool:
@@ -23,22 +48,7 @@ class SemgrepAnalyzerTool:
             pattern = parts[0].strip()
             language = parts[1].strip().lower()
             
-            # Mapear lenguajes comunes
-            lang_map = {
-                'python': 'python',
-                'py': 'python',
-                'javascript': 'javascript',
-                'js': 'javascript',
-                'php': 'php',
-                'java': 'java',
-                'go': 'go',
-                'ruby': 'ruby',
-                'rb': 'ruby',
-                'typescript': 'typescript',
-                'ts': 'typescript'
-            }
-            
-            semgrep_lang = lang_map.get(language, language)
+            semgrep_lang = _LANG_MAP.get(language, language)
             
             # Crear regla temporal de Semgrep
             rule = {
@@ -70,18 +80,18 @@ class SemgrepAnalyzerTool:
                 result = subprocess.run(
                     cmd,
                     capture_output=True,
-                    text=True,
                     timeout=30
                 )
                 
                 if result.returncode == 0:
                     try:
+                        # json.loads acepta bytes directamente
                         findings = json.loads(result.stdout)
                         return self._format_semgrep_results(findings, pattern)
                     except json.JSONDecodeError:
-                        return f"Semgrep ejecutado pero no se pudo parsear JSON: {result.stdout}"
+                        return f"Semgrep ejecutado pero no se pudo parsear JSON: {result.stdout.decode('utf-8', 'replace')}"
                 else:
-                    return f"Error ejecutando Semgrep: {result.stderr}"
+                    return f"Error ejecutando Semgrep: {result.stderr.decode('utf-8', 'replace')}"
                     
             finally:
                 # Limpiar archivo temporal
@@ -131,49 +141,88 @@ class SemgrepAnalyzerTool:
                 self.source_path
             ]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            if ijson is None:
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    timeout=60
+                )
+                
+                if result.returncode == 0:
+                    try:
+                        findings = json.loads(result.stdout)
+                        return self._format_security_results(findings.get('results', []))
+                    except json.JSONDecodeError:
+                        return f"Escaneo ejecutado pero no se pudo parsear JSON: {result.stdout.decode('utf-8', 'replace')}"
+                else:
+                    return f"Error ejecutando escaneo de seguridad: {result.stderr.decode('utf-8', 'replace')}"
             
-            if result.returncode == 0:
+            # Parsear la salida en streaming para no cargar todo el JSON en memoria
+            with tempfile.TemporaryFile() as stderr_file:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+                timed_out = threading.Event()
+                
+                def _kill():
+                    timed_out.set()
+                    proc.kill()
+                
+                timer = threading.Timer(60, _kill)
+                timer.start()
                 try:
-                    findings = json.loads(result.stdout)
-                    return self._format_security_results(findings)
-                except json.JSONDecodeError:
-                    return f"Escaneo ejecutado pero no se pudo parsear JSON: {result.stdout}"
-            else:
-                return f"Error ejecutando escaneo de seguridad: {result.stderr}"
+                    formatted = self._format_security_results(ijson.items(proc.stdout, 'results.item'))
+                except ijson.JSONError:
+                    formatted = None
+                finally:
+                    timer.cancel()
+                    proc.stdout.close()
+                    proc.wait()
+                
+                if timed_out.is_set():
+                    raise subprocess.TimeoutExpired(cmd, 60)
+                
+                if proc.returncode != 0:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read().decode('utf-8', 'replace')
+                    return f"Error ejecutando escaneo de seguridad: {stderr}"
+                
+                if formatted is None:
+                    return "Escaneo ejecutado pero no se pudo parsear JSON"
+                return formatted
                 
         except subprocess.TimeoutExpired:
             return "Error: Timeout ejecutando escaneo de seguridad (>60s)"
         except Exception as e:
             return f"Error en escaneo de seguridad: {str(e)}"
     
-    def _format_security_results(self, findings: Dict[str, Any]) -> str:
-        """Formatea los resultados del escaneo de seguridad."""
-        if not findings.get('results'):
-            return "✅ No se encontraron problemas de seguridad."
-        
-        results = findings['results']
+    def _format_security_results(self, results: Iterable[Dict[str, Any]]) -> str:
+        """Formatea los resultados del escaneo de seguridad.
         
+        Consume los resultados de forma incremental: solo se conservan los 5
+        primeros de cada severidad y del resto únicamente se cuenta el total.
+        """
         # Agrupar por severidad
-        by_severity = {'ERROR': [], 'WARNING': [], 'INFO': []}
+        by_severity = {severity: [] for severity in _SEVERITY_ORDER}
+        counts = dict.fromkeys(_SEVERITY_ORDER, 0)
+        total_issues = 0
         
         for result in results:
             severity = result.get('extra', {}).get('severity', 'INFO')
-            by_severity.setdefault(severity, []).append(result)
+            counts[severity] = counts.get(severity, 0) + 1
+            total_issues += 1
+            if len(by_severity.setdefault(severity, [])) < 5:  # Limitar a 5 por severidad
+                by_severity[severity].append(result)
+        
+        if not total_issues:
+            return "✅ No se encontraron problemas de seguridad."
         
         formatted_results = []
         
-        for severity in ['ERROR', 'WARNING', 'INFO']:
+        for severity in _SEVERITY_ORDER:
             if by_severity[severity]:
-                icon = {'ERROR': '🚨', 'WARNING': '⚠️', 'INFO': 'ℹ️'}[severity]
-                formatted_results.append(f"\n{icon} {severity} ({len(by_severity[severity])} problemas):")
+                icon = _SEVERITY_ICON[severity]
+                formatted_results.append(f"\n{icon} {severity} ({counts[severity]} problemas):")
                 
-                for result in by_severity[severity][:5]:  # Limitar a 5 por severidad
+                for result in by_severity[severity]:
                     file_path = result.get('path', 'Desconocido')
                     line = result.get('start', {}).get('line', 'N/A')
                     message = result.get('extra', {}).get('message', 'Sin mensaje')
@@ -186,7 +235,6 @@ class SemgrepAnalyzerTool:
                         f"     {message} ({rule_id})"
                     )
         
-        total_issues = len(results)
         summary = f"🔒 Escaneo de seguridad completado - {total_issues} problemas encontrados:\n"
         
-        return summary + "\n".join(formatted_results)
\ No newline at end of file
+        return summary + "\n".join(formatted_results)
@@ -1,6 +1,15 @@
 """LLM adapters package.
 
 This package contains adapters for Large Language Model services.
+Los adaptadores (y LangChain) se importan al acceder a uno de sus nombres.
 """
 
-from .llm_adapters import *
\ No newline at end of file
+import importlib
+
+
+def __getattr__(name: str):
+    module = importlib.import_module(".llm_adapters", __name__)
+    try:
+        return getattr(module, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
@@ -0,0 +1,176 @@
+"""Caché semántica de respuestas de LLM.
+
+Complementa la caché exacta (LLMResponseCache): cuando un contenido no tiene
+una entrada idéntica, se busca la respuesta almacenada cuyo contenido tenga
+el embedding más parecido y se reutiliza si la similitud coseno supera el
+umbral. Los embeddings se calculan con sentence-transformers (dependencia
+opcional) y se persisten en SQLite junto a la respuesta.
+
+El modelo trunca los textos largos, por lo que CachedLLM solo la consulta en
+las llamadas que la piden (las consultas cortas de triage por vulnerabilidad).
+"""
+
+import functools
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # sentence-transformers es opcional; sin él no hay caché semántica
+    np = None
+    SentenceTransformer = None
+
+from ...utils.config import get_settings
+
+
+DEFAULT_SEMANTIC_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pdf-analyzer", "llm_semantic.sqlite"
+)
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def is_available() -> bool:
+    """Indica si sentence-transformers está instalado."""
+    return SentenceTransformer is not None
+
+
+class SemanticCache:
+    """Almacén de respuestas indexado por el embedding del contenido.
+    
+    Las entradas se agrupan por namespace (proveedor, modelo, temperatura y
+    prompt de sistema), de modo que solo se comparan contenidos enviados con
+    el mismo prompt. Los vectores se normalizan al guardarse, así la
+    similitud coseno es el producto escalar. El modelo de embeddings y cada
+    namespace se cargan de forma perezosa.
+    
+    Los embeddings se calculan fuera del lock, que solo protege las entradas
+    en memoria y SQLite, para que las consultas concurrentes no esperen unas
+    a otras. Si el modelo no se puede cargar la caché se desactiva.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold: float = 0.95,
+        model_name: str = DEFAULT_EMBEDDING_MODEL
+    ):
+        if SentenceTransformer is None:
+            raise ImportError("La caché semántica requiere sentence-transformers (pip install sentence-transformers)")
+        self.path = path or DEFAULT_SEMANTIC_CACHE_PATH
+        self.threshold = threshold
+        self.model_name = model_name
+        self._model = None
+        self._disabled = False
+        self._conn = None
+        # namespace -> (matriz de embeddings (n, d), respuestas)
+        self._entries: Dict[str, Tuple[Optional["np.ndarray"], List[str]]] = {}
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+    
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(namespace TEXT NOT NULL, embedding BLOB NOT NULL, value TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_namespace ON embeddings (namespace)")
+            self._conn = conn
+        return self._conn
+    
+    def _get_model(self):
+        """Carga el modelo una sola vez; si falla, desactiva la caché y retorna None."""
+        if self._model is None and not self._disabled:
+            with self._model_lock:
+                if self._model is None and not self._disabled:
+                    try:
+                        self._model = SentenceTransformer(self.model_name)
+                    except Exception as e:
+                        self._disabled = True
+                        print(f"⚠️ Caché semántica desactivada: no se pudo cargar {self.model_name} ({str(e)})")
+        return self._model
+    
+    def _embed(self, text: str) -> Optional["np.ndarray"]:
+        """Retorna el embedding normalizado (float32) o None si no se puede calcular."""
+        model = self._get_model()
+        if model is None:
+            return None
+        try:
+            return np.asarray(model.encode(text, normalize_embeddings=True), dtype=np.float32)
+        except Exception:
+            return None
+    
+    def _namespace_entries(self, namespace: str) -> Tuple[Optional["np.ndarray"], List[str]]:
+        """Retorna (cargando desde SQLite la primera vez) las entradas del namespace.
+        
+        Debe llamarse con el lock tomado.
+        """
+        entries = self._entries.get(namespace)
+        if entries is None:
+            rows = self._connection().execute(
+                "SELECT embedding, value FROM embeddings WHERE namespace = ?", (namespace,)
+            ).fetchall()
+            matrix = np.vstack([np.frombuffer(blob, dtype=np.float32) for blob, _ in rows]) if rows else None
+            entries = (matrix, [value for _, value in rows])
+            self._entries[namespace] = entries
+        return entries
+    
+    def get(self, prompt: str, namespace: str = "") -> Optional[str]:
+        """Retorna la respuesta del contenido más parecido si supera el umbral, o None."""
+        if self._disabled:
+            return None
+        try:
+            with self._lock:
+                matrix, values = self._namespace_entries(namespace)
+        except sqlite3.Error:
+            return None
+        if matrix is None:
+            return None
+        query = self._embed(prompt)
+        if query is None:
+            return None
+        # Las entradas se reemplazan (no se modifican) al guardar, así que se leen sin lock
+        scores = matrix @ query
+        best = int(scores.argmax())
+        return values[best] if scores[best] >= self.threshold else None
+    
+    def put(self, prompt: str, response: str, namespace: str = "") -> None:
+        """Guarda la respuesta; los errores no interrumpen el análisis."""
+        if self._disabled:
+            return
+        vector = self._embed(prompt)
+        if vector is None:
+            return
+        try:
+            with self._lock:
+                matrix, values = self._namespace_entries(namespace)
+                conn = self._connection()
+                conn.execute(
+                    "INSERT INTO embeddings (namespace, embedding, value) VALUES (?, ?, ?)",
+                    (namespace, vector.tobytes(), response)
+                )
+                conn.commit()
+                matrix = vector[np.newaxis, :] if matrix is None else np.vstack([matrix, vector])
+                self._entries[namespace] = (matrix, values + [response])
+        except sqlite3.Error:
+            pass
+    
+    def close(self) -> None:
+        """Cierra la conexión SQLite si estaba abierta."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+@functools.lru_cache(maxsize=1)
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Retorna la caché semántica compartida, o None si está desactivada o no disponible."""
+    settings = get_settings()
+    if not settings.llm_semantic_cache or not is_available():
+        return None
+    return SemanticCache(threshold=settings.llm_semantic_cache_threshold)
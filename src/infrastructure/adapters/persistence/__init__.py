@@ -1,6 +1,15 @@
 """Persistence adapters package.
 
 This package contains adapters for data persistence systems.
+PyMongo se importa al acceder a uno de sus nombres.
 """
 
-from .mongodb_client import *
\ No newline at end of file
+import importlib
+
+
+def __getattr__(name: str):
+    module = importlib.import_module(".mongodb_client", __name__)
+    try:
+        return getattr(module, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
@@ -1,17 +1,28 @@
 """Cliente MongoDB para guardar resultados de análisis de PDFs."""
 
+import atexit
 import json
 import os
+import threading
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo.write_concern import WriteConcern
 from src.domain.exceptions import PDFAnalyzerException
 
 
 class MongoDBClient:
     """Cliente para operaciones con MongoDB."""
     
+    _instance: Optional["MongoDBClient"] = None
+    _instance_lock = threading.Lock()
+    
+    # Pool del cliente compartido: conexiones precalentadas para que una
+    # escritura no pague handshake ni descubrimiento del servidor
+    MAX_POOL_SIZE = 50
+    MIN_POOL_SIZE = 5
+    
     def __init__(self, uri: Optional[str] = None, database_name: Optional[str] = None):
         """Inicializa el cliente MongoDB.
         
@@ -26,6 +37,23 @@ class MongoDBClient:
         self.db = None
         self.collection = None
     
+    @classmethod
+    def instance(cls) -> "MongoDBClient":
+        """Retorna el cliente compartido del proceso, conectado en el primer uso.
+        
+        Mantiene vivo el pool de conexiones de PyMongo entre operaciones (sin
+        repetir handshake ni autenticación) y lo cierra al salir del proceso.
+        Si la conexión falla no se guarda ninguna instancia.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    client = cls()
+                    client.connect()
+                    atexit.register(client.disconnect)
+                    cls._instance = client
+        return cls._instance
+    
     def connect(self) -> bool:
         """Establece conexión con MongoDB.
         
@@ -33,7 +61,13 @@ class MongoDBClient:
             True si la conexión es exitosa, False en caso contrario
         """
         try:
-            self.client = MongoClient(self.uri, serverSelectionTimeoutMS=5000)
+            self.client = MongoClient(
+                self.uri,
+                serverSelectionTimeoutMS=5000,
+                maxPoolSize=self.MAX_POOL_SIZE,
+                minPoolSize=self.MIN_POOL_SIZE,
+                retryWrites=True
+            )
             # Verificar conexión
             self.client.admin.command('ping')
             self.db = self.client[self.database_name]
@@ -52,46 +86,140 @@ class MongoDBClient:
             self.db = None
             self.collection = None
     
-    def save_report(self, pdf_path: str, result_json: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    @staticmethod
+    def build_report_document(
+        pdf_path: str,
+        result_json: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        result_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Construye el documento MongoDB de un reporte de análisis.
+        
+        Args:
+            pdf_path: Ruta del archivo PDF analizado
+            result_json: Resultado del análisis en formato JSON
+            metadata: Metadatos adicionales
+            result_data: Resultado ya decodificado; si se indica no se vuelve a parsear result_json
+        
+        Returns:
+            Documento listo para insertar
+        """
+        if result_data is None:
+            try:
+                # Parsear el JSON del resultado
+                result_data = json.loads(result_json)
+            except json.JSONDecodeError as e:
+                raise PDFAnalyzerException(f"Error parseando JSON del resultado: {str(e)}")
+        
+        now = datetime.utcnow()
+        return {
+            'source_file': os.path.basename(pdf_path),
+            'full_path': pdf_path,
+            'processed_at': now.isoformat(),
+            'created_at': now,
+            'updated_at': now,
+            'structured_data': result_data,
+            'metadata': metadata or {},
+            'title': result_data.get('documento', {}).get('titulo', 'Documento sin título'),
+            'summary': result_data.get('resumen_ejecutivo', 'Sin resumen disponible'),
+            'content': result_json  # Guardar también el JSON completo
+        }
+    
+    def save_report(
+        self,
+        pdf_path: str,
+        result_json: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        result_data: Optional[Dict[str, Any]] = None
+    ) -> str:
         """Guarda un reporte de análisis en MongoDB.
         
         Args:
             pdf_path: Ruta del archivo PDF analizado
             result_json: Resultado del análisis en formato JSON
             metadata: Metadatos adicionales
+            result_data: Resultado ya decodificado (evita parsear result_json de nuevo)
         
         Returns:
             ID del documento insertado
         """
+        document = self.build_report_document(pdf_path, result_json, metadata, result_data)
+        return self.save_reports_bulk([document])[0]
+    
+    def save_reports_bulk(self, documents: List[Dict[str, Any]]) -> List[str]:
+        """Guarda varios documentos con un único insert_many.
+        
+        Args:
+            documents: Documentos creados con build_report_document
+        
+        Returns:
+            IDs de los documentos insertados, en el mismo orden
+        """
         if self.collection is None:
             raise PDFAnalyzerException("No hay conexión activa con MongoDB")
         
+        if not documents:
+            return []
+        
+        try:
+            # ordered=False: un documento inválido no detiene el resto del lote
+            result = self.collection.insert_many(documents, ordered=False)
+            return [str(inserted_id) for inserted_id in result.inserted_ids]
+        except Exception as e:
+            raise PDFAnalyzerException(f"Error guardando en MongoDB: {str(e)}")
+    
+    def insert_documents(
+        self,
+        collection_name: str,
+        documents: List[Dict[str, Any]],
+        batch_size: int = 100,
+        fast: bool = False,
+        bypass_validation: bool = False
+    ) -> List[str]:
+        """Inserta documentos en la colección indicada con insert_many por lotes.
+        
+        Cada lote es un único viaje de red en lugar de una inserción por
+        documento.
+        
+        Args:
+            collection_name: Nombre de la colección destino
+            documents: Documentos a insertar
+            batch_size: Documentos por llamada a insert_many
+            fast: Usar write concern w=0 (no espera confirmación del servidor)
+            bypass_validation: Omitir los validadores de la colección (solo
+                para filas derivadas de un documento ya validado; se ignora con fast)
+        
+        Returns:
+            IDs de los documentos insertados, en el mismo orden
+        """
+        if self.db is None:
+            raise PDFAnalyzerException("No hay conexión activa con MongoDB")
+        
+        if not documents:
+            return []
+        
+        collection = self.db[collection_name]
+        if fast:
+            collection = collection.with_options(write_concern=WriteConcern(w=0))
+        
+        inserted_ids = []
         try:
-            # Parsear el JSON del resultado
-            result_data = json.loads(result_json)
-            
-            # Crear documento para MongoDB
-            document = {
-                'source_file': os.path.basename(pdf_path),
-                'full_path': pdf_path,
-                'processed_at': datetime.utcnow().isoformat(),
-                'created_at': datetime.utcnow(),
-                'updated_at': datetime.utcnow(),
-                'structured_data': result_data,
-                'metadata': metadata or {},
-                'title': result_data.get('documento', {}).get('titulo', 'Documento sin título'),
-                'summary': result_data.get('resumen_ejecutivo', 'Sin resumen disponible'),
-                'content': result_json  # Guardar también el JSON completo
-            }
-            
-            # Insertar documento
-            result = self.collection.insert_one(document)
-            return str(result.inserted_id)
-            
-        except json.JSONDecodeError as e:
-            raise PDFAnalyzerException(f"Error parseando JSON del resultado: {str(e)}")
+            for start in range(0, len(documents), batch_size):
+                # Con w=0 el servidor rechaza bypass_document_validation
+                result = collection.insert_many(
+                    documents[start:start + batch_size],
+                    ordered=False,
+                    bypass_document_validation=bypass_validation and not fast
+                )
+                inserted_ids.extend(str(inserted_id) for inserted_id in result.inserted_ids)
         except Exception as e:
             raise PDFAnalyzerException(f"Error guardando en MongoDB: {str(e)}")
+        return inserted_ids
+    
+    def insert_document(self, collection_name: str, document: Dict[str, Any], fast: bool = False) -> str:
+        """Inserta un documento en la colección indicada y retorna su ID."""
+        # insert_many agrega _id al documento; se inserta una copia para no modificar el del llamador
+        return self.insert_documents(collection_name, [dict(document)], fast=fast)[0]
     
     def get_report(self, report_id: str) -> Optional[Dict[str, Any]]:
         """Obtiene un reporte por su ID.
@@ -4,4 +4,13 @@ This package contains infrastructure services that implement
 business logic using external systems and adapters.
 """
 
-from .agents import *
\ No newline at end of file
+import importlib
+
+
+def __getattr__(name: str):
+    """Reexporta perezosamente los agentes (ver services.agents)."""
+    module = importlib.import_module(".agents", __name__)
+    try:
+        return getattr(module, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
@@ -1,9 +1,10 @@
-"""Módulo de agentes para el análisis de documentos."""
+"""Módulo de agentes para el análisis de documentos.
 
-from .pdf_analyzer_agent import LangChainReportAnalyzer, PDFAnalysisTool, create_pdf_analysis_agent
-from .static_agent import StaticAnalysisAgent, FileReaderTool, create_static_analysis_agent
-from .triage_agent import TriageAgent
-from .dynamic_agent import DynamicAnalysisAgent
+Cada agente se importa al acceder a su nombre: cargar uno (por ejemplo el de
+triage) no importa LangChain ni las herramientas de los demás.
+"""
+
+import importlib
 
 __all__ = [
     'LangChainReportAnalyzer',
@@ -14,4 +15,23 @@ __all__ = [
     'create_static_analysis_agent',
     'TriageAgent',
     'DynamicAnalysisAgent'
-]
\ No newline at end of file
+]
+
+# Nombre -> submódulo que lo define
+_LAZY_NAMES = {
+    'LangChainReportAnalyzer': '.pdf_analyzer_agent',
+    'PDFAnalysisTool': '.pdf_analyzer_agent',
+    'create_pdf_analysis_agent': '.pdf_analyzer_agent',
+    'StaticAnalysisAgent': '.static_agent',
+    'FileReaderTool': '.static_agent',
+    'create_static_analysis_agent': '.static_agent',
+    'TriageAgent': '.triage_agent',
+    'DynamicAnalysisAgent': '.dynamic_agent',
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
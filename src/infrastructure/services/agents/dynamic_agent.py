@@ -1,8 +1,9 @@
+import asyncio
 import json
 import os
 import subprocess
 import tempfile
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Dict, Any, List, Optional
 from langchain.agents import create_openai_tools_agent, AgentExecutor
 from langchain.tools import Tool
 from langchain_openai import ChatOpenAI
@@ -50,6 +51,7 @@ HERRAMIENTAS DISPONIBLES:
 - telnet_connect: Para conectar a puertos específicos
 - netcat_connect: Para conexiones de red avanzadas
 - check_service_availability: Para verificar disponibilidad del servicio
+- sql_injection_batch, xss_batch, directory_traversal_batch, command_injection_batch: Para probar varios payloads de una vez contra el mismo endpoint (entrada: objeto JSON con endpoint, parameter y payloads)
 
 METODOLOGÍA DE EXPLOTACIÓN:
 1. Analiza el reporte PDF para obtener informacion util
@@ -99,6 +101,43 @@ Comienza tu análisis dinámico ahora usando las herramientas de red disponibles
         except Exception as e:
             raise ReportAnalysisError(f"Error en validación dinámica de vulnerabilidades: {str(e)}")
     
+    async def avalidate_vulnerabilities(
+        self,
+        pdf_path: str,
+        target_url: str,
+        pdf_analysis: Optional[Awaitable[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Variante asíncrona de validate_vulnerabilities.
+        
+        El análisis del PDF (llamada al LLM) y la verificación HTTP del objetivo
+        son independientes, así que se ejecutan en paralelo en hilos de trabajo.
+        Si se pasa pdf_analysis (p. ej. una tarea compartida con otro agente), se
+        espera ese resultado en lugar de volver a analizar el PDF.
+        """
+        try:
+            print(f"📋 Analizando reporte PDF y 🌐 verificando disponibilidad de {target_url}...")
+            pdf_analysis, availability_check = await asyncio.gather(
+                pdf_analysis if pdf_analysis is not None
+                else asyncio.to_thread(self._analyze_pdf_report, pdf_path),
+                asyncio.to_thread(self._check_target_availability, target_url)
+            )
+            print(f"✅ PDF analizado: {len(pdf_analysis.get('hallazgos_principales', []))} vulnerabilidades encontradas")
+            if not availability_check['available']:
+                raise ReportAnalysisError(f"❌ El objetivo {target_url} no está disponible: {availability_check['error']}")
+            print("✅ Objetivo disponible y accesible")
+            
+            print("🎯 Iniciando validación con explotación dinámica...")
+            validated_vulnerabilities = await asyncio.to_thread(
+                self._validate_with_dynamic_react, pdf_analysis, target_url
+            )
+            print(f"✅ Validación completada: {len(validated_vulnerabilities)} vulnerabilidades procesadas")
+            
+            print("📊 Generando reporte final...")
+            return self._generate_final_result(pdf_analysis, validated_vulnerabilities)
+            
+        except Exception as e:
+            raise ReportAnalysisError(f"Error en validación dinámica de vulnerabilidades: {str(e)}")
+    
     def _analyze_pdf_report(self, pdf_path: str) -> Dict[str, Any]:
         """Analiza el reporte PDF usando el agente existente."""
         from ...adapters.external.tools.pdf_reader import PyPDF2Reader
@@ -175,8 +214,6 @@ Comienza tu análisis dinámico ahora usando las herramientas de red disponibles
     
     def _create_dynamic_react_agent(self, target_url: str) -> AgentExecutor:
         """Crea un agente ReACT con herramientas de red para explotación."""
-        from langchain_openai import ChatOpenAI
-        
         # Crear herramientas de red genéricas
         network_tool = NetworkTool(target_url)
         
@@ -230,6 +267,26 @@ Comienza tu análisis dinámico ahora usando las herramientas de red disponibles
                 name="check_service_availability",
                 description="Verifica si el servicio objetivo está disponible y responde correctamente",
                 func=network_tool.check_service_availability
+            ),
+            Tool(
+                name="sql_injection_batch",
+                description='Prueba varios payloads de SQL injection sobre un parámetro GET en paralelo, reutilizando la conexión. Entrada: objeto JSON. Ejemplo: {"endpoint": "/items", "parameter": "id", "payloads": ["1\' OR \'1\'=\'1", "1 UNION SELECT NULL--"]}',
+                func=network_tool.sql_injection_batch
+            ),
+            Tool(
+                name="xss_batch",
+                description='Prueba varios payloads de XSS sobre un parámetro GET en paralelo, reutilizando la conexión. Entrada: objeto JSON. Ejemplo: {"endpoint": "/search", "parameter": "q", "payloads": ["<script>alert(1)</script>", "<img src=x onerror=alert(1)>"]}',
+                func=network_tool.xss_batch
+            ),
+            Tool(
+                name="directory_traversal_batch",
+                description='Prueba varias rutas de directory traversal añadidas al endpoint en paralelo, reutilizando la conexión. Entrada: objeto JSON sin "parameter". Ejemplo: {"endpoint": "/download?file=", "payloads": ["../../etc/passwd", "..%2f..%2fetc%2fpasswd"]}',
+                func=network_tool.directory_traversal_batch
+            ),
+            Tool(
+                name="command_injection_batch",
+                description='Prueba varios payloads de command injection sobre un parámetro POST en paralelo, reutilizando la conexión. Entrada: objeto JSON. Ejemplo: {"endpoint": "/ping", "parameter": "host", "payloads": ["127.0.0.1; id", "127.0.0.1 && whoami"]}',
+                func=network_tool.command_injection_batch
             )
         ]
         
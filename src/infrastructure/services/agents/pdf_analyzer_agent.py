@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 from langchain.agents import create_openai_tools_agent, AgentExecutor
 from langchain.tools import Tool
 from langchain_openai import ChatOpenAI
@@ -14,6 +14,9 @@ from src.domain.exceptions import LLMConnectionError, ReportAnalysisError, JSONP
 class LangChainReportAnalyzer(SecurityAnalyzerInterface):
     """Analizador de reportes usando LangChain."""
     
+    # Cada cuántos fragmentos recibidos se informa el avance en modo streaming
+    _PROGRESS_EVERY = 20
+    
     def __init__(self, llm: LLMInterface):
         self.llm = llm
         self.analysis_prompt = self._create_analysis_prompt()
@@ -94,31 +97,70 @@ Contenido del reporte a analizar:
         """Analiza el contenido del PDF y genera un reporte estructurado."""
         try:
             # Generar análisis usando el LLM
-            full_prompt = self.analysis_prompt + "\n\n" + content
-            response = self.llm.generate_response(self.analysis_prompt, content)
-            
-            # Limpiar la respuesta para asegurar que sea JSON válido
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.endswith('```'):
-                response = response[:-3]
-            response = response.strip()
+            response = self.llm.generate_response(self.analysis_prompt, content, **self._cache_options())
+            return self._parse_report(response)
             
-            # Parsear JSON
-            try:
-                report_data = json.loads(response)
-            except json.JSONDecodeError as e:
-                raise JSONParsingError(f"Error parseando JSON del LLM: {str(e)}. Respuesta: {response[:500]}...")
+        except (JSONParsingError, LLMConnectionError):
+            raise
+        except Exception as e:
+            raise ReportAnalysisError(f"Error analizando el reporte: {str(e)}")
+    
+    async def aanalyze_content(self, content: str) -> SecurityReport:
+        """Versión asíncrona de analyze_content: espera al LLM sin bloquear el event loop."""
+        try:
+            response = await self.llm.agenerate_response(self.analysis_prompt, content, **self._cache_options())
+            return self._parse_report(response)
             
-            # Validar y crear el objeto SecurityReport
-            security_report = SecurityReport(**report_data)
-            return security_report
+        except (JSONParsingError, LLMConnectionError):
+            raise
+        except Exception as e:
+            raise ReportAnalysisError(f"Error analizando el reporte: {str(e)}")
+    
+    async def astream_analyze_content(
+        self,
+        content: str,
+        progress_cb: Optional[Callable[[str], None]] = None
+    ) -> SecurityReport:
+        """Analiza el contenido recibiendo la respuesta del LLM en streaming.
+        
+        Los fragmentos se acumulan a medida que llegan y se informa el avance
+        mediante progress_cb; el JSON se valida al completarse la respuesta.
+        """
+        try:
+            parts = []
+            async for chunk in self.llm.astream_response(self.analysis_prompt, content, **self._cache_options()):
+                parts.append(chunk)
+                if progress_cb and len(parts) % self._PROGRESS_EVERY == 0:
+                    progress_cb(f"Recibiendo respuesta del modelo ({len(parts)} fragmentos)...")
+            return self._parse_report("".join(parts))
             
         except (JSONParsingError, LLMConnectionError):
             raise
         except Exception as e:
             raise ReportAnalysisError(f"Error analizando el reporte: {str(e)}")
+    
+    def _cache_options(self) -> Dict[str, Any]:
+        """Con un LLM cacheado, solo se guardan las respuestas que _parse_report acepta."""
+        return {"validate": self._parse_report} if getattr(self.llm, 'caches_responses', False) else {}
+    
+    def _parse_report(self, response: str) -> SecurityReport:
+        """Convierte la respuesta del LLM en un SecurityReport."""
+        # Limpiar la respuesta para asegurar que sea JSON válido
+        response = response.strip()
+        if response.startswith('```json'):
+            response = response[7:]
+        if response.endswith('```'):
+            response = response[:-3]
+        response = response.strip()
+        
+        # Parsear JSON
+        try:
+            report_data = json.loads(response)
+        except json.JSONDecodeError as e:
+            raise JSONParsingError(f"Error parseando JSON del LLM: {str(e)}. Respuesta: {response[:500]}...")
+        
+        # Validar y crear el objeto SecurityReport
+        return SecurityReport(**report_data)
 
 
 class PDFAnalysisTool:
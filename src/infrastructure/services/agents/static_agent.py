@@ -1,8 +1,9 @@
+import asyncio
 import json
 import os
 import subprocess
 import tempfile
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Dict, Any, List, Optional
 from langchain.agents import create_openai_tools_agent, AgentExecutor
 from langchain.tools import Tool
 from langchain_openai import ChatOpenAI
@@ -78,6 +79,48 @@ Comienza tu análisis ahora usando las herramientas disponibles.
         except Exception as e:
             raise ReportAnalysisError(f"Error en validación de vulnerabilidades: {str(e)}")
     
+    async def avalidate_vulnerabilities(
+        self,
+        pdf_path: str,
+        source_path: str,
+        pdf_analysis: Optional[Awaitable[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Variante asíncrona de validate_vulnerabilities.
+        
+        El análisis del PDF (llamada al LLM) y el escaneo con Semgrep (subproceso)
+        son independientes, así que se ejecutan en paralelo en hilos de trabajo.
+        Si se pasa pdf_analysis (p. ej. una tarea compartida con otro agente), se
+        espera ese resultado en lugar de volver a analizar el PDF.
+        """
+        try:
+            print("📋 Analizando reporte PDF y 🔍 ejecutando Semgrep en paralelo...")
+            pdf_analysis, semgrep_results = await asyncio.gather(
+                pdf_analysis if pdf_analysis is not None
+                else asyncio.to_thread(self._analyze_pdf_report, pdf_path),
+                asyncio.to_thread(self._run_semgrep_scan, source_path)
+            )
+            print(f"✅ PDF analizado: {len(pdf_analysis.get('hallazgos_principales', []))} vulnerabilidades encontradas")
+            print(f"✅ Semgrep completado: {len(semgrep_results)} hallazgos detectados")
+            
+            print("🤖 Iniciando validación con metodología ReACT...")
+            validated_vulnerabilities = await asyncio.to_thread(
+                self._validate_with_react, pdf_analysis, semgrep_results, source_path
+            )
+            
+            print("📊 Generando reporte final...")
+            return self._generate_final_result(pdf_analysis, validated_vulnerabilities)
+            
+        except Exception as e:
+            raise ReportAnalysisError(f"Error en validación de vulnerabilidades: {str(e)}")
+    
+    async def aanalyze_pdf_report(self, pdf_path: str) -> Dict[str, Any]:
+        """Analiza el reporte PDF en un hilo de trabajo.
+        
+        Permite compartir el resultado con otros agentes a través del
+        parámetro pdf_analysis de avalidate_vulnerabilities.
+        """
+        return await asyncio.to_thread(self._analyze_pdf_report, pdf_path)
+    
     def _analyze_pdf_report(self, pdf_path: str) -> Dict[str, Any]:
         """Analiza el reporte PDF usando el agente existente."""
         from ...adapters.external.tools.pdf_reader import PyPDF2Reader
@@ -104,11 +147,11 @@ Comienza tu análisis ahora usando las herramientas disponibles.
                 source_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            result = subprocess.run(cmd, capture_output=True, timeout=300)
             
             # Leer resultados
             if os.path.exists(temp_path):
-                with open(temp_path, 'r') as f:
+                with open(temp_path, 'rb') as f:
                     semgrep_data = json.load(f)
                 os.unlink(temp_path)  # Limpiar archivo temporal
                 return semgrep_data.get('results', [])
@@ -1,12 +1,9 @@
+import asyncio
 import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from langchain.agents import create_openai_tools_agent, AgentExecutor
-from langchain.tools import Tool
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema import SystemMessage, HumanMessage
 
 from src.domain.interfaces import LLMInterface
 from src.domain.entities import (
@@ -29,10 +26,17 @@ class TriageAgent:
     4. Genera un plan de remediación ordenado
     """
     
-    def __init__(self, llm: LLMInterface):
+    def __init__(self, llm: LLMInterface, max_concurrency: Optional[int] = None, batch_api: bool = False):
         self.llm = llm
         self.version = "1.0.0"
         self.triage_prompt = self._create_triage_prompt()
+        # Máximo de vulnerabilidades analizadas a la vez (llamadas simultáneas al LLM)
+        if max_concurrency is None:
+            from src.infrastructure.utils.config import get_settings
+            max_concurrency = get_settings().triage_max_concurrency
+        self.max_concurrency = max(1, max_concurrency)
+        # Enviar todas las clasificaciones en un lote de la Batch API del proveedor
+        self.batch_api = batch_api
         
     def _create_triage_prompt(self) -> str:
         """Crea el prompt especializado para análisis de triage."""
@@ -120,52 +124,143 @@ Debes responder SIEMPRE en formato JSON válido con la siguiente estructura:
 Comienza tu análisis de triage ahora."""
     
     def analyze_vulnerabilities(self, security_report: Dict[str, Any]) -> TriageReport:
-        """Analiza las vulnerabilidades del reporte y genera un triage completo."""
+        """Analiza las vulnerabilidades del reporte y genera un triage completo.
+        
+        Cada vulnerabilidad se analiza con una llamada independiente al LLM;
+        hasta max_concurrency llamadas se ejecutan a la vez en un pool de hilos.
+        Con batch_api (y un LLM que lo soporte) todas se envían en un único lote.
+        """
         try:
-            print("🔍 Iniciando análisis de triage de vulnerabilidades...")
+            hallazgos = self._prepare_hallazgos(security_report)
             
-            # Extraer vulnerabilidades del reporte (soportar múltiples formatos)
-            hallazgos = security_report.get('hallazgos_principales', [])
-            if not hallazgos:
-                # Intentar con formato de análisis PDF
-                analisis_pdf = security_report.get('analisis_pdf', {})
-                hallazgos = analisis_pdf.get('hallazgos_principales', [])
-            if not hallazgos:
-                # Intentar con formato de análisis dinámico
-                hallazgos = security_report.get('vulnerabilidades', [])
-            if not hallazgos:
-                # Intentar con formato de findings
-                hallazgos = security_report.get('findings', [])
+            if self._use_batch_api():
+                return self._finish_triage(security_report, self._triage_batch(hallazgos))
             
-            if not hallazgos:
-                raise ReportAnalysisError("No se encontraron vulnerabilidades en el reporte. Formatos soportados: 'hallazgos_principales', 'vulnerabilidades', 'findings'")
+            return self._finish_triage(security_report, self._triage_parallel(hallazgos))
             
-            # Enriquecer hallazgos con evidencia estática y dinámica
-            hallazgos_enriquecidos = self._enrich_vulnerabilities_with_evidence(security_report, hallazgos)
+        except Exception as e:
+            print(f"❌ Error en análisis de triage: {str(e)}")
+            raise ReportAnalysisError(f"Error en análisis de triage: {str(e)}")
+    
+    async def aanalyze_vulnerabilities(self, security_report: Dict[str, Any]) -> TriageReport:
+        """Variante asíncrona de analyze_vulnerabilities.
+        
+        Las llamadas por vulnerabilidad se lanzan juntas con asyncio.gather y un
+        semáforo limita a max_concurrency las que están en curso.
+        """
+        try:
+            hallazgos = self._prepare_hallazgos(security_report)
+            total = len(hallazgos)
             
-            print(f"📊 Analizando {len(hallazgos_enriquecidos)} vulnerabilidades...")
+            if self._use_batch_api():
+                triaged_vulnerabilities = await asyncio.to_thread(self._triage_batch, hallazgos)
+                return self._finish_triage(security_report, triaged_vulnerabilities)
             
-            # Procesar cada vulnerabilidad
-            triaged_vulnerabilities = []
-            for i, hallazgo in enumerate(hallazgos_enriquecidos):
-                print(f"🎯 Procesando vulnerabilidad {i+1}/{len(hallazgos_enriquecidos)}: {hallazgo.get('nombre', hallazgo.get('categoria', 'Sin nombre'))}")
-                
-                triaged_vuln = self._triage_single_vulnerability(hallazgo, i+1)
-                triaged_vulnerabilities.append(triaged_vuln)
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            
+            async def triage_one(vuln_number: int, hallazgo: Dict[str, Any]) -> TriagedVulnerability:
+                async with semaphore:
+                    return await asyncio.to_thread(self._triage_numbered, hallazgo, vuln_number, total)
             
-            # Generar reporte de triage completo
-            triage_report = self._generate_triage_report(
-                security_report, 
-                triaged_vulnerabilities
+            triaged_vulnerabilities = await asyncio.gather(
+                *(triage_one(i, hallazgo) for i, hallazgo in enumerate(hallazgos, 1))
             )
             
-            print("✅ Análisis de triage completado")
-            return triage_report
+            return self._finish_triage(security_report, list(triaged_vulnerabilities))
             
         except Exception as e:
             print(f"❌ Error en análisis de triage: {str(e)}")
             raise ReportAnalysisError(f"Error en análisis de triage: {str(e)}")
     
+    def _prepare_hallazgos(self, security_report: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extrae los hallazgos del reporte (en cualquiera de los formatos soportados) y los enriquece."""
+        print("🔍 Iniciando análisis de triage de vulnerabilidades...")
+        
+        # Extraer vulnerabilidades del reporte (soportar múltiples formatos)
+        hallazgos = security_report.get('hallazgos_principales', [])
+        if not hallazgos:
+            # Intentar con formato de análisis PDF
+            analisis_pdf = security_report.get('analisis_pdf', {})
+            hallazgos = analisis_pdf.get('hallazgos_principales', [])
+        if not hallazgos:
+            # Intentar con formato de análisis dinámico
+            hallazgos = security_report.get('vulnerabilidades', [])
+        if not hallazgos:
+            # Intentar con formato de findings
+            hallazgos = security_report.get('findings', [])
+        
+        if not hallazgos:
+            raise ReportAnalysisError("No se encontraron vulnerabilidades en el reporte. Formatos soportados: 'hallazgos_principales', 'vulnerabilidades', 'findings'")
+        
+        # Enriquecer hallazgos con evidencia estática y dinámica
+        hallazgos_enriquecidos = self._enrich_vulnerabilities_with_evidence(security_report, hallazgos)
+        
+        print(f"📊 Analizando {len(hallazgos_enriquecidos)} vulnerabilidades...")
+        return hallazgos_enriquecidos
+    
+    def _triage_numbered(self, hallazgo: Dict[str, Any], vuln_number: int, total: int) -> TriagedVulnerability:
+        """Informa el avance y realiza el triage de la vulnerabilidad número vuln_number."""
+        print(f"🎯 Procesando vulnerabilidad {vuln_number}/{total}: {hallazgo.get('nombre', hallazgo.get('categoria', 'Sin nombre'))}")
+        return self._triage_single_vulnerability(hallazgo, vuln_number)
+    
+    def _cache_options(self) -> Dict[str, Any]:
+        """Opciones de caché para las consultas de triage.
+        
+        Con un LLM cacheado solo se guardan las respuestas que se pueden
+        parsear. Cada consulta describe una sola vulnerabilidad y es corta,
+        así que se habilita también la caché semántica si está configurada.
+        """
+        if not getattr(self.llm, 'caches_responses', False):
+            return {}
+        return {
+            "validate": self._parse_triage_response,
+            "semantic": getattr(self.llm, 'supports_semantic_cache', False)
+        }
+    
+    def _triage_parallel(self, hallazgos: List[Dict[str, Any]]) -> List[TriagedVulnerability]:
+        """Clasifica las vulnerabilidades con llamadas individuales en un pool de hilos."""
+        total = len(hallazgos)
+        # map conserva el orden de los hallazgos
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, total)) as executor:
+            return list(executor.map(
+                lambda item: self._triage_numbered(item[1], item[0], total),
+                enumerate(hallazgos, 1)
+            ))
+    
+    def _use_batch_api(self) -> bool:
+        """Indica si el triage debe enviarse como lote a la Batch API del proveedor."""
+        return self.batch_api and getattr(self.llm, 'supports_batch', False)
+    
+    def _triage_batch(self, hallazgos: List[Dict[str, Any]]) -> List[TriagedVulnerability]:
+        """Clasifica todas las vulnerabilidades con un único lote de la Batch API.
+        
+        Las peticiones que el lote no completó se reintentan con una llamada
+        individual; si el lote entero falla (o agota LLM_BATCH_MAX_WAIT) se
+        clasifican todas con llamadas individuales concurrentes.
+        """
+        queries = [self._create_triage_query(hallazgo, i) for i, hallazgo in enumerate(hallazgos, 1)]
+        print(f"📦 Enviando {len(queries)} vulnerabilidades en un lote de la Batch API...")
+        try:
+            responses = self.llm.generate_batch(self.triage_prompt, queries, **self._cache_options())
+        except LLMConnectionError as e:
+            print(f"⚠️ El lote falló ({str(e)}), clasificando con llamadas individuales")
+            return self._triage_parallel(hallazgos)
+        
+        triaged_vulnerabilities = []
+        for vuln_number, (hallazgo, response) in enumerate(zip(hallazgos, responses), 1):
+            if response is None:
+                print(f"⚠️ El lote no completó la vulnerabilidad {vuln_number}, reintentando individualmente")
+                triaged_vulnerabilities.append(self._triage_single_vulnerability(hallazgo, vuln_number))
+            else:
+                triaged_vulnerabilities.append(self._triage_from_response(response, hallazgo, vuln_number))
+        return triaged_vulnerabilities
+    
+    def _finish_triage(self, security_report: Dict[str, Any], vulnerabilities: List[TriagedVulnerability]) -> TriageReport:
+        """Genera el reporte de triage completo a partir de las vulnerabilidades procesadas."""
+        triage_report = self._generate_triage_report(security_report, vulnerabilities)
+        print("✅ Análisis de triage completado")
+        return triage_report
+    
     def _enrich_vulnerabilities_with_evidence(self, security_report: Dict[str, Any], hallazgos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Enriquece las vulnerabilidades con evidencia estática y dinámica."""
         try:
@@ -268,8 +363,18 @@ Comienza tu análisis de triage ahora."""
             triage_query = self._create_triage_query(hallazgo, vuln_number)
             
             # Usar el LLM para análisis
-            response = self.llm.generate_response(self.triage_prompt, triage_query)
+            response = self.llm.generate_response(self.triage_prompt, triage_query, **self._cache_options())
             
+        except Exception as e:
+            print(f"⚠️ Error procesando vulnerabilidad {vuln_number}: {str(e)}")
+            # Crear vulnerabilidad con datos mínimos en caso de error
+            return self._create_fallback_vulnerability(hallazgo, vuln_number)
+        
+        return self._triage_from_response(response, hallazgo, vuln_number)
+    
+    def _triage_from_response(self, response: str, hallazgo: Dict[str, Any], vuln_number: int) -> TriagedVulnerability:
+        """Construye la vulnerabilidad triada a partir de la respuesta del LLM."""
+        try:
             # Parsear respuesta JSON
             triage_data = self._parse_triage_response(response)
             
@@ -1,10 +1,10 @@
-"""Utilidades de infraestructura."""
+"""Utilidades de infraestructura.
 
-from .config import Settings, get_settings, validate_environment, get_available_providers
-from .factory import DependencyFactory, get_factory
-from .simple_factory import SimpleDependencyFactory, get_simple_factory, reset_factory
-# LLM adapters se importan dinámicamente para evitar importación circular
-from .mongodb_client import MongoDBClient
+Los nombres se importan al primer acceso para que cargar un módulo concreto
+(config, llm_cache, ...) no importe el factory ni PyMongo.
+"""
+
+import importlib
 
 __all__ = [
     "Settings",
@@ -17,4 +17,26 @@ __all__ = [
     "get_simple_factory",
     "reset_factory",
     "MongoDBClient"
-]
\ No newline at end of file
+]
+
+# Nombre -> submódulo que lo define
+# (los adaptadores LLM se importan dinámicamente para evitar importación circular)
+_LAZY_NAMES = {
+    "Settings": ".config",
+    "get_settings": ".config",
+    "validate_environment": ".config",
+    "get_available_providers": ".config",
+    "DependencyFactory": ".factory",
+    "get_factory": ".factory",
+    "SimpleDependencyFactory": ".simple_factory",
+    "get_simple_factory": ".simple_factory",
+    "reset_factory": ".simple_factory",
+    "MongoDBClient": ".mongodb_client",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
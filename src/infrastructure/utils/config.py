@@ -1,3 +1,4 @@
+import functools
 import os
 from typing import Optional, Literal
 from pydantic import Field
@@ -40,6 +41,15 @@ class Settings(BaseSettings):
     app_version: str = Field("1.0.0", env="APP_VERSION")
     debug: bool = Field(False, env="DEBUG")
     
+    # Triage Configuration
+    triage_max_concurrency: int = Field(16, env="TRIAGE_MAX_CONCURRENCY")
+    llm_batch_max_wait: int = Field(3600, env="LLM_BATCH_MAX_WAIT")
+    
+    # LLM Cache Configuration
+    llm_cache_max_age: int = Field(604800, env="LLM_CACHE_MAX_AGE")
+    llm_semantic_cache: bool = Field(False, env="LLM_SEMANTIC_CACHE")
+    llm_semantic_cache_threshold: float = Field(0.95, env="LLM_SEMANTIC_CACHE_THRESHOLD")
+    
     # File Configuration
     max_file_size_mb: int = Field(50, env="MAX_FILE_SIZE_MB")
     supported_extensions: list = Field(['.pdf'], env="SUPPORTED_EXTENSIONS")
@@ -51,13 +61,21 @@ class Settings(BaseSettings):
         extra = "ignore"  # Ignorar campos extra del .env
 
 
-# Instancia global de configuración
-settings = Settings()
+# Proveedores soportados; cada uno expone un campo `<proveedor>_api_key` en Settings
+_PROVIDER_ATTRS = ("openai", "xai", "gemini", "deepseek", "anthropic")
 
 
+@functools.lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Obtiene la configuración de la aplicación."""
-    return settings
+    """Obtiene la configuración de la aplicación (se carga en el primer acceso)."""
+    return Settings()
+
+
+def __getattr__(name: str):
+    """Compatibilidad con el antiguo atributo de módulo `settings`."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def validate_environment(provider: str = None) -> bool:
@@ -67,15 +85,7 @@ def validate_environment(provider: str = None) -> bool:
         if provider is None:
             provider = settings.default_model_provider
         
-        api_key_map = {
-            "openai": settings.openai_api_key,
-            "xai": settings.xai_api_key,
-            "gemini": settings.gemini_api_key,
-            "deepseek": settings.deepseek_api_key,
-            "anthropic": settings.anthropic_api_key
-        }
-        
-        return bool(api_key_map.get(provider))
+        return bool(getattr(settings, f"{provider}_api_key", None))
     except Exception:
         return False
 
@@ -83,17 +93,4 @@ def validate_environment(provider: str = None) -> bool:
 def get_available_providers() -> list[str]:
     """Obtiene la lista de proveedores disponibles (con API keys configuradas)."""
     settings = get_settings()
-    providers = []
-    
-    if settings.openai_api_key:
-        providers.append("openai")
-    if settings.xai_api_key:
-        providers.append("xai")
-    if settings.gemini_api_key:
-        providers.append("gemini")
-    if settings.deepseek_api_key:
-        providers.append("deepseek")
-    if settings.anthropic_api_key:
-        providers.append("anthropic")
-    
-    return providers
\ No newline at end of file
+    return [p for p in _PROVIDER_ATTRS if getattr(settings, f"{p}_api_key")]
@@ -2,7 +2,7 @@
 
 import os
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_anthropic import ChatAnthropic
@@ -10,6 +10,7 @@ from langchain.schema import SystemMessage, HumanMessage
 from ...domain.interfaces import LLMInterface
 from ...domain.exceptions import LLMConnectionError
 from .config import get_settings
+from .llm_batch import openai_batch, anthropic_batch
 
 
 class BaseLLMAdapter(LLMInterface, ABC):
@@ -36,6 +37,31 @@ class BaseLLMAdapter(LLMInterface, ABC):
             return response.content
         except Exception as e:
             raise LLMConnectionError(f"Error al generar respuesta con {self.__class__.__name__}: {str(e)}")
+    
+    async def agenerate_response(self, prompt: str, content: str) -> str:
+        """Genera una respuesta con el cliente asíncrono nativo del proveedor."""
+        try:
+            messages = [
+                SystemMessage(content=prompt),
+                HumanMessage(content=content)
+            ]
+            response = await self.llm.ainvoke(messages)
+            return response.content
+        except Exception as e:
+            raise LLMConnectionError(f"Error al generar respuesta con {self.__class__.__name__}: {str(e)}")
+    
+    async def astream_response(self, prompt: str, content: str = ""):
+        """Emite la respuesta por fragmentos usando el streaming nativo del proveedor."""
+        messages = [
+            SystemMessage(content=prompt),
+            HumanMessage(content=content)
+        ]
+        try:
+            async for chunk in self.llm.astream(messages):
+                if chunk.content:
+                    yield chunk.content
+        except Exception as e:
+            raise LLMConnectionError(f"Error al generar respuesta con {self.__class__.__name__}: {str(e)}")
 
 
 class OpenAIAdapter(BaseLLMAdapter):
@@ -51,6 +77,14 @@ class OpenAIAdapter(BaseLLMAdapter):
             temperature=self.temperature,
             openai_api_key=settings.openai_api_key
         )
+    
+    supports_batch = True
+    
+    def generate_batch(self, prompt: str, contents: List[str]) -> List[Optional[str]]:
+        """Envía todas las peticiones en un único lote de la Batch API de OpenAI."""
+        return openai_batch(
+            get_settings().openai_api_key, self.model_name, self.temperature, prompt, contents
+        )
 
 
 class XAIAdapter(BaseLLMAdapter):
@@ -113,6 +147,15 @@ class AnthropicAdapter(BaseLLMAdapter):
             temperature=self.temperature,
             anthropic_api_key=settings.anthropic_api_key
         )
+    
+    supports_batch = True
+    
+    def generate_batch(self, prompt: str, contents: List[str]) -> List[Optional[str]]:
+        """Envía todas las peticiones en un único lote de Message Batches de Anthropic."""
+        return anthropic_batch(
+            get_settings().anthropic_api_key, self.model_name, self.temperature, prompt, contents,
+            max_tokens=getattr(self.llm, "max_tokens", None) or 4096
+        )
 
 
 class LLMFactory:
@@ -0,0 +1,218 @@
+"""Envío de lotes de peticiones a las Batch APIs de OpenAI y Anthropic.
+
+Cada lote comparte el prompt de sistema y envía un contenido por petición.
+Las respuestas se devuelven en el mismo orden que los contenidos; las
+peticiones que el proveedor no pudo completar quedan como None para que el
+llamador decida cómo reintentarlas.
+
+La espera tiene un máximo (LLM_BATCH_MAX_WAIT); al agotarse, o si el usuario
+interrumpe el análisis, el lote se cancela en el proveedor para no dejarlo
+procesándose (y facturándose) en segundo plano.
+"""
+
+import io
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...domain.exceptions import LLMConnectionError
+from .config import get_settings
+
+
+# Espera entre consultas de estado: empieza corta y se duplica hasta el máximo
+_POLL_INITIAL = 5.0
+_POLL_MAX = 60.0
+
+_OPENAI_TERMINAL = {"completed", "failed", "expired", "cancelled"}
+
+
+# Lotes en espera: id -> (evento de parada, función que cancela el lote en el proveedor)
+_active_batches: Dict[str, Tuple[threading.Event, Callable[[], Any]]] = {}
+_active_lock = threading.Lock()
+
+
+def _cancel_quietly(cancel: Callable[[], Any]) -> None:
+    """Cancela el lote en el proveedor; un fallo al cancelar no oculta el error original."""
+    try:
+        cancel()
+    except Exception:
+        pass
+
+
+def cancel_active_batches() -> None:
+    """Cancela todos los lotes en espera y despierta a los hilos que los esperan.
+    
+    Pensado para la interrupción del usuario cuando el lote se espera en un hilo
+    (asyncio.to_thread), donde el KeyboardInterrupt no llega.
+    """
+    with _active_lock:
+        pending = list(_active_batches.values())
+    for stop, cancel in pending:
+        stop.set()
+        _cancel_quietly(cancel)
+
+
+def _wait_for(
+    batch_id: str,
+    retrieve: Callable[[], Any],
+    is_done: Callable[[Any], bool],
+    cancel: Callable[[], Any],
+    max_wait: float
+) -> Any:
+    """Consulta retrieve() con backoff exponencial hasta que is_done sea verdadero.
+    
+    Raises:
+        LLMConnectionError: Si el lote no termina en max_wait segundos (se cancela)
+        KeyboardInterrupt: Si el usuario interrumpe la espera (se cancela)
+    """
+    stop = threading.Event()
+    with _active_lock:
+        _active_batches[batch_id] = (stop, cancel)
+    
+    deadline = time.monotonic() + max_wait
+    delay = _POLL_INITIAL
+    try:
+        while True:
+            batch = retrieve()
+            if is_done(batch):
+                return batch
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                _cancel_quietly(cancel)
+                raise LLMConnectionError(f"El lote {batch_id} no terminó en {max_wait:.0f} s y fue cancelado")
+            if stop.wait(min(delay, remaining)):
+                # cancel_active_batches ya canceló el lote en el proveedor
+                raise KeyboardInterrupt(f"Lote {batch_id} cancelado")
+            delay = min(delay * 2, _POLL_MAX)
+    except KeyboardInterrupt:
+        if not stop.is_set():
+            _cancel_quietly(cancel)
+        raise
+    finally:
+        with _active_lock:
+            _active_batches.pop(batch_id, None)
+
+
+def openai_batch(
+    api_key: str,
+    model: str,
+    temperature: float,
+    prompt: str,
+    contents: List[str],
+    base_url: Optional[str] = None,
+    max_wait: Optional[float] = None
+) -> List[Optional[str]]:
+    """Resuelve las peticiones con la Batch API de OpenAI (/v1/chat/completions)."""
+    from openai import OpenAI
+    
+    if max_wait is None:
+        max_wait = get_settings().llm_batch_max_wait
+    client = OpenAI(api_key=api_key, base_url=base_url)
+    lines = []
+    for i, content in enumerate(contents):
+        lines.append(json.dumps({
+            "custom_id": f"req-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "temperature": temperature,
+                "messages": [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": content}
+                ]
+            }
+        }, ensure_ascii=False))
+    
+    try:
+        input_file = client.files.create(
+            file=("batch.jsonl", io.BytesIO("\n".join(lines).encode("utf-8"))),
+            purpose="batch"
+        )
+        created = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        batch = _wait_for(
+            created.id,
+            lambda: client.batches.retrieve(created.id),
+            lambda b: b.status in _OPENAI_TERMINAL,
+            lambda: client.batches.cancel(created.id),
+            max_wait
+        )
+        if batch.status != "completed" or not batch.output_file_id:
+            raise LLMConnectionError(f"El lote de OpenAI terminó con estado '{batch.status}'")
+        output = client.files.content(batch.output_file_id).text
+    except LLMConnectionError:
+        raise
+    except Exception as e:
+        raise LLMConnectionError(f"Error en la Batch API de OpenAI: {str(e)}")
+    
+    responses: List[Optional[str]] = [None] * len(contents)
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            continue
+        index = int(item["custom_id"].split("-", 1)[1])
+        responses[index] = response["body"]["choices"][0]["message"]["content"]
+    return responses
+
+
+def anthropic_batch(
+    api_key: str,
+    model: str,
+    temperature: float,
+    prompt: str,
+    contents: List[str],
+    max_tokens: int = 4096,
+    max_wait: Optional[float] = None
+) -> List[Optional[str]]:
+    """Resuelve las peticiones con Message Batches de Anthropic."""
+    from anthropic import Anthropic
+    
+    if max_wait is None:
+        max_wait = get_settings().llm_batch_max_wait
+    client = Anthropic(api_key=api_key)
+    requests = [
+        {
+            "custom_id": f"req-{i}",
+            "params": {
+                "model": model,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "system": prompt,
+                "messages": [{"role": "user", "content": content}]
+            }
+        }
+        for i, content in enumerate(contents)
+    ]
+    
+    try:
+        batch = client.messages.batches.create(requests=requests)
+        _wait_for(
+            batch.id,
+            lambda: client.messages.batches.retrieve(batch.id),
+            lambda b: b.processing_status == "ended",
+            lambda: client.messages.batches.cancel(batch.id),
+            max_wait
+        )
+        results = list(client.messages.batches.results(batch.id))
+    except LLMConnectionError:
+        raise
+    except Exception as e:
+        raise LLMConnectionError(f"Error en Message Batches de Anthropic: {str(e)}")
+    
+    responses: List[Optional[str]] = [None] * len(contents)
+    for item in results:
+        if item.result.type != "succeeded":
+            continue
+        index = int(item.custom_id.split("-", 1)[1])
+        responses[index] = "".join(
+            block.text for block in item.result.message.content if block.type == "text"
+        )
+    return responses
@@ -0,0 +1,273 @@
+"""Caché persistente de respuestas de LLM."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from ...domain.interfaces import LLMInterface
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pdf-analyzer", "llm.sqlite")
+
+
+class LLMResponseCache:
+    """Almacén clave/valor de respuestas de LLM respaldado por SQLite.
+    
+    La conexión se abre de forma perezosa y se comparte entre hilos
+    (protegida por un lock), de modo que también puede usarse desde
+    asyncio.to_thread. Con max_age (segundos) las entradas más antiguas se
+    ignoran y se eliminan al abrir la conexión.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_age: Optional[float] = None):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.max_age = max_age
+        self._conn = None
+        self._lock = threading.Lock()
+    
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            if self.max_age is not None:
+                conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age,))
+                conn.commit()
+            self._conn = conn
+        return self._conn
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Construye la clave de caché a partir de las partes que determinan la respuesta."""
+        return hashlib.blake2b("|".join(map(str, parts)).encode("utf-8"), digest_size=32).hexdigest()
+    
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[str]:
+        """Retorna la respuesta almacenada o None (también si la caché no es accesible).
+        
+        Con max_age (segundos) se ignoran las entradas más antiguas; por
+        defecto se usa el max_age de la caché.
+        """
+        if max_age is None:
+            max_age = self.max_age
+        min_created = time.time() - max_age if max_age is not None else 0.0
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT value FROM responses WHERE key = ? AND created_at >= ?", (key, min_created)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+    
+    def set(self, key: str, value: str) -> None:
+        """Guarda una respuesta; los errores de escritura no interrumpen el análisis."""
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, time.time())
+                )
+                conn.commit()
+        except sqlite3.Error:
+            pass
+    
+    def delete(self, key: str) -> None:
+        """Elimina una entrada; los errores de escritura no interrumpen el análisis."""
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+        except sqlite3.Error:
+            pass
+    
+    def close(self) -> None:
+        """Cierra la conexión SQLite si estaba abierta."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachedLLM(LLMInterface):
+    """Decorador de LLMInterface que reutiliza respuestas idénticas desde la caché.
+    
+    La clave combina el proveedor, el modelo y la temperatura con el prompt y
+    el contenido enviados. Con una caché semántica (semantic), las llamadas
+    que la piden explícitamente (semantic=True) consultan también, si falla la
+    caché exacta, por similitud del contenido dentro del mismo prompt. Solo
+    tiene sentido para contenidos cortos: el modelo de embeddings trunca los
+    textos largos y dos documentos con el mismo inicio parecerían iguales.
+    
+    Con validate (la función con la que el llamador parsea la respuesta) una
+    respuesta nueva solo se guarda si se puede parsear, y una entrada
+    cacheada que no se puede parsear se descarta y se vuelve a pedir.
+    Los atributos no definidos aquí (por ejemplo `llm`,
+    usado por los agentes ReAct) se delegan al adaptador envuelto.
+    """
+    
+    def __init__(
+        self,
+        llm: LLMInterface,
+        provider: str,
+        model_name: Optional[str],
+        temperature: float,
+        cache: Optional[LLMResponseCache] = None,
+        semantic: Optional[Any] = None
+    ):
+        self._wrapped = llm
+        self._key_prefix = (provider, model_name or "default", temperature)
+        self._cache = cache or LLMResponseCache()
+        self._semantic = semantic
+    
+    # Permite a los llamadores detectar que pueden pasar semantic/validate
+    caches_responses = True
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._wrapped, name)
+    
+    def is_available(self) -> bool:
+        return self._wrapped.is_available()
+    
+    def _key(self, prompt: str, content: str) -> str:
+        return self._cache.make_key(*self._key_prefix, prompt, content)
+    
+    @property
+    def supports_semantic_cache(self) -> bool:
+        """Indica si generate_response/generate_batch admiten semantic=True."""
+        return self._semantic is not None
+    
+    @staticmethod
+    def _is_valid(response: str, validate: Optional[Callable[[str], Any]]) -> bool:
+        if validate is None:
+            return True
+        try:
+            validate(response)
+            return True
+        except Exception:
+            return False
+    
+    def _lookup(
+        self,
+        prompt: str,
+        content: str,
+        semantic: bool = False,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> Optional[str]:
+        """Busca la respuesta en la caché exacta y, si se pide y falla, en la semántica."""
+        key = self._key(prompt, content)
+        response = self._cache.get(key)
+        if response is not None and not self._is_valid(response, validate):
+            # Entrada que no se puede parsear: se descarta para volver a pedirla
+            self._cache.delete(key)
+            response = None
+        if response is None and semantic and self._semantic is not None:
+            response = self._semantic.get(content, namespace=self._key(prompt, ""))
+            if response is not None and not self._is_valid(response, validate):
+                response = None
+        return response
+    
+    def _store(self, prompt: str, content: str, response: str, semantic: bool = False) -> None:
+        self._cache.set(self._key(prompt, content), response)
+        if semantic and self._semantic is not None:
+            self._semantic.put(content, response, namespace=self._key(prompt, ""))
+    
+    def _commit(
+        self,
+        prompt: str,
+        content: str,
+        response: str,
+        semantic: bool,
+        validate: Optional[Callable[[str], Any]]
+    ) -> None:
+        """Guarda una respuesta nueva tras validarla; si validate falla el error se propaga."""
+        if validate is not None:
+            validate(response)
+        self._store(prompt, content, response, semantic)
+    
+    def generate_response(
+        self,
+        prompt: str,
+        content: str = "",
+        semantic: bool = False,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """Genera una respuesta, sirviéndola desde la caché si ya se obtuvo antes.
+        
+        semantic habilita la caché semántica para esta llamada (solo consultas
+        cortas); validate se aplica antes de guardar una respuesta nueva.
+        """
+        response = self._lookup(prompt, content, semantic, validate)
+        if response is None:
+            response = self._wrapped.generate_response(prompt, content)
+            self._commit(prompt, content, response, semantic, validate)
+        return response
+    
+    @property
+    def supports_batch(self) -> bool:
+        return getattr(self._wrapped, "supports_batch", False)
+    
+    def generate_batch(
+        self,
+        prompt: str,
+        contents: List[str],
+        semantic: bool = False,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> List[Optional[str]]:
+        """Resuelve desde la caché lo posible y envía el resto en un único lote.
+        
+        Las respuestas nuevas que no superan validate se retornan sin guardarse.
+        """
+        responses = [self._lookup(prompt, content, semantic, validate) for content in contents]
+        missing = [i for i, response in enumerate(responses) if response is None]
+        if missing:
+            fetched = self._wrapped.generate_batch(prompt, [contents[i] for i in missing])
+            for i, response in zip(missing, fetched):
+                if response is not None:
+                    responses[i] = response
+                    if self._is_valid(response, validate):
+                        self._store(prompt, contents[i], response, semantic)
+        return responses
+    
+    async def agenerate_response(
+        self,
+        prompt: str,
+        content: str = "",
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """Versión asíncrona de generate_response."""
+        response = self._lookup(prompt, content, validate=validate)
+        if response is None:
+            response = await self._wrapped.agenerate_response(prompt, content)
+            self._commit(prompt, content, response, False, validate)
+        return response
+    
+    async def astream_response(
+        self,
+        prompt: str,
+        content: str = "",
+        validate: Optional[Callable[[str], Any]] = None
+    ):
+        """Versión en streaming: una respuesta cacheada se emite como un único fragmento.
+        
+        La respuesta completa solo se guarda si supera validate; el error de
+        parseo lo informa el llamador al procesar los fragmentos.
+        """
+        response = self._lookup(prompt, content, validate=validate)
+        if response is not None:
+            yield response
+            return
+        parts = []
+        async for chunk in self._wrapped.astream_response(prompt, content):
+            parts.append(chunk)
+            yield chunk
+        response = "".join(parts)
+        if self._is_valid(response, validate):
+            self._store(prompt, content, response)
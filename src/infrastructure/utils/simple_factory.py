@@ -1,34 +1,76 @@
 """Simplified dependency factory following Clean Architecture principles."""
 
-from typing import Optional
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
+from typing import Optional, TYPE_CHECKING
 from ...domain.interfaces import (
     PDFReaderInterface,
     LLMInterface,
     SecurityAnalyzerInterface,
     TriageAnalyzerInterface
 )
-from ...domain.services import SecurityAnalysisService, ReportValidationService
+from ...domain.services import SecurityAnalysisService, ReportValidationService, TriageService
 from ...application.use_cases import (
     ReadPDFUseCase,
     TriageVulnerabilitiesUseCase,
     CompleteSecurityAnalysisUseCase
 )
-from ..adapters.external.tools.pdf_reader import PyPDF2Reader
+# Los adaptadores y agentes (PyPDF2, LangChain, SDKs de proveedores) se importan
+# dentro de cada método para no cargarlos al importar el factory.
 # LLMFactory se importa dinámicamente para evitar importación circular
-from ..services.agents import LangChainReportAnalyzer, StaticAnalysisAgent, TriageAgent
-from .config import get_settings, validate_environment, get_available_providers
+from .config import get_settings, validate_environment, get_available_providers, _PROVIDER_ATTRS
+
+if TYPE_CHECKING:
+    from ..services.agents import StaticAnalysisAgent
+
+_DEFAULT_TEMPERATURE = 0.1
 
 
 class SimpleDependencyFactory:
     """Simplified factory for creating and injecting dependencies."""
     
-    def __init__(self):
+    __slots__ = (
+        "_settings",
+        "_default_provider",
+        "_llm_cache",
+        "_llm_cache_max",
+        "_provider_slots",
+        "_llm_slots",
+        "_llm_lock",
+        "_env_valid",
+        "_available_providers",
+        "_analysis_service",
+        "_validation_service",
+        "_triage_service",
+        "_services_lock",
+    )
+    
+    def __init__(self, llm_cache_max: int = 8):
         self._settings = get_settings()
-        self._llm_cache = {}
+        self._default_provider = self._settings.default_model_provider
+        # LRU cache of LLM clients; each client may hold its own HTTP pool
+        self._llm_cache = OrderedDict()
+        self._llm_cache_max = llm_cache_max
+        # Fixed slots for the common case (provider default model and temperature)
+        self._provider_slots = {p: i for i, p in enumerate(_PROVIDER_ATTRS)}
+        self._llm_slots: list[Optional[LLMInterface]] = [None] * len(self._provider_slots)
+        # Guards the cache when clients are built from worker threads (acreate_llm)
+        self._llm_lock = threading.RLock()
+        # Memoized environment checks (reset by clear_cache)
+        self._env_valid: dict[str, bool] = {}
+        self._available_providers: Optional[list[str]] = None
+        # Stateless domain services, created once and shared
+        self._analysis_service: Optional[SecurityAnalysisService] = None
+        self._validation_service: Optional[ReportValidationService] = None
+        self._triage_service: Optional[TriageService] = None
+        self._services_lock = threading.Lock()
     
     # Core adapters
     def create_pdf_reader(self) -> PDFReaderInterface:
         """Create PDF reader instance."""
+        from ..adapters.external.tools.pdf_reader import PyPDF2Reader
         return PyPDF2Reader()
     
     def create_llm(
@@ -38,44 +80,162 @@ class SimpleDependencyFactory:
         temperature: Optional[float] = None
     ) -> LLMInterface:
         """Create LLM instance with caching."""
-        # Use defaults if not provided
-        provider = provider or self._settings.default_model_provider
-        temperature = temperature or 0.1
-        
-        # Create cache key
-        cache_key = f"{provider}:{model_name}:{temperature}"
-        
-        # Return cached instance if available
-        if cache_key in self._llm_cache:
-            return self._llm_cache[cache_key]
-        
-        # Validate provider configuration
-        if not validate_environment(provider):
-            available = get_available_providers()
-            if available:
-                provider = available[0]
-            else:
-                raise ValueError("No LLM providers configured. Set up at least one API key.")
-        
-        # Create and cache LLM instance
-        # Importación dinámica para evitar importación circular
-        from ..adapters.llm.llm_adapters import LLMFactory
-        llm = LLMFactory.create_llm(provider, model_name, temperature)
-        self._llm_cache[cache_key] = llm
-        return llm
+        # Use defaults if not provided (an explicit temperature of 0.0 is kept)
+        if provider is None:
+            provider = self._default_provider
+        
+        # Fast path: default model and temperature are served from the provider slot
+        slot = None
+        if model_name is None and temperature in (None, _DEFAULT_TEMPERATURE):
+            slot = self._provider_slots.get(provider)
+            if slot is not None and self._llm_slots[slot] is not None:
+                return self._llm_slots[slot]
+        
+        if temperature is None:
+            temperature = _DEFAULT_TEMPERATURE
+        
+        # Create cache key (temperature rounded so 0.1 and 0.1000001 share a client)
+        cache_key = (provider, model_name, round(float(temperature), 3))
+        
+        with self._llm_lock:
+            # Return cached instance if available
+            cache = self._llm_cache
+            if cache_key in cache:
+                cache.move_to_end(cache_key)
+                return cache[cache_key]
+        
+            # Validate provider configuration
+            if not self.validate_provider(provider):
+                available = self.get_available_providers()
+                if available:
+                    provider = available[0]
+                else:
+                    raise ValueError("No LLM providers configured. Set up at least one API key.")
+        
+            # Create and cache LLM instance
+            # Importación dinámica para evitar importación circular
+            from ..adapters.llm.llm_adapters import LLMFactory
+            llm = LLMFactory.create_llm(provider, model_name, temperature)
+            if len(cache) >= self._llm_cache_max:
+                evicted_key, evicted = cache.popitem(last=False)
+                self._clear_slot(evicted_key)
+                self._close_llm(evicted)
+            cache[cache_key] = llm
+            if slot is not None:
+                self._llm_slots[slot] = llm
+            return llm
+    
+    def create_cached_llm(
+        self,
+        provider: Optional[str] = None,
+        model_name: Optional[str] = None,
+        temperature: Optional[float] = None
+    ) -> LLMInterface:
+        """Create an LLM whose responses are persisted and reused for identical prompts.
+        
+        Entries expire after LLM_CACHE_MAX_AGE seconds.
+        
+        When LLM_SEMANTIC_CACHE is enabled (and sentence-transformers is
+        installed) calls made with semantic=True, such as the per-vulnerability
+        triage queries, also reuse responses for near-identical contents.
+        """
+        from .llm_cache import CachedLLM, LLMResponseCache
+        from ..adapters.llm.semantic_cache import get_semantic_cache
+        if provider is None:
+            provider = self._default_provider
+        if temperature is None:
+            temperature = _DEFAULT_TEMPERATURE
+        llm = self.create_llm(provider, model_name, temperature)
+        return CachedLLM(
+            llm, provider, model_name, round(float(temperature), 3),
+            cache=LLMResponseCache(max_age=self._settings.llm_cache_max_age),
+            semantic=get_semantic_cache()
+        )
+    
+    def warmup(self, providers: Optional[list[str]] = None, temperature: float = _DEFAULT_TEMPERATURE) -> None:
+        """Pre-populate the LLM cache so the first request does not pay client setup.
+        
+        Intended to be called from the application bootstrap. Clients are built
+        sequentially: the LangChain chat models do no network I/O on construction.
+        
+        Args:
+            providers: Providers to warm up (defaults to every configured provider)
+            temperature: Temperature of the clients to build
+        """
+        if providers is None:
+            providers = self.get_available_providers()
+        for provider in providers[:self._llm_cache_max]:
+            self.create_llm(provider=provider, temperature=temperature)
+    
+    async def acreate_llm(
+        self,
+        provider: Optional[str] = None,
+        model_name: Optional[str] = None,
+        temperature: Optional[float] = None
+    ) -> LLMInterface:
+        """Async variant of create_llm for callers running inside an event loop.
+        
+        Cached clients are returned without leaving the loop; on a miss the
+        client is built in a worker thread so the loop keeps serving other I/O.
+        """
+        key_provider = self._default_provider if provider is None else provider
+        key_temperature = _DEFAULT_TEMPERATURE if temperature is None else round(float(temperature), 3)
+        if model_name is None and key_temperature == _DEFAULT_TEMPERATURE:
+            slot = self._provider_slots.get(key_provider)
+            if slot is not None and self._llm_slots[slot] is not None:
+                return self._llm_slots[slot]
+        llm = self._llm_cache.get((key_provider, model_name, key_temperature))
+        if llm is not None:
+            return llm
+        return await asyncio.to_thread(self.create_llm, provider, model_name, temperature)
+    
+    async def warmup_async(self, providers: Optional[list[str]] = None, temperature: float = _DEFAULT_TEMPERATURE) -> None:
+        """Async counterpart of warmup; clients are built concurrently in worker threads."""
+        if providers is None:
+            providers = self.get_available_providers()
+        await asyncio.gather(*(
+            self.acreate_llm(provider=provider, temperature=temperature)
+            for provider in providers[:self._llm_cache_max]
+        ))
+    
+    def _clear_slot(self, cache_key: tuple) -> None:
+        """Drop the provider slot that points at an evicted cache entry."""
+        provider, model_name, temperature = cache_key
+        if model_name is None and temperature == _DEFAULT_TEMPERATURE:
+            slot = self._provider_slots.get(provider)
+            if slot is not None:
+                self._llm_slots[slot] = None
+    
+    @staticmethod
+    def _close_llm(llm: LLMInterface) -> None:
+        """Release resources held by an evicted LLM client, if it supports it."""
+        close = getattr(llm, "close", None)
+        if callable(close):
+            close()
     
     # Domain services (analyzers)
     def create_security_analyzer(self, llm: Optional[LLMInterface] = None) -> SecurityAnalyzerInterface:
         """Create security analyzer."""
+        from ..services.agents import LangChainReportAnalyzer
         if llm is None:
             llm = self.create_llm()
         return LangChainReportAnalyzer(llm)
     
-    def create_triage_analyzer(self, llm: Optional[LLMInterface] = None) -> TriageAnalyzerInterface:
-        """Create triage analyzer."""
+    def create_triage_analyzer(
+        self,
+        llm: Optional[LLMInterface] = None,
+        max_concurrency: Optional[int] = None,
+        batch_api: bool = False
+    ) -> TriageAnalyzerInterface:
+        """Create triage analyzer (max_concurrency defaults to TRIAGE_MAX_CONCURRENCY).
+        
+        With batch_api the classification requests go through the provider's
+        Batch API when the LLM supports it.
+        """
+        from ..services.agents import TriageAgent
         if llm is None:
             llm = self.create_llm()
-        return TriageAgent(llm)
+        return TriageAgent(llm, max_concurrency=max_concurrency, batch_api=batch_api)
     
     def create_static_analyzer(
         self, 
@@ -83,8 +243,9 @@ class SimpleDependencyFactory:
         model_name: Optional[str] = None,
         temperature: Optional[float] = None,
         llm: Optional[LLMInterface] = None
-    ) -> StaticAnalysisAgent:
+    ) -> "StaticAnalysisAgent":
         """Create static analysis agent."""
+        from ..services.agents import StaticAnalysisAgent
         if llm is None:
             llm = self.create_llm(provider, model_name, temperature)
         return StaticAnalysisAgent(llm)
@@ -94,86 +255,138 @@ class SimpleDependencyFactory:
         self,
         provider: Optional[str] = None,
         model_name: Optional[str] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        llm: Optional[LLMInterface] = None,
+        pdf_reader: Optional[PDFReaderInterface] = None,
+        security_analyzer: Optional[SecurityAnalyzerInterface] = None
     ) -> ReadPDFUseCase:
         """Create PDF reading use case with all dependencies."""
-        pdf_reader = self.create_pdf_reader()
-        llm = self.create_llm(provider, model_name, temperature)
-        security_analyzer = self.create_security_analyzer(llm)
-        analysis_service = SecurityAnalysisService()
-        validation_service = ReportValidationService()
+        if pdf_reader is None:
+            pdf_reader = self.create_pdf_reader()
+        if security_analyzer is None:
+            if llm is None:
+                llm = self.create_llm(provider, model_name, temperature)
+            security_analyzer = self.create_security_analyzer(llm)
         
         return ReadPDFUseCase(
             pdf_reader=pdf_reader,
             security_analyzer=security_analyzer,
-            analysis_service=analysis_service,
-            validation_service=validation_service
+            analysis_service=self._get_analysis_service(),
+            validation_service=self._get_validation_service()
         )
     
+    def _get_analysis_service(self) -> SecurityAnalysisService:
+        """Get the shared security analysis service."""
+        if self._analysis_service is None:
+            with self._services_lock:
+                if self._analysis_service is None:
+                    self._analysis_service = SecurityAnalysisService()
+        return self._analysis_service
+    
+    def _get_triage_service(self) -> TriageService:
+        """Get the shared triage service."""
+        if self._triage_service is None:
+            with self._services_lock:
+                if self._triage_service is None:
+                    self._triage_service = TriageService()
+        return self._triage_service
+    
+    def _get_validation_service(self) -> ReportValidationService:
+        """Get the shared report validation service."""
+        if self._validation_service is None:
+            with self._services_lock:
+                if self._validation_service is None:
+                    self._validation_service = ReportValidationService()
+        return self._validation_service
+    
     def create_triage_use_case(
         self,
         provider: Optional[str] = None,
         model_name: Optional[str] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        llm: Optional[LLMInterface] = None,
+        max_concurrency: Optional[int] = None,
+        batch_api: bool = False
     ) -> TriageVulnerabilitiesUseCase:
         """Create vulnerability triage use case."""
-        llm = self.create_llm(provider, model_name, temperature)
-        triage_analyzer = self.create_triage_analyzer(llm)
+        if llm is None:
+            llm = self.create_llm(provider, model_name, temperature)
+        triage_analyzer = self.create_triage_analyzer(
+            llm, max_concurrency=max_concurrency, batch_api=batch_api
+        )
         
         return TriageVulnerabilitiesUseCase(
             triage_analyzer=triage_analyzer,
-            llm=llm
+            triage_service=self._get_triage_service(),
+            validation_service=self._get_validation_service()
         )
     
     def create_complete_analysis_use_case(
         self,
         provider: Optional[str] = None,
         model_name: Optional[str] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        triage_concurrency: Optional[int] = None,
+        triage_batch_api: bool = False,
+        use_cache: bool = True
     ) -> CompleteSecurityAnalysisUseCase:
-        """Create complete analysis use case."""
+        """Create complete analysis use case.
+        
+        With use_cache the shared LLM reuses persisted responses across runs.
+        """
+        # Build the LLM once and share it across every component
+        if use_cache:
+            llm = self.create_cached_llm(provider, model_name, temperature)
+        else:
+            llm = self.create_llm(provider, model_name, temperature)
+        
         # Create individual use cases
-        read_pdf_use_case = self.create_read_pdf_use_case(provider, model_name, temperature)
-        triage_use_case = self.create_triage_use_case(provider, model_name, temperature)
+        read_pdf_use_case = self.create_read_pdf_use_case(llm=llm)
+        triage_use_case = self.create_triage_use_case(
+            llm=llm, max_concurrency=triage_concurrency, batch_api=triage_batch_api
+        )
         
-        # Create additional analyzers
-        llm = self.create_llm(provider, model_name, temperature)
-        static_analyzer = self.create_static_analyzer(llm)
+        # Create validation agents (static and dynamic phases)
+        from ..services.agents import DynamicAnalysisAgent
+        static_agent = self.create_static_analyzer(llm=llm)
+        dynamic_agent = DynamicAnalysisAgent(llm)
         
         return CompleteSecurityAnalysisUseCase(
-            read_pdf_use_case=read_pdf_use_case,
+            pdf_use_case=read_pdf_use_case,
             triage_use_case=triage_use_case,
-            static_analyzer=static_analyzer,
-            llm=llm
+            static_agent=static_agent,
+            dynamic_agent=dynamic_agent
         )
     
     # Utility methods
     def get_available_providers(self) -> list[str]:
         """Get list of available LLM providers."""
-        return get_available_providers()
+        if self._available_providers is None:
+            self._available_providers = get_available_providers()
+        return list(self._available_providers)
     
     def validate_provider(self, provider: str) -> bool:
         """Validate if provider is properly configured."""
-        return validate_environment(provider)
+        valid = self._env_valid.get(provider)
+        if valid is None:
+            valid = self._env_valid[provider] = validate_environment(provider)
+        return valid
     
     def clear_cache(self) -> None:
-        """Clear LLM cache."""
-        self._llm_cache.clear()
-
-
-# Global factory instance
-_factory_instance = None
+        """Clear LLM cache and memoized environment checks."""
+        with self._llm_lock:
+            self._llm_cache.clear()
+            self._llm_slots = [None] * len(self._provider_slots)
+        self._env_valid.clear()
+        self._available_providers = None
 
 
+@functools.lru_cache(maxsize=1)
 def get_simple_factory() -> SimpleDependencyFactory:
-    """Get global factory instance (singleton pattern)."""
-    global _factory_instance
-    if _factory_instance is None:
-        _factory_instance = SimpleDependencyFactory()
-    return _factory_instance
+    """Get global factory instance (built on first access)."""
+    return SimpleDependencyFactory()
 
 
 def reset_factory() -> None:
     """Reset factory instance (useful for testing)."""
-    global _factory_instance
-    _factory_instance = None
\ No newline at end of file
+    get_simple_factory.cache_clear()
@@ -1,19 +1,23 @@
 import typer
+import functools
+import hashlib
+import mmap
 import os
-import time
+import shutil
+import stat
+import sys
+import tempfile
 import threading
+import traceback
 import json
 from typing import Optional
 from datetime import datetime
-from rich.console import Console
-from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.table import Table
-from rich.text import Text
-from ..infrastructure.utils.factory import get_factory
-from ..infrastructure.utils.config import validate_environment, get_available_providers
-from ..infrastructure.utils.llm_adapters import LLMFactory
-from ..infrastructure.utils.mongodb_client import MongoDBClient
+try:
+    import orjson
+except ImportError:  # orjson es opcional; se usa json de la stdlib como respaldo
+    orjson = None
+# Rich, asyncio, el factory, LangChain y MongoDB se importan dentro de cada comando para
+# que comandos simples como `version` no paguen su tiempo de carga.
 from ..domain.exceptions import (
     PDFAnalyzerException, PDFNotFoundError, InvalidPDFError, 
     PDFReadError, ReportAnalysisError, LLMConnectionError, JSONParsingError
@@ -24,7 +28,75 @@ app = typer.Typer(
     help="Analizador de reportes PDF usando LangChain",
     add_completion=False
 )
-console = Console()
+
+
+class _LazyConsole:
+    """Proxy de la consola de Rich que la crea en el primer uso."""
+    
+    def __init__(self):
+        self._console = None
+    
+    def __getattr__(self, name):
+        # Solo se invoca para atributos que el proxy no define (print, status, ...)
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
+
+
+class _SpinnerService:
+    """Hilo único de animación compartido por todos los spinners.
+    
+    Evita crear un hilo por cada bloque ``with LoadingSpinner(...)``: el hilo
+    se inicia con el primer spinner y anima el spinner más reciente de la pila
+    (los spinners anidados restauran al exterior al terminar). Sin spinners
+    activos el hilo queda bloqueado en el evento, sin despertar periódicamente.
+    """
+    
+    _CLEAR_LINE = b"\r\033[2K"
+    
+    def __init__(self, interval: float = 0.2):
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stack: list = []
+        self._thread: Optional[threading.Thread] = None
+    
+    def attach(self, spinner: "LoadingSpinner"):
+        """Activa un spinner (inicia el hilo de animación la primera vez)."""
+        with self._lock:
+            self._stack.append(spinner)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="loading-spinner", daemon=True)
+                self._thread.start()
+        self._wake.set()
+    
+    def detach(self, spinner: "LoadingSpinner"):
+        """Desactiva el spinner y limpia su línea."""
+        with self._lock:
+            if spinner in self._stack:
+                self._stack.remove(spinner)
+            # Una sola escritura: retorno de carro + borrar la línea completa
+            out = sys.stdout.buffer
+            out.write(self._CLEAR_LINE)
+            out.flush()
+    
+    def _run(self):
+        """Bucle del hilo: dibuja un frame del spinner activo en cada tick."""
+        while True:
+            with self._lock:
+                spinner = self._stack[-1] if self._stack else None
+                if spinner is not None:
+                    spinner._render_frame()
+            # Sin spinner activo se espera al próximo attach sin timeout
+            self._wake.wait(self._interval if spinner is not None else None)
+            self._wake.clear()
+
+
+_spinner_service = _SpinnerService()
 
 
 class LoadingSpinner:
@@ -33,38 +105,46 @@ class LoadingSpinner:
     def __init__(self, message: str = "Procesando..."):
         self.message = message
         self.spinner_chars = ['|', '/', '—', '\\']
-        self.running = False
-        self.thread = None
         self.current_char_index = 0
+        # Sin TTY (salida redirigida, pipes) o en CI el spinner no escribe nada
+        self._enabled = sys.stdout.isatty() and not os.environ.get("CI")
+        self._frames = self._build_frames() if self._enabled else ()
+    
+    def _build_frames(self) -> tuple:
+        """Precalcula cada frame (borrado de línea, color, símbolo y mensaje) como bytes.
+        
+        Borrar la línea en el propio frame evita restos de un mensaje anterior más largo.
+        """
+        encoding = sys.stdout.encoding or "utf-8"
+        message = self.message.encode(encoding, errors="replace")
+        return tuple(
+            b"\r\033[2K\033[1;34m" + char.encode(encoding, errors="replace") + b"\033[0m " + message
+            for char in self.spinner_chars
+        )
     
-    def _spin(self):
-        """Ejecuta la animación en un hilo separado."""
-        while self.running:
-            char = self.spinner_chars[self.current_char_index]
-            # Usar print estándar para evitar problemas con Rich markup
-            print(f"\r\033[1;34m{char}\033[0m {self.message}", end="", flush=True)
-            self.current_char_index = (self.current_char_index + 1) % len(self.spinner_chars)
-            time.sleep(0.2)
+    def _render_frame(self):
+        """Dibuja el frame actual (invocado desde el hilo del servicio)."""
+        # Escritura única en el buffer binario para evitar problemas con Rich markup
+        out = sys.stdout.buffer
+        out.write(self._frames[self.current_char_index])
+        out.flush()
+        self.current_char_index = (self.current_char_index + 1) % len(self._frames)
     
     def start(self):
         """Inicia la animación."""
-        self.running = True
-        self.thread = threading.Thread(target=self._spin)
-        self.thread.daemon = True
-        self.thread.start()
+        if self._enabled:
+            _spinner_service.attach(self)
     
     def stop(self):
         """Detiene la animación."""
-        self.running = False
-        if self.thread:
-            self.thread.join(timeout=0.5)
-        # Limpiar la línea
-        print("\r" + " " * (len(self.message) + 10), end="")
-        print("\r", end="", flush=True)
+        if self._enabled:
+            _spinner_service.detach(self)
     
     def update_message(self, new_message: str):
         """Actualiza el mensaje de la animación."""
         self.message = new_message
+        if self._enabled:
+            self._frames = self._build_frames()
     
     def __enter__(self):
         self.start()
@@ -74,19 +154,449 @@ class LoadingSpinner:
         self.stop()
 
 
+def _dumps_json(data, indent: bool = True) -> str:
+    """Serializa a JSON (UTF-8 sin escapar) usando orjson si está disponible."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option, default=str).decode()
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False, default=str)
+
+
+def _load_json_file(path: str):
+    """Lee un archivo JSON usando orjson si está disponible.
+    
+    orjson.JSONDecodeError hereda de json.JSONDecodeError, por lo que los
+    errores de formato se capturan igual en ambos casos.
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json_text(json_text: str, path: str):
+    """Escribe a disco un JSON ya serializado (sin volver a recorrer el dict)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json_text)
+
+
+@functools.lru_cache(maxsize=1)
+def _json_syntax_parts():
+    """Lexer JSON y tema monokai resueltos una sola vez (Pygments los busca por nombre)."""
+    from pygments.lexers.data import JsonLexer
+    from rich.syntax import Syntax
+    return JsonLexer(), Syntax.get_theme("monokai")
+
+
+def _json_syntax(code: str, line_numbers: bool = False):
+    """Crea un bloque Syntax de Rich para JSON reutilizando lexer y tema."""
+    from rich.syntax import Syntax
+    lexer, theme = _json_syntax_parts()
+    return Syntax(code, lexer, theme=theme, line_numbers=line_numbers)
+
+
+_JSON_PANEL_STYLE = "green"
+
+
+def _print_json_panel(code: str, title: str):
+    """Imprime JSON resaltado (con números de línea) dentro de un panel."""
+    from rich.panel import Panel
+    console.print(Panel(_json_syntax(code, line_numbers=True), title=title, border_style=_JSON_PANEL_STYLE))
+
+
+def _die(message: str, *hints: str) -> typer.Exit:
+    """Muestra un error (y sugerencias opcionales) y retorna el typer.Exit a lanzar.
+    
+    Uso: ``raise _die("Error: ...", "sugerencia")``.
+    """
+    console.print(f"[red]{message}[/red]")
+    for hint in hints:
+        console.print(f"[yellow]{hint}[/yellow]")
+    return typer.Exit(1)
+
+
+def _require_path(path: str, directory: bool, missing_message: str) -> os.stat_result:
+    """Valida existencia y tipo de path con un único stat y retorna el resultado.
+    
+    Sale con missing_message si no existe y con un error específico si existe
+    pero no es del tipo esperado (archivo regular o directorio).
+    """
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise _die(missing_message)
+    if directory and not stat.S_ISDIR(st.st_mode):
+        raise _die(f"❌ {path} no es un directorio")
+    if not directory and not stat.S_ISREG(st.st_mode):
+        raise _die(f"❌ {path} no es un archivo")
+    return st
+
+
+def _print_tb(verbose: bool):
+    """En modo verbose, escribe el traceback de la excepción actual en stderr."""
+    if verbose:
+        traceback.print_exc(file=sys.stderr)
+
+
+# Mensaje (plantilla) y sugerencias para cada excepción del dominio en el comando read
+_ANALYZER_ERRORS: dict = {
+    PDFNotFoundError: ("Archivo no encontrado: {}", ()),
+    InvalidPDFError: ("Archivo PDF inválido: {}", ()),
+    PDFReadError: ("Error leyendo PDF: {}", ()),
+    LLMConnectionError: ("Error de conexión con OpenAI: {}", ("Verifica tu API key y conexión a internet",)),
+    JSONParsingError: ("Error procesando respuesta: {}", ("El modelo puede haber generado una respuesta inválida",)),
+    ReportAnalysisError: ("Error analizando reporte: {}", ()),
+    PDFAnalyzerException: ("Error de la aplicación: {}", ()),
+}
+
+
+def _analyzer_error_messages(error: PDFAnalyzerException) -> tuple:
+    """Retorna (mensaje, *sugerencias) para una excepción del dominio."""
+    # Recorrer el MRO para que las subclases usen el mensaje de su clase base
+    for cls in type(error).__mro__:
+        entry = _ANALYZER_ERRORS.get(cls)
+        if entry is not None:
+            template, hints = entry
+            return (template.format(error), *hints)
+    return (str(error),)
+
+
+_NO_EVIDENCE = frozenset({'No disponible', 'No se encontró evidencia'})
+
+
+def _truncate(value: str, limit: int = 100) -> str:
+    """Recorta value a limit caracteres (sin copiar si ya es corto)."""
+    return value if len(value) <= limit else f"{value[:limit]}..."
+
+
+# Estilos del reporte de triage (se definen una vez en lugar de en cada llamada)
+_SEVERITY_COLORS = {
+    'crítica': 'red',
+    'alta': 'orange1',
+    'media': 'yellow',
+    'baja': 'green',
+    'informativa': 'blue'
+}
+
+_PRIORITY_COLORS = {
+    'P0': 'red',
+    'P1': 'orange1',
+    'P2': 'yellow',
+    'P3': 'green',
+    'P4': 'blue'
+}
+
+_PRIORITY_DESCRIPTIONS = {
+    'P0': 'Crítica - Acción inmediata',
+    'P1': 'Urgente - Resolver en 24h',
+    'P2': 'Alta - Resolver en 1 semana',
+    'P3': 'Media - Resolver en 1 mes',
+    'P4': 'Baja - Resolver cuando sea posible'
+}
+
+_PRIORITY_ORDER = {'P0': 0, 'P1': 1, 'P2': 2, 'P3': 3, 'P4': 4}
+
+# Severidades en inglés del formato legacy de triage
+_LEGACY_SEVERITY_COLORS = {
+    'Critical': 'red',
+    'High': 'orange1',
+    'Medium': 'yellow',
+    'Low': 'green',
+    'Informational': 'blue'
+}
+
+
+_ESTADO_COLORS = {'vulnerable': 'red', 'no_vulnerable': 'green'}
+
+# Plantillas con el markup fijo de cada vulnerabilidad (format ya enlazado)
+_VULN_PANEL_TEMPLATE = (
+    "[bold]ID:[/bold] {id}\n"
+    "[bold]Severidad:[/bold] [{sc}]{severidad}[/{sc}] | "
+    "[bold]Prioridad:[/bold] [{pc}]{prioridad}[/{pc}] | "
+    "[bold]Estado:[/bold] [{ec}]{estado}[/{ec}]\n\n"
+    "[bold]Descripción:[/bold]\n{descripcion}\n\n"
+    "[bold]Justificación de Severidad:[/bold]\n{justificacion}\n\n"
+    "[bold]Impacto Real:[/bold]\n{impacto}"
+).format
+
+_TRIAGE_VULN_HEADER = (
+    "\n[bold]{i}. {nombre}[/bold]\n"
+    "   [bold]Severidad:[/bold] [{sc}]{severidad}[/{sc}] | [bold]Prioridad:[/bold] [cyan]{prioridad}[/cyan]"
+).format
+
+# Caracteres ignorados al comparar nombres de vulnerabilidades
+_NAME_STRIP = str.maketrans('', '', ' -_')
+_NAME_SEPARATORS = str.maketrans('-_', '  ')
+
+
+def _name_tokens(name: str) -> frozenset:
+    """Palabras de un nombre ya en minúsculas (independiente del orden y separadores)."""
+    return frozenset(name.translate(_NAME_SEPARATORS).split())
+
+
+def _index_vulnerabilities(vulnerabilidades: list) -> tuple:
+    """Indexa vulnerabilidades por ID, por nombre normalizado y por palabras del nombre.
+    
+    Retorna (por_id, por_nombre, por_palabras, nombres) donde nombres conserva
+    el orden original para la búsqueda por inclusión de texto. Los nombres
+    vacíos no se indexan: coincidirían con cualquier otro.
+    """
+    by_id = {}
+    by_name = {}
+    by_tokens = {}
+    names = []
+    for v in vulnerabilidades:
+        vuln_id = v.get('id')
+        if vuln_id:
+            by_id.setdefault(vuln_id, v)
+        name = v.get('nombre', '').lower().strip()
+        if not name:
+            continue
+        by_name.setdefault(name.translate(_NAME_STRIP), v)
+        by_tokens.setdefault(_name_tokens(name), v)
+        names.append((name, v))
+    return by_id, by_name, by_tokens, names
+
+
+def _match_vulnerability(vuln_id, nombre: str, index: tuple) -> tuple:
+    """Busca la vulnerabilidad correspondiente en un índice de _index_vulnerabilities.
+    
+    Orden de preferencia: mismo ID, mismo nombre normalizado (sin mayúsculas,
+    espacios, guiones ni guiones bajos), mismas palabras en otro orden y por
+    último un nombre contenido en el otro. Retorna (vulnerabilidad,
+    'id' | 'nombre') o (None, None).
+    """
+    by_id, by_name, by_tokens, names = index
+    if vuln_id and vuln_id in by_id:
+        return by_id[vuln_id], 'id'
+    
+    name = nombre.lower().strip()
+    if not name:
+        return None, None
+    match = by_name.get(name.translate(_NAME_STRIP))
+    if match is None:
+        match = by_tokens.get(_name_tokens(name))
+    if match is None:
+        match = next((v for other, v in names if name in other or other in name), None)
+    return (match, 'nombre') if match is not None else (None, None)
+
+
+def _scan_status(vuln_id, nombre: str, index: tuple, coincidencia: str, analisis: str, verbose: bool) -> tuple:
+    """Estado de una vulnerabilidad del triage según un análisis (estático o dinámico).
+    
+    Retorna (vulnerable, detalles); detalles solo se informa cuando hubo
+    coincidencia pero el análisis no confirmó la vulnerabilidad.
+    """
+    match, match_type = _match_vulnerability(vuln_id, nombre, index)
+    if match is None:
+        return False, None
+    
+    if verbose:
+        estado = match.get('estado', 'desconocido')
+        if match_type == 'id':
+            console.print(f"[green]✅ Coincidencia {coincidencia} por ID: '{vuln_id}' (Estado: {estado})[/green]")
+        else:
+            console.print(f"[green]✅ Coincidencia {coincidencia} por nombre: '{nombre}' <-> '{match.get('nombre', '')}' (Estado: {estado})[/green]")
+    
+    if match.get('estado') == 'vulnerable':
+        return True, None
+    return False, match.get('evidencia', f'No se encontró evidencia de vulnerabilidad en el análisis {analisis}')
+
+
+def _vulnerabilities_table(vulnerabilidades: list, dynamic: bool = False):
+    """Tabla con el detalle de vulnerabilidades validadas (modo verbose de los escaneos).
+    
+    Las celdas son objetos Text, así que el contenido no se interpreta como markup
+    y toda la tabla se imprime con una sola llamada a console.print.
+    """
+    from rich.table import Table
+    from rich.text import Text
+    
+    table = Table(title="📋 Detalles de vulnerabilidades", show_header=True, header_style="bold magenta", show_lines=True)
+    table.add_column("#", justify="right")
+    table.add_column("Nombre", style="bold")
+    table.add_column("Estado")
+    table.add_column("Severidad")
+    table.add_column("Evidencia")
+    if dynamic:
+        table.add_column("Payload usado")
+        table.add_column("Respuesta del servidor")
+    
+    for i, vuln in enumerate(vulnerabilidades, 1):
+        estado = vuln.get('estado', '')
+        evidencia = vuln.get('evidencia') or ''
+        row = [
+            str(i),
+            Text(vuln.get('nombre', '')),
+            Text(estado, style="red" if estado == 'vulnerable' else "green"),
+            Text(str(vuln.get('severidad', ''))),
+            Text('' if evidencia in _NO_EVIDENCE else _truncate(evidencia))
+        ]
+        if dynamic:
+            row.append(Text(vuln.get('payload_usado') or ''))
+            row.append(Text(_truncate(vuln.get('respuesta_servidor') or '')))
+        table.add_row(*row)
+    
+    return table
+
+
+def _get_mongo():
+    """Cliente MongoDB compartido por los comandos del proceso (ver MongoDBClient.instance)."""
+    from ..infrastructure.utils.mongodb_client import MongoDBClient
+    return MongoDBClient.instance()
+
+
+@functools.lru_cache(maxsize=1)
+def _available_providers() -> tuple:
+    """Proveedores con API key configurada, calculados una vez por proceso.
+    
+    Los comandos validan el proveedor con una comprobación de pertenencia; usar
+    _available_providers.cache_clear() si el entorno cambia dentro del proceso.
+    """
+    from ..infrastructure.utils.config import get_available_providers
+    return tuple(get_available_providers())
+
+
+def _parse_model(model: str) -> tuple:
+    """Parsea 'proveedor[:modelo]' y valida que el proveedor tenga API key.
+    
+    Retorna (provider, model_name); ante un formato inválido o un proveedor
+    sin configurar informa el error y sale con código 1.
+    """
+    from ..infrastructure.utils.llm_adapters import LLMFactory
+    
+    try:
+        provider, model_name = LLMFactory.parse_model_string(model)
+    except Exception:
+        raise _die(
+            f"Error: Formato de modelo inválido: {model}",
+            "Formato válido: 'proveedor' o 'proveedor:modelo'",
+            f"Proveedores soportados: {', '.join(LLMFactory.get_supported_providers())}"
+        )
+    
+    available = _available_providers()
+    if provider not in available:
+        raise _die(
+            f"Error: API key para {provider} no está configurada",
+            f"Formato usado: {model}",
+            "Formato correcto: 'proveedor:modelo' (ej: openai:gpt-5-nano)",
+            f"Proveedores disponibles: {', '.join(available)}" if available
+            else "Configure al menos una API key en el archivo .env"
+        )
+    return provider, model_name
+
+
+@functools.lru_cache(maxsize=1)
+def _agent_classes() -> tuple:
+    """Importa una sola vez las clases de los agentes (estático, dinámico, triage).
+    
+    La importación sigue siendo diferida para no cargar LangChain al
+    arrancar comandos que no usan agentes.
+    """
+    from ..infrastructure.services.agents.static_agent import StaticAnalysisAgent
+    from ..infrastructure.services.agents.dynamic_agent import DynamicAnalysisAgent
+    from ..infrastructure.services.agents.triage_agent import TriageAgent
+    return StaticAnalysisAgent, DynamicAnalysisAgent, TriageAgent
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_read_pdf_use_case(
+    provider: str, model_name: Optional[str], temperature: float, cache_responses: bool = True
+):
+    """Caso de uso de lectura de PDF reutilizado para la misma configuración de modelo.
+    
+    El cliente LLM ya se cachea en el factory; aquí se evita además reconstruir
+    el lector de PDF y el analizador en modo lote o cuando la CLI se invoca
+    repetidamente dentro del mismo proceso. Con `cache_responses` las respuestas
+    del LLM se guardan en disco y un contenido idéntico no vuelve a enviarse.
+    """
+    from ..infrastructure.utils.factory import get_factory
+    factory = get_factory()
+    llm = factory.create_cached_llm(provider, model_name, temperature) if cache_responses else None
+    return factory.create_read_pdf_use_case(
+        provider=provider,
+        model_name=model_name,
+        temperature=temperature,
+        llm=llm
+    )
+
+
+_RESULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pdf-analyzer")
+# Incrementar al cambiar prompts o el formato del resultado para invalidar la caché
+_RESULT_CACHE_VERSION = "1"
+
+
+def _result_cache_path(pdf: str, provider: str, model_name: Optional[str], temperature: float) -> str:
+    """Ruta en la caché para el resultado de un PDF (SHA-256 del contenido + configuración).
+    
+    El PDF se hashea a través de un mmap: no se copia a memoria del proceso y las
+    páginas quedan en la caché del SO para el mmap que luego abre PyPDF2Reader.
+    """
+    with open(pdf, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pdf_digest = hashlib.sha256(mm).hexdigest()
+        except ValueError:
+            # Archivo vacío: no se puede mapear
+            pdf_digest = hashlib.sha256(b"").hexdigest()
+    key = f"{pdf_digest}|{provider}|{model_name}|{temperature}|{_RESULT_CACHE_VERSION}"
+    return os.path.join(_RESULT_CACHE_DIR, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+
+def _load_cached_result(cache_path: str) -> Optional[str]:
+    """Retorna el JSON cacheado o None si no existe."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _store_cached_result(cache_path: str, result_json: Optional[str] = None, source_file: Optional[str] = None):
+    """Guarda el resultado en la caché de forma atómica (archivo temporal + os.replace).
+    
+    Se pasa el JSON ya serializado o el archivo donde se escribió en streaming.
+    La caché es opcional: un error al escribirla no interrumpe el comando.
+    """
+    tmp_path = None
+    try:
+        os.makedirs(_RESULT_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_RESULT_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            if source_file is None:
+                f.write(result_json)
+            else:
+                with open(source_file, 'r', encoding='utf-8') as src:
+                    shutil.copyfileobj(src, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
 @app.command("read")
 def read_pdf(
-    pdf: str = typer.Option(
-        ..., 
+    pdf: Optional[str] = typer.Option(
+        None, 
         "--pdf", 
         "-p", 
         help="Ruta al archivo PDF a analizar"
     ),
+    batch_file: Optional[str] = typer.Option(
+        None,
+        "--batch-file",
+        "-b",
+        help="Archivo de texto con una ruta de PDF por línea (procesamiento por lotes)"
+    ),
     output: Optional[str] = typer.Option(
         None,
         "--output",
         "-o",
-        help="Archivo de salida para guardar el JSON (opcional)"
+        help="Archivo de salida para guardar el JSON (con --batch-file, directorio de salida)"
     ),
     model: str = typer.Option(
         "openai",
@@ -110,39 +620,33 @@ def read_pdf(
         False,
         "--mongodb",
         help="Guardar el resultado en MongoDB (requiere configuración en .env)"
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Ignorar las cachés de resultados y de respuestas del LLM y volver a analizar el PDF"
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream/--no-stream",
+        help="Recibir la respuesta del modelo por fragmentos mostrando el avance"
     )
 ):
     """Lee y analiza un reporte PDF, generando un JSON estructurado."""
+    import asyncio
     
     try:
-        # Validar que existe el archivo
-        if not os.path.exists(pdf):
-            console.print(f"[red]Error: El archivo {pdf} no existe[/red]")
-            raise typer.Exit(1)
+        # Validar argumentos de entrada
+        if not pdf and not batch_file:
+            raise _die("Error: Debe indicar --pdf o --batch-file")
+        if batch_file and not output and not mongodb:
+            raise _die("Error: --batch-file requiere --output (directorio) y/o --mongodb")
         
-        # Parsear modelo
-        try:
-            provider, model_name = LLMFactory.parse_model_string(model)
-        except Exception:
-            console.print(f"[red]Error: Formato de modelo inválido: {model}[/red]")
-            console.print("[yellow]Formato válido: 'proveedor' o 'proveedor:modelo'[/yellow]")
-            console.print(f"[yellow]Proveedores soportados: {', '.join(LLMFactory.get_supported_providers())}[/yellow]")
-            raise typer.Exit(1)
-        
-        # Validar configuración
-        if not validate_environment(provider):
-            available = get_available_providers()
-            console.print(f"[red]Error: API key para {provider} no está configurada[/red]")
-            console.print(f"[yellow]Formato usado: {model}[/yellow]")
-            console.print(f"[yellow]Formato correcto: 'proveedor:modelo' (ej: openai:gpt-5-nano)[/yellow]")
-            if available:
-                console.print(f"[yellow]Proveedores disponibles: {', '.join(available)}[/yellow]")
-            else:
-                console.print("[yellow]Configure al menos una API key en el archivo .env[/yellow]")
-            raise typer.Exit(1)
+        # Parsear modelo y validar que el proveedor está configurado
+        provider, model_name = _parse_model(model)
         
         # Mostrar información del reporte y modelo
-        console.print(f"📄 Reporte: {pdf}")
+        console.print(f"📄 Reporte: {pdf or batch_file}")
         console.print(f"🤖 Modelo: {model_name or 'por defecto'}")
         
         if verbose:
@@ -150,37 +654,59 @@ def read_pdf(
             console.print(f"[blue]🤖 Modelo: {model_name or 'por defecto'}[/blue]")
             console.print(f"[blue]🌡️ Temperatura: {temperature}[/blue]")
         
-        # Crear dependencias usando el factory
+        # Un PDF idéntico con la misma configuración se sirve desde la caché sin llamar al LLM.
+        # Hashear el PDF es además su primera apertura: si no existe falla aquí (FileNotFoundError)
+        cache_path = None
+        if not batch_file and not no_cache:
+            cache_path = _result_cache_path(pdf, provider, model_name, temperature)
+        elif not batch_file:
+            # Sin caché no se hashea: una apertura basta para fallar antes de inicializar
+            with open(pdf, 'rb'):
+                pass
+        result_json = _load_cached_result(cache_path) if cache_path else None
+        
+        # Crear dependencias usando el factory (reutilizadas si la configuración se repite)
         with LoadingSpinner("Inicializando componentes...") as spinner:
-            factory = get_factory()
-            use_case = factory.create_read_pdf_use_case(
-                provider=provider,
-                model_name=model_name,
-                temperature=temperature
-            )
+            use_case = _cached_read_pdf_use_case(provider, model_name, temperature, not no_cache)
         
         console.print("[green]✓[/green] Componentes inicializados")
         
-        # Ejecutar análisis con animación
-        with LoadingSpinner("Leyendo archivo PDF...") as spinner:
-            time.sleep(0.5)  # Simular tiempo de lectura
-            spinner.update_message("Enviando contenido al modelo de IA...")
-            time.sleep(0.5)
-            spinner.update_message("Analizando estructura del reporte...")
-            time.sleep(0.5)
-            spinner.update_message("Generando JSON estructurado...")
-            
-            # Ejecutar análisis
-            result_json = use_case.execute_as_json(pdf)
+        if batch_file:
+            metadata = {
+                'provider': provider,
+                'model': model_name or 'default',
+                'temperature': temperature,
+                'analysis_version': '1.0.0'
+            }
+            _read_pdf_batch(use_case, batch_file, output, mongodb, metadata)
+            return
         
-        console.print("[green]✓[/green] Análisis completado")
+        if result_json is not None:
+            console.print("[green]✓[/green] Resultado recuperado de la caché (use --no-cache para reanalizar)")
+        else:
+            # Ejecutar análisis con animación
+            with LoadingSpinner("Leyendo archivo PDF...") as spinner:
+                # El caso de uso avanza el mensaje en cada cambio real de etapa
+                if output and not mongodb:
+                    # Solo se escribe a disco: el JSON se serializa por fragmentos
+                    json_chunks = asyncio.run(
+                        use_case.aexecute_as_json_stream(pdf, progress_cb=spinner.update_message, stream=stream)
+                    )
+                    result_json = None
+                else:
+                    result_json = asyncio.run(
+                        use_case.aexecute_as_json(pdf, progress_cb=spinner.update_message, stream=stream)
+                    )
+                    if cache_path:
+                        _store_cached_result(cache_path, result_json=result_json)
+        
+            console.print("[green]✓[/green] Análisis completado")
         
         # Guardar en MongoDB si se especifica
         if mongodb:
             try:
                 with LoadingSpinner("Guardando en MongoDB...") as spinner:
-                    mongo_client = MongoDBClient()
-                    mongo_client.connect()
+                    mongo_client = _get_mongo()
                     
                     # Crear metadatos adicionales
                     metadata = {
@@ -191,7 +717,6 @@ def read_pdf(
                     }
                     
                     document_id = mongo_client.save_report(pdf, result_json, metadata)
-                    mongo_client.disconnect()
                     
                 console.print(f"[green]✓ Resultado guardado en MongoDB con ID: {document_id}[/green]")
             except Exception as e:
@@ -201,56 +726,102 @@ def read_pdf(
         # Mostrar resultado
         if output:
             # Guardar en archivo
-            with open(output, 'w', encoding='utf-8') as f:
-                f.write(result_json)
+            streamed = False
+            with open(output, 'w+', encoding='utf-8') as f:
+                if result_json is None:
+                    for chunk in json_chunks:
+                        f.write(chunk)
+                    streamed = True
+                else:
+                    f.write(result_json)
+                if verbose:
+                    # Releer solo el inicio del archivo para el preview
+                    f.seek(0)
+                    preview = f.read(500)
             console.print(f"[green]✓ Resultado guardado en: {output}[/green]")
+            if streamed and cache_path:
+                _store_cached_result(cache_path, source_file=output)
             
             if verbose:
                 # Mostrar preview del JSON
-                syntax = Syntax(result_json[:500] + "...", "json", theme="monokai", line_numbers=True)
-                console.print(Panel(syntax, title="Preview del resultado", border_style="green"))
+                _print_json_panel(f"{preview}...", "Preview del resultado")
         else:
             # Mostrar en consola
-            syntax = Syntax(result_json, "json", theme="monokai", line_numbers=True)
-            console.print(Panel(syntax, title="Resultado del análisis", border_style="green"))
+            _print_json_panel(result_json, "Resultado del análisis")
         
         console.print("[green]✓ Análisis completado exitosamente[/green]")
         
-    except PDFNotFoundError as e:
-        console.print(f"[red]Archivo no encontrado: {str(e)}[/red]")
-        raise typer.Exit(1)
-    except InvalidPDFError as e:
-        console.print(f"[red]Archivo PDF inválido: {str(e)}[/red]")
-        raise typer.Exit(1)
-    except PDFReadError as e:
-        console.print(f"[red]Error leyendo PDF: {str(e)}[/red]")
-        raise typer.Exit(1)
-    except LLMConnectionError as e:
-        console.print(f"[red]Error de conexión con OpenAI: {str(e)}[/red]")
-        console.print("[yellow]Verifica tu API key y conexión a internet[/yellow]")
-        raise typer.Exit(1)
-    except JSONParsingError as e:
-        console.print(f"[red]Error procesando respuesta: {str(e)}[/red]")
-        console.print("[yellow]El modelo puede haber generado una respuesta inválida[/yellow]")
-        raise typer.Exit(1)
-    except ReportAnalysisError as e:
-        console.print(f"[red]Error analizando reporte: {str(e)}[/red]")
-        raise typer.Exit(1)
     except PDFAnalyzerException as e:
-        console.print(f"[red]Error de la aplicación: {str(e)}[/red]")
-        raise typer.Exit(1)
+        raise _die(*_analyzer_error_messages(e))
+    except FileNotFoundError as e:
+        raise _die(f"Error: El archivo {e.filename} no existe")
+    except typer.Exit:
+        # Salida controlada (errores ya informados con _die)
+        raise
     except Exception as e:
         console.print(f"[red]Error inesperado: {str(e)}[/red]")
-        if verbose:
-            console.print_exception()
+        _print_tb(verbose)
+        raise typer.Exit(1)
+
+
+def _read_pdf_batch(use_case, batch_file: str, output: Optional[str], mongodb: bool, metadata: dict):
+    """Analiza los PDFs listados en batch_file y guarda los resultados en lote.
+    
+    Los documentos de MongoDB se acumulan y se insertan con un único
+    insert_many al final, usando una sola conexión para todo el lote.
+    """
+    with open(batch_file, 'r', encoding='utf-8') as f:
+        pdf_paths = [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+    
+    if output:
+        os.makedirs(output, exist_ok=True)
+    
+    if mongodb:
+        from ..infrastructure.utils.mongodb_client import MongoDBClient
+    
+    documents = []
+    failed = 0
+    total = len(pdf_paths)
+    for index, pdf_path in enumerate(pdf_paths, 1):
+        try:
+            with LoadingSpinner(f"[{index}/{total}] Analizando {pdf_path}...") as spinner:
+                result_json = use_case.execute_as_json(pdf_path, progress_cb=spinner.update_message)
+                if mongodb:
+                    documents.append(MongoDBClient.build_report_document(pdf_path, result_json, metadata))
+        except Exception as e:
+            failed += 1
+            console.print(f"[red]✗ {pdf_path}: {str(e)}[/red]")
+            continue
+        
+        if output:
+            output_path = os.path.join(output, os.path.splitext(os.path.basename(pdf_path))[0] + '.json')
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(result_json)
+        console.print(f"[green]✓[/green] {pdf_path}")
+    
+    if documents:
+        try:
+            with LoadingSpinner(f"Guardando {len(documents)} reportes en MongoDB..."):
+                document_ids = _get_mongo().save_reports_bulk(documents)
+            console.print(f"[green]✓ {len(document_ids)} resultados guardados en MongoDB[/green]")
+        except Exception as e:
+            console.print(f"[yellow]⚠ Error guardando en MongoDB: {str(e)}[/yellow]")
+    
+    console.print(f"[green]✓ Lote completado: {total - failed}/{total} PDFs analizados[/green]")
+    if failed:
         raise typer.Exit(1)
 
 
 @app.command("version")
 def version():
     """Muestra la versión de la aplicación."""
-    console.print("[blue]PDF Analyzer v1.0.0[/blue]")
-    console.print("[dim]Analizador de reportes PDF usando LangChain y OpenAI[/dim]")
+    # print estándar: no hace falta cargar Rich para dos líneas de texto
+    print("PDF Analyzer v1.0.0")
+    print("Analizador de reportes PDF usando LangChain y OpenAI")
+
+
+# Vigencia (segundos) de una prueba de conexión exitosa
+_TEST_CONNECTION_TTL = 3600
 
 
 @app.command("test")
@@ -260,49 +831,58 @@ def test_connection(
         "--model",
         "-m",
         help="Proveedor de LLM a probar (openai, xai, gemini, deepseek, anthropic) o formato 'proveedor:modelo'"
+    ),
+    cached: bool = typer.Option(
+        False,
+        "--cached",
+        help="Reutilizar una prueba exitosa de la última hora con la misma API key en lugar de contactar al proveedor"
     )
 ):
     """Prueba la conexión con el proveedor de LLM especificado."""
+    import asyncio
     try:
-        # Parsear modelo
-        try:
-            provider, model_name = LLMFactory.parse_model_string(model)
-        except Exception:
-            console.print(f"[red]Error: Formato de modelo inválido: {model}[/red]")
-            console.print("[yellow]Formato válido: 'proveedor' o 'proveedor:modelo'[/yellow]")
-            console.print(f"[yellow]Proveedores soportados: {', '.join(LLMFactory.get_supported_providers())}[/yellow]")
-            raise typer.Exit(1)
-        
-        # Validar configuración
-        if not validate_environment(provider):
-            available = get_available_providers()
-            console.print(f"[red]Error: API key para {provider} no está configurada[/red]")
-            console.print(f"[yellow]Formato usado: {model}[/yellow]")
-            console.print(f"[yellow]Formato correcto: 'proveedor:modelo' (ej: openai:gpt-4o-mini)[/yellow]")
-            if available:
-                console.print(f"[yellow]Proveedores disponibles: {', '.join(available)}[/yellow]")
-            else:
-                console.print("[yellow]Configure al menos una API key en el archivo .env[/yellow]")
-            raise typer.Exit(1)
+        # Parsear modelo y validar que el proveedor está configurado
+        provider, model_name = _parse_model(model)
+        display_model = model_name or f"{provider} (modelo por defecto)"
+        
+        # Con --cached una prueba exitosa reciente se reutiliza sin inicializar el factory ni el LLM.
+        # La clave incluye un hash de la API key: cambiar la credencial invalida el resultado
+        cache = cache_key = None
+        if cached:
+            from ..infrastructure.utils.config import get_settings
+            from ..infrastructure.utils.llm_cache import LLMResponseCache
+            api_key = getattr(get_settings(), f"{provider}_api_key", None) or ""
+            cache = LLMResponseCache()
+            cache_key = cache.make_key(
+                "test_connection", provider, model_name or "default",
+                hashlib.sha256(api_key.encode()).hexdigest()
+            )
+            if cache.get(cache_key, max_age=_TEST_CONNECTION_TTL) is not None:
+                console.print(f"[green]✓ Conexión exitosa con {display_model} (resultado cacheado)[/green]")
+                return
         
+        from ..infrastructure.utils.factory import get_factory
         with LoadingSpinner(f"Probando conexión con {provider}...") as spinner:
             factory = get_factory()
             llm = factory.create_llm(provider=provider, model_name=model_name)
-            display_model = model_name or f"{provider} (modelo por defecto)"
             spinner.update_message(f"Enviando mensaje de prueba a {display_model}...")
-            response = llm.generate_response(
+            response = asyncio.run(llm.agenerate_response(
                 "Responde únicamente con 'OK' si puedes procesar este mensaje.",
                 "Test de conexión"
-            )
+            ))
         
         if "OK" in response.upper():
+            if cache is not None:
+                cache.set(cache_key, response)
             console.print(f"[green]✓ Conexión exitosa con {display_model}[/green]")
         else:
             console.print(f"[yellow]⚠ Respuesta inesperada: {response}[/yellow]")
             
+    except typer.Exit:
+        # Salida controlada (errores ya informados con _die)
+        raise
     except Exception as e:
-        console.print(f"[red]Error de conexión: {str(e)}[/red]")
-        raise typer.Exit(1)
+        raise _die(f"Error de conexión: {str(e)}")
 
 
 @app.command("static-scan")
@@ -350,30 +930,17 @@ def static_scan(
     )
 ):
     """Valida vulnerabilidades de un reporte PDF mediante análisis estático con semgrep."""
+    import asyncio
+    from ..infrastructure.utils.factory import get_factory
     
     try:
-        # Validar que existen los archivos/directorios
-        if not os.path.exists(pdf):
-            console.print(f"[red]Error: El archivo PDF {pdf} no existe[/red]")
-            raise typer.Exit(1)
-        
-        if not os.path.exists(source):
-            console.print(f"[red]Error: El directorio de código fuente {source} no existe[/red]")
-            raise typer.Exit(1)
+        # Validar el PDF y el directorio de código fuente (existencia y tipo con un solo stat)
+        # antes de lanzar semgrep: los agentes envuelven cualquier error en ReportAnalysisError
+        _require_path(pdf, False, f"Error: El archivo PDF {pdf} no existe")
+        _require_path(source, True, f"Error: El directorio de código fuente {source} no existe")
         
-        # Parsear modelo
-        try:
-            provider, model_name = LLMFactory.parse_model_string(model)
-        except Exception:
-            console.print(f"[red]Error: Formato de modelo inválido: {model}[/red]")
-            raise typer.Exit(1)
-        
-        # Validar que el proveedor está disponible
-        available_providers = get_available_providers()
-        if provider not in available_providers:
-            console.print(f"[red]Error: Proveedor {provider} no está configurado[/red]")
-            console.print(f"[yellow]Proveedores disponibles: {', '.join(available_providers)}[/yellow]")
-            raise typer.Exit(1)
+        # Parsear modelo y validar que el proveedor está configurado
+        provider, model_name = _parse_model(model)
         
         if verbose:
             console.print(f"[blue]📄 Archivo PDF: {pdf}[/blue]")
@@ -389,7 +956,8 @@ def static_scan(
             static_agent = factory.create_static_analysis_agent(llm)
             
             spinner.update_message("Validando vulnerabilidades...")
-            result = static_agent.validate_vulnerabilities(pdf, source)
+            # PDF (LLM) y Semgrep se ejecutan en paralelo
+            result = asyncio.run(static_agent.avalidate_vulnerabilities(pdf, source))
         
         # Mostrar resumen
         console.print("\n[green]✓ Análisis estático completado[/green]")
@@ -399,30 +967,22 @@ def static_scan(
         
         # Mostrar detalles de vulnerabilidades si es verbose
         if verbose:
-            console.print("\n[yellow]📋 Detalles de vulnerabilidades:[/yellow]")
-            for i, vuln in enumerate(result['vulnerabilidades'], 1):
-                estado_color = "red" if vuln['estado'] == 'vulnerable' else "green"
-                console.print(f"\n{i}. [bold]{vuln['nombre']}[/bold]")
-                console.print(f"   Estado: [{estado_color}]{vuln['estado']}[/{estado_color}]")
-                console.print(f"   Severidad: {vuln['severidad']}")
-                if vuln['evidencia'] != 'No disponible' and vuln['evidencia'] != 'No se encontró evidencia':
-                    console.print(f"   Evidencia: {vuln['evidencia'][:100]}...")
+            console.print()
+            console.print(_vulnerabilities_table(result['vulnerabilidades']))
+        
+        # Serializar una sola vez para archivo, MongoDB y la vista JSON
+        result_json = _dumps_json(result) if output or mongodb or not verbose else None
         
         # Guardar resultado en archivo si se especifica
         if output:
-            with open(output, 'w', encoding='utf-8') as f:
-                import json
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            _write_json_text(result_json, output)
             console.print(f"[green]💾 Resultado guardado en: {output}[/green]")
         
         # Guardar en MongoDB si se especifica
         if mongodb:
             try:
                 with LoadingSpinner("Guardando en MongoDB...") as spinner:
-                    mongo_client = MongoDBClient()
-                    mongo_client.connect()
-                    import json
-                    result_json = json.dumps(result, indent=2, ensure_ascii=False)
+                    mongo_client = _get_mongo()
                     document_id = mongo_client.save_report(
                         pdf, 
                         result_json,
@@ -432,31 +992,30 @@ def static_scan(
                             'model': f"{provider}:{model_name}",
                             'temperature': temperature,
                             'analysis_type': 'static_scan'
-                        }
+                        },
+                        result_data=result
                     )
-                    mongo_client.disconnect()
                 console.print(f"[green]💾 Resultado guardado en MongoDB con ID: {document_id}[/green]")
             except Exception as e:
                 console.print(f"[yellow]⚠️  Error guardando en MongoDB: {str(e)}[/yellow]")
         
         # Mostrar resultado en formato JSON si no es verbose
         if not verbose and not output:
-            import json
-            syntax = Syntax(json.dumps(result, indent=2, ensure_ascii=False), "json", theme="monokai")
+            syntax = _json_syntax(result_json)
             console.print("\n[yellow]📄 Resultado del análisis:[/yellow]")
             console.print(syntax)
             
     except (PDFNotFoundError, InvalidPDFError, PDFReadError, ReportAnalysisError, LLMConnectionError, JSONParsingError) as e:
-        console.print(f"[red]Error: {str(e)}[/red]")
-        raise typer.Exit(1)
+        raise _die(f"Error: {str(e)}")
     except KeyboardInterrupt:
         console.print("\n[yellow]Operación cancelada por el usuario[/yellow]")
         raise typer.Exit(1)
+    except typer.Exit:
+        # Salida controlada (errores ya informados con _die)
+        raise
     except Exception as e:
         console.print(f"[red]Error inesperado: {str(e)}[/red]")
-        if verbose:
-            import traceback
-            console.print(f"[red]Traceback: {traceback.format_exc()}[/red]")
+        _print_tb(verbose)
         raise typer.Exit(1)
 
 
@@ -505,38 +1064,19 @@ def dynamic_scan(
     )
 ):
     """Valida vulnerabilidades mediante análisis dinámico y explotación en vivo."""
+    import asyncio
+    from ..infrastructure.utils.factory import get_factory
     
     try:
-        # Validar que existe el archivo PDF
-        if not os.path.exists(pdf):
-            console.print(f"[red]Error: El archivo {pdf} no existe[/red]")
-            raise typer.Exit(1)
+        # Validar el PDF antes de comprobar la disponibilidad del objetivo
+        _require_path(pdf, False, f"Error: El archivo {pdf} no existe")
         
         # Validar formato de URL
         if not url.startswith(('http://', 'https://')):
-            console.print(f"[red]Error: La URL debe comenzar con http:// o https://[/red]")
-            raise typer.Exit(1)
+            raise _die(f"Error: La URL debe comenzar con http:// o https://")
         
-        # Parsear modelo
-        try:
-            provider, model_name = LLMFactory.parse_model_string(model)
-        except Exception:
-            console.print(f"[red]Error: Formato de modelo inválido: {model}[/red]")
-            console.print("[yellow]Formato válido: 'proveedor' o 'proveedor:modelo'[/yellow]")
-            console.print(f"[yellow]Proveedores soportados: {', '.join(LLMFactory.get_supported_providers())}[/yellow]")
-            raise typer.Exit(1)
-        
-        # Validar configuración
-        if not validate_environment(provider):
-            available = get_available_providers()
-            console.print(f"[red]Error: API key para {provider} no está configurada[/red]")
-            console.print(f"[yellow]Formato usado: {model}[/yellow]")
-            console.print(f"[yellow]Formato correcto: 'proveedor:modelo' (ej: openai:gpt-4)[/yellow]")
-            if available:
-                console.print(f"[yellow]Proveedores disponibles: {', '.join(available)}[/yellow]")
-            else:
-                console.print("[yellow]Configure al menos una API key en el archivo .env[/yellow]")
-            raise typer.Exit(1)
+        # Parsear modelo y validar que el proveedor está configurado
+        provider, model_name = _parse_model(model)
         
         if verbose:
             console.print(f"[blue]📄 Archivo PDF: {pdf}[/blue]")
@@ -553,14 +1093,13 @@ def dynamic_scan(
                 temperature=temperature
             )
             
-            # Importar y crear el agente dinámico
-            from ..infrastructure.services.agents.dynamic_agent import DynamicAnalysisAgent
-            dynamic_agent = DynamicAnalysisAgent(llm)
+            # Crear el agente dinámico
+            dynamic_agent = _agent_classes()[1](llm)
             
             spinner.update_message("Ejecutando análisis dinámico...")
         
-        # Ejecutar validación dinámica
-        result = dynamic_agent.validate_vulnerabilities(pdf, url)
+        # Ejecutar validación dinámica (PDF y verificación del objetivo en paralelo)
+        result = asyncio.run(dynamic_agent.avalidate_vulnerabilities(pdf, url))
         
         # Mostrar resumen
         console.print("\n[green]✓ Análisis dinámico completado[/green]")
@@ -570,87 +1109,227 @@ def dynamic_scan(
         
         # Mostrar detalles de vulnerabilidades si es verbose
         if verbose:
-            console.print("\n[yellow]📋 Detalles de vulnerabilidades:[/yellow]")
-            for i, vuln in enumerate(result['vulnerabilidades'], 1):
-                estado_color = "red" if vuln['estado'] == 'vulnerable' else "green"
-                console.print(f"\n{i}. [bold]{vuln['nombre']}[/bold]")
-                console.print(f"   Estado: [{estado_color}]{vuln['estado']}[/{estado_color}]")
-                console.print(f"   Severidad: {vuln['severidad']}")
-                if vuln.get('evidencia') and vuln['evidencia'] not in ['No disponible', 'No se encontró evidencia']:
-                    console.print(f"   Evidencia: {vuln['evidencia'][:100]}...")
-                if vuln.get('payload_usado'):
-                    console.print(f"   Payload usado: {vuln['payload_usado']}")
-                if vuln.get('respuesta_servidor'):
-                    console.print(f"   Respuesta del servidor: {vuln['respuesta_servidor'][:100]}...")
+            console.print()
+            console.print(_vulnerabilities_table(result['vulnerabilidades'], dynamic=True))
+        
+        # Serializar una sola vez para archivo y MongoDB
+        result_json = _dumps_json(result) if output or mongodb else None
         
         # Guardar en archivo si se especifica
         if output:
-            import json
-            with open(output, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            _write_json_text(result_json, output)
             console.print(f"[green]Resultado guardado en: {output}[/green]")
         
         # Guardar en MongoDB si se especifica
         if mongodb:
             try:
                 with LoadingSpinner("Guardando en MongoDB...") as spinner:
-                    client = MongoDBClient()
-                    client.connect()
+                    client = _get_mongo()
                     doc_id = client.save_report(
                         pdf,
-                        json.dumps(result, ensure_ascii=False),
+                        result_json,
                         {
                             'tipo_analisis': 'dinamico',
                             'pdf_path': pdf,
                             'target_url': url,
                             'model': model,
                             'temperature': temperature
-                        }
+                        },
+                        result_data=result
                     )
-                    client.disconnect()
                 console.print(f"[green]Resultado guardado en MongoDB con ID: {doc_id}[/green]")
             except Exception as e:
                 console.print(f"[yellow]Advertencia: No se pudo guardar en MongoDB: {str(e)}[/yellow]")
         
         
     except PDFAnalyzerException as e:
-        console.print(f"[red]Error del analizador: {str(e)}[/red]")
-        raise typer.Exit(1)
+        raise _die(f"Error del analizador: {str(e)}")
+    except typer.Exit:
+        # Salida controlada (errores ya informados con _die)
+        raise
     except Exception as e:
         console.print(f"[red]Error inesperado: {str(e)}[/red]")
+        _print_tb(verbose)
+        raise typer.Exit(1)
+
+
+@app.command("scan")
+def scan(
+    pdf: str = typer.Option(
+        ..., 
+        "--pdf", 
+        "-p", 
+        help="Ruta al archivo PDF del reporte a validar"
+    ),
+    source: str = typer.Option(
+        ...,
+        "--source",
+        "-s",
+        help="Ruta al código fuente a analizar"
+    ),
+    url: str = typer.Option(
+        ...,
+        "--url",
+        "-u",
+        help="URL del objetivo a probar (ej: http://localhost:8080)"
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Archivo de salida para guardar el JSON (opcional)"
+    ),
+    model: str = typer.Option(
+        "openai",
+        "--model",
+        "-m",
+        help="Proveedor de LLM a utilizar (openai, xai, gemini, deepseek, anthropic) o formato 'proveedor:modelo'"
+    ),
+    temperature: float = typer.Option(
+        0.1,
+        "--temperature",
+        "-t",
+        help="Temperatura para el modelo (0.0 - 1.0)"
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Mostrar información detallada del proceso"
+    ),
+    mongodb: bool = typer.Option(
+        False,
+        "--mongodb",
+        help="Guardar el resultado en MongoDB (requiere configuración en .env)"
+    )
+):
+    """Ejecuta el análisis estático y el dinámico en paralelo sobre el mismo reporte PDF."""
+    import asyncio
+    from ..infrastructure.utils.factory import get_factory
+    
+    try:
+        # Validar entradas antes de inicializar los agentes
+        _require_path(pdf, False, f"Error: El archivo PDF {pdf} no existe")
+        _require_path(source, True, f"Error: El directorio de código fuente {source} no existe")
+        if not url.startswith(('http://', 'https://')):
+            raise _die(f"Error: La URL debe comenzar con http:// o https://")
+        
+        # Parsear modelo y validar que el proveedor está configurado
+        provider, model_name = _parse_model(model)
+        
         if verbose:
-            import traceback
-            console.print(f"[red]Traceback: {traceback.format_exc()}[/red]")
+            console.print(f"[blue]📄 Archivo PDF: {pdf}[/blue]")
+            console.print(f"[blue]📁 Código fuente: {source}[/blue]")
+            console.print(f"[blue]🌐 Objetivo: {url}[/blue]")
+            console.print(f"[blue]🤖 Modelo: {provider}:{model_name or 'por defecto'}[/blue]")
+            console.print(f"[blue]🌡️  Temperatura: {temperature}[/blue]")
+        
+        # Un único LLM compartido por ambos agentes
+        with LoadingSpinner("Inicializando agentes estático y dinámico..."):
+            factory = get_factory()
+            llm = factory.create_llm(provider, model_name, temperature)
+            static_agent = factory.create_static_analysis_agent(llm)
+            
+            dynamic_agent = _agent_classes()[1](llm)
+        
+        async def run_both():
+            # El PDF se analiza una sola vez y ambos agentes esperan la misma tarea
+            pdf_analysis = asyncio.ensure_future(static_agent.aanalyze_pdf_report(pdf))
+            return await asyncio.gather(
+                static_agent.avalidate_vulnerabilities(pdf, source, pdf_analysis),
+                dynamic_agent.avalidate_vulnerabilities(pdf, url, pdf_analysis)
+            )
+        
+        static_result, dynamic_result = asyncio.run(run_both())
+        result = {
+            'analisis_estatico': static_result,
+            'analisis_dinamico': dynamic_result
+        }
+        
+        # Mostrar resumen de cada análisis
+        for title, partial, dynamic in (
+            ("Análisis estático", static_result, False),
+            ("Análisis dinámico", dynamic_result, True)
+        ):
+            console.print(f"\n[green]✓ {title} completado[/green]")
+            console.print(f"[blue]📊 Vulnerabilidades reportadas: {partial['vulnerabilidades_reportadas']}[/blue]")
+            console.print(f"[blue]🔍 Vulnerabilidades confirmadas: {partial['vulnerabilidades_vulnerables']}[/blue]")
+            if verbose:
+                console.print(_vulnerabilities_table(partial['vulnerabilidades'], dynamic=dynamic))
+        
+        # Serializar una sola vez para archivo y MongoDB
+        result_json = _dumps_json(result) if output or mongodb else None
+        
+        if output:
+            _write_json_text(result_json, output)
+            console.print(f"[green]💾 Resultado guardado en: {output}[/green]")
+        
+        if mongodb:
+            try:
+                with LoadingSpinner("Guardando en MongoDB..."):
+                    document_id = _get_mongo().save_report(
+                        pdf,
+                        result_json,
+                        {
+                            'pdf_file': pdf,
+                            'source_path': source,
+                            'target_url': url,
+                            'model': f"{provider}:{model_name}",
+                            'temperature': temperature,
+                            'analysis_type': 'scan'
+                        },
+                        result_data=result
+                    )
+                console.print(f"[green]💾 Resultado guardado en MongoDB con ID: {document_id}[/green]")
+            except Exception as e:
+                console.print(f"[yellow]⚠️  Error guardando en MongoDB: {str(e)}[/yellow]")
+        
+    except PDFAnalyzerException as e:
+        raise _die(f"Error del analizador: {str(e)}")
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Operación cancelada por el usuario[/yellow]")
+        raise typer.Exit(1)
+    except typer.Exit:
+        # Salida controlada (errores ya informados con _die)
+        raise
+    except Exception as e:
+        console.print(f"[red]Error inesperado: {str(e)}[/red]")
+        _print_tb(verbose)
         raise typer.Exit(1)
 
 
 def _display_complete_analysis_report(complete_analysis: dict):
     """Muestra el reporte completo de análisis con formato bonito para triage_final."""
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.table import Table
+    from rich.text import Text
     
-    # Título principal
-    console.print("\n[bold green]🎯 ANÁLISIS COMPLETO DE SEGURIDAD[/bold green]")
-    console.print("=" * 70)
+    # Título principal (los bloques de texto se imprimen con una sola llamada cada uno)
+    console.print("\n[bold green]🎯 ANÁLISIS COMPLETO DE SEGURIDAD[/bold green]\n" + "=" * 70)
     
     # Información del triage final
     triage_final = complete_analysis.get('triage_final', {})
     
     if triage_final:
         # Header del triage
-        console.print(f"\n[bold blue]📊 TRIAGE FINAL DE VULNERABILIDADES[/bold blue]")
-        console.print(f"[dim]ID Reporte: {triage_final.get('id_reporte', 'N/A')}[/dim]")
-        console.print(f"[dim]Fecha: {triage_final.get('fecha_generacion', 'N/A')}[/dim]")
-        console.print(f"[dim]Origen: {triage_final.get('reporte_origen', 'N/A')}[/dim]")
+        lines = [
+            f"\n[bold blue]📊 TRIAGE FINAL DE VULNERABILIDADES[/bold blue]",
+            f"[dim]ID Reporte: {triage_final.get('id_reporte', 'N/A')}[/dim]",
+            f"[dim]Fecha: {triage_final.get('fecha_generacion', 'N/A')}[/dim]",
+            f"[dim]Origen: {triage_final.get('reporte_origen', 'N/A')}[/dim]"
+        ]
         
         # Resumen ejecutivo
         if triage_final.get('resumen_triage'):
-            console.print(f"\n[bold cyan]📋 Resumen Ejecutivo[/bold cyan]")
-            resumen_lines = triage_final['resumen_triage'].split('\n')
-            for line in resumen_lines:
-                if line.strip():
-                    console.print(f"  {line.strip()}")
+            lines.append(f"\n[bold cyan]📋 Resumen Ejecutivo[/bold cyan]")
+            lines.extend(
+                f"  {line.strip()}" for line in triage_final['resumen_triage'].split('\n') if line.strip()
+            )
         
         # Estadísticas en tabla
-        console.print(f"\n[bold cyan]📈 Estadísticas de Vulnerabilidades[/bold cyan]")
+        lines.append(f"\n[bold cyan]📈 Estadísticas de Vulnerabilidades[/bold cyan]")
+        console.print("\n".join(lines))
         
         # Tabla de distribución por severidad
         severity_table = Table(title="Distribución por Severidad", show_header=True, header_style="bold magenta")
@@ -661,22 +1340,15 @@ def _display_complete_analysis_report(complete_analysis: dict):
         dist_sev = triage_final.get('distribucion_severidad', {})
         total_vulns = triage_final.get('total_vulnerabilidades', 0)
         
-        severity_colors = {
-            'crítica': 'red',
-            'alta': 'orange1',
-            'media': 'yellow',
-            'baja': 'green',
-            'informativa': 'blue'
-        }
-        
         for sev, count in dist_sev.items():
             if count > 0:
                 percentage = (count / total_vulns * 100) if total_vulns > 0 else 0
-                color = severity_colors.get(sev, 'white')
+                color = _SEVERITY_COLORS.get(sev, 'white')
+                # Celdas Text con estilo: Rich no tiene que interpretar markup por fila
                 severity_table.add_row(
-                    f"[{color}]{sev.upper()}[/{color}]",
-                    f"[{color}]{count}[/{color}]",
-                    f"[{color}]{percentage:.1f}%[/{color}]"
+                    Text(sev.upper(), style=color),
+                    Text(str(count), style=color),
+                    Text(f"{percentage:.1f}%", style=color)
                 )
         
         console.print(severity_table)
@@ -688,30 +1360,14 @@ def _display_complete_analysis_report(complete_analysis: dict):
         priority_table.add_column("Descripción", style="dim")
         
         dist_pri = triage_final.get('distribucion_prioridad', {})
-        priority_descriptions = {
-            'P0': 'Crítica - Acción inmediata',
-            'P1': 'Urgente - Resolver en 24h',
-            'P2': 'Alta - Resolver en 1 semana',
-            'P3': 'Media - Resolver en 1 mes',
-            'P4': 'Baja - Resolver cuando sea posible'
-        }
-        
-        priority_colors = {
-            'P0': 'red',
-            'P1': 'orange1',
-            'P2': 'yellow',
-            'P3': 'green',
-            'P4': 'blue'
-        }
         
         for pri, count in dist_pri.items():
             if count > 0:
-                color = priority_colors.get(pri, 'white')
-                desc = priority_descriptions.get(pri, 'N/A')
+                color = _PRIORITY_COLORS.get(pri, 'white')
                 priority_table.add_row(
-                    f"[{color}]{pri}[/{color}]",
-                    f"[{color}]{count}[/{color}]",
-                    f"[dim]{desc}[/dim]"
+                    Text(pri, style=color),
+                    Text(str(count), style=color),
+                    Text(_PRIORITY_DESCRIPTIONS.get(pri, 'N/A'), style="dim")
                 )
         
         console.print(priority_table)
@@ -722,12 +1378,15 @@ def _display_complete_analysis_report(complete_analysis: dict):
             console.print(f"\n[bold cyan]🔍 Vulnerabilidades Detalladas[/bold cyan]")
             
             # Ordenar vulnerabilidades por prioridad (P0, P1, P2, etc.)
-            priority_order = {'P0': 0, 'P1': 1, 'P2': 2, 'P3': 3, 'P4': 4}
-            vulnerabilidades_ordenadas = sorted(
-                vulnerabilidades, 
-                key=lambda v: priority_order.get(v.get('prioridad', 'P4'), 999)
-            )
+            # (prioridad, posición) mantiene el orden original entre iguales sin comparar dicts
+            keyed = [
+                (_PRIORITY_ORDER.get(v.get('prioridad', 'P4'), 999), i, v)
+                for i, v in enumerate(vulnerabilidades)
+            ]
+            keyed.sort()
+            vulnerabilidades_ordenadas = [v for _, _, v in keyed]
             
+            panels = []
             for i, vuln in enumerate(vulnerabilidades_ordenadas, 1):
                 # Panel para cada vulnerabilidad
                 severity = vuln.get('severidad_triage', 'N/A')
@@ -735,66 +1394,76 @@ def _display_complete_analysis_report(complete_analysis: dict):
                 estado = vuln.get('estado_vulnerabilidad', 'N/A')
                 
                 # Colores según severidad
-                severity_color = severity_colors.get(severity, 'white')
-                priority_color = priority_colors.get(priority, 'white')
-                estado_color = 'red' if estado == 'vulnerable' else 'green' if estado == 'no_vulnerable' else 'yellow'
+                severity_color = _SEVERITY_COLORS.get(severity, 'white')
+                priority_color = _PRIORITY_COLORS.get(priority, 'white')
+                estado_color = _ESTADO_COLORS.get(estado, 'yellow')
                 
                 # Crear panel para cada vulnerabilidad
-                vuln_content = f"""[bold]ID:[/bold] {vuln.get('id_vulnerabilidad', 'N/A')}
-[bold]Severidad:[/bold] [{severity_color}]{severity.upper()}[/{severity_color}] | [bold]Prioridad:[/bold] [{priority_color}]{priority}[/{priority_color}] | [bold]Estado:[/bold] [{estado_color}]{estado.upper()}[/{estado_color}]
-
-[bold]Descripción:[/bold]
-{vuln.get('descripcion_original', 'N/A')}
-
-[bold]Justificación de Severidad:[/bold]
-{vuln.get('justificacion_severidad', 'N/A')}
-
-[bold]Impacto Real:[/bold]
-{vuln.get('impacto_real', 'N/A')}"""
+                vuln_content = _VULN_PANEL_TEMPLATE(
+                    id=vuln.get('id_vulnerabilidad', 'N/A'),
+                    sc=severity_color, severidad=severity.upper(),
+                    pc=priority_color, prioridad=priority,
+                    ec=estado_color, estado=estado.upper(),
+                    descripcion=vuln.get('descripcion_original', 'N/A'),
+                    justificacion=vuln.get('justificacion_severidad', 'N/A'),
+                    impacto=vuln.get('impacto_real', 'N/A')
+                )
                 
+                parts = [vuln_content]
                 if vuln.get('explicacion_estado'):
-                    vuln_content += f"\n\n[bold]Explicación del Estado:[/bold]\n{vuln.get('explicacion_estado', '')}"
+                    parts.append(f"\n[bold]Explicación del Estado:[/bold]\n{vuln['explicacion_estado']}")
                 
                 # Evidencias
                 evidencias = vuln.get('evidencias', [])
                 if evidencias:
-                    vuln_content += "\n\n[bold]Evidencias:[/bold]"
+                    parts.append("\n[bold]Evidencias:[/bold]")
                     for j, evidencia in enumerate(evidencias[:2], 1):  # Mostrar máximo 2 evidencias
-                        vuln_content += f"\n  {j}. {evidencia.get('descripcion', 'N/A')}"
-                        if evidencia.get('ubicacion'):
-                            vuln_content += f" ([dim]{evidencia.get('ubicacion')}[/dim])"
+                        ubicacion = evidencia.get('ubicacion')
+                        suffix = f" ([dim]{ubicacion}[/dim])" if ubicacion else ""
+                        parts.append(f"  {j}. {evidencia.get('descripcion', 'N/A')}{suffix}")
                 
                 # Recomendaciones
                 recomendaciones = vuln.get('recomendaciones', [])
                 if recomendaciones:
-                    vuln_content += "\n\n[bold]Recomendaciones:[/bold]"
-                    for j, rec in enumerate(recomendaciones[:2], 1):  # Mostrar máximo 2 recomendaciones
-                        vuln_content += f"\n  {j}. [{rec.get('tipo', 'general').upper()}] {rec.get('descripcion', 'N/A')}"
+                    parts.append("\n[bold]Recomendaciones:[/bold]")
+                    parts.extend(
+                        f"  {j}. [{rec.get('tipo', 'general').upper()}] {rec.get('descripcion', 'N/A')}"
+                        for j, rec in enumerate(recomendaciones[:2], 1)  # Mostrar máximo 2 recomendaciones
+                    )
+                vuln_content = "\n".join(parts)
                 
-                panel = Panel(
+                panels.append(Panel(
                     vuln_content,
                     title=f"[bold]{i}. {vuln.get('nombre', 'Vulnerabilidad sin nombre')}[/bold]",
                     border_style=severity_color,
                     padding=(1, 2)
-                )
-                console.print(panel)
+                ))
+            
+            # Todos los paneles se renderizan y escriben en una sola llamada
+            console.print(Group(*panels))
     
     # Información adicional
+    lines = []
     metadata = complete_analysis.get('metadata', {})
     if metadata:
-        console.print(f"\n[bold cyan]ℹ️  Información del Análisis[/bold cyan]")
-        console.print(f"[dim]• Fecha: {metadata.get('fecha_analisis', 'N/A')}[/dim]")
-        console.print(f"[dim]• Versión: {metadata.get('version_pipeline', 'N/A')}[/dim]")
-        console.print(f"[dim]• Modelo: {metadata.get('modelo_usado', 'N/A')}[/dim]")
-        console.print(f"[dim]• Temperatura: {metadata.get('temperatura', 'N/A')}[/dim]")
+        lines += [
+            f"\n[bold cyan]ℹ️  Información del Análisis[/bold cyan]",
+            f"[dim]• Fecha: {metadata.get('fecha_analisis', 'N/A')}[/dim]",
+            f"[dim]• Versión: {metadata.get('version_pipeline', 'N/A')}[/dim]",
+            f"[dim]• Modelo: {metadata.get('modelo_usado', 'N/A')}[/dim]",
+            f"[dim]• Temperatura: {metadata.get('temperatura', 'N/A')}[/dim]"
+        ]
         
         archivos = metadata.get('archivos_analizados', {})
         if archivos:
-            console.print(f"[dim]• PDF: {archivos.get('pdf', 'N/A')}[/dim]")
-            console.print(f"[dim]• Código fuente: {archivos.get('codigo_fuente', 'N/A')}[/dim]")
-            console.print(f"[dim]• URL objetivo: {archivos.get('url_objetivo', 'N/A')}[/dim]")
+            lines += [
+                f"[dim]• PDF: {archivos.get('pdf', 'N/A')}[/dim]",
+                f"[dim]• Código fuente: {archivos.get('codigo_fuente', 'N/A')}[/dim]",
+                f"[dim]• URL objetivo: {archivos.get('url_objetivo', 'N/A')}[/dim]"
+            ]
     
-    console.print(f"\n[dim]💡 Tip: Use --output para guardar el reporte completo en un archivo JSON[/dim]")
+    lines.append(f"\n[dim]💡 Tip: Use --output para guardar el reporte completo en un archivo JSON[/dim]")
+    console.print("\n".join(lines))
 
 
 def _display_triage_report(json_result: str):
@@ -804,67 +1473,64 @@ def _display_triage_report(json_result: str):
     try:
         data = json.loads(json_result)
         
-        # Título principal
-        console.print("\n[bold green]📊 REPORTE DE TRIAGE DE VULNERABILIDADES[/bold green]")
-        console.print("=" * 60)
+        # Las líneas se acumulan y se imprimen con una sola llamada a Rich
+        lines = [
+            "\n[bold green]📊 REPORTE DE TRIAGE DE VULNERABILIDADES[/bold green]",
+            "=" * 60
+        ]
         
         # Información general
         if 'resumen' in data:
             resumen = data['resumen']
-            console.print(f"\n[bold blue]📋 Resumen General[/bold blue]")
-            console.print(f"• Total de vulnerabilidades: [yellow]{resumen.get('total_vulnerabilidades', 'N/A')}[/yellow]")
-            console.print(f"• Críticas: [red]{resumen.get('criticas', 0)}[/red]")
-            console.print(f"• Altas: [orange1]{resumen.get('altas', 0)}[/orange1]")
-            console.print(f"• Medias: [yellow]{resumen.get('medias', 0)}[/yellow]")
-            console.print(f"• Bajas: [green]{resumen.get('bajas', 0)}[/green]")
-            console.print(f"• Informativas: [blue]{resumen.get('informativas', 0)}[/blue]")
+            lines += [
+                f"\n[bold blue]📋 Resumen General[/bold blue]",
+                f"• Total de vulnerabilidades: [yellow]{resumen.get('total_vulnerabilidades', 'N/A')}[/yellow]",
+                f"• Críticas: [red]{resumen.get('criticas', 0)}[/red]",
+                f"• Altas: [orange1]{resumen.get('altas', 0)}[/orange1]",
+                f"• Medias: [yellow]{resumen.get('medias', 0)}[/yellow]",
+                f"• Bajas: [green]{resumen.get('bajas', 0)}[/green]",
+                f"• Informativas: [blue]{resumen.get('informativas', 0)}[/blue]"
+            ]
         
         # Vulnerabilidades detalladas
         if 'vulnerabilidades' in data:
-            console.print(f"\n[bold blue]🔍 Vulnerabilidades Analizadas[/bold blue]")
+            lines.append(f"\n[bold blue]🔍 Vulnerabilidades Analizadas[/bold blue]")
             
             for i, vuln in enumerate(data['vulnerabilidades'], 1):
-                # Panel para cada vulnerabilidad
                 severity = vuln.get('severidad_triage', vuln.get('severidad', 'N/A'))
                 priority = vuln.get('prioridad', 'N/A')
                 
                 # Colores según severidad
-                severity_colors = {
-                    'Critical': 'red',
-                    'High': 'orange1', 
-                    'Medium': 'yellow',
-                    'Low': 'green',
-                    'Informational': 'blue'
-                }
-                severity_color = severity_colors.get(severity, 'white')
+                severity_color = _LEGACY_SEVERITY_COLORS.get(severity, 'white')
                 
-                console.print(f"\n[bold]{i}. {vuln.get('nombre', 'Sin nombre')}[/bold]")
-                console.print(f"   [bold]Severidad:[/bold] [{severity_color}]{severity}[/{severity_color}] | [bold]Prioridad:[/bold] [cyan]{priority}[/cyan]")
+                lines.append(_TRIAGE_VULN_HEADER(
+                    i=i, nombre=vuln.get('nombre', 'Sin nombre'),
+                    sc=severity_color, severidad=severity, prioridad=priority
+                ))
                 
                 if vuln.get('descripcion'):
-                    console.print(f"   [bold]Descripción:[/bold] {vuln['descripcion'][:100]}{'...' if len(vuln['descripcion']) > 100 else ''}")
+                    lines.append(f"   [bold]Descripción:[/bold] {_truncate(vuln['descripcion'])}")
                 
                 if vuln.get('evidencia'):
-                    console.print(f"   [bold]Evidencia:[/bold] {vuln['evidencia'][:100]}{'...' if len(vuln['evidencia']) > 100 else ''}")
+                    lines.append(f"   [bold]Evidencia:[/bold] {_truncate(vuln['evidencia'])}")
                 
                 if vuln.get('recomendaciones'):
-                    console.print(f"   [bold]Recomendaciones:[/bold] {vuln['recomendaciones'][:100]}{'...' if len(vuln['recomendaciones']) > 100 else ''}")
+                    lines.append(f"   [bold]Recomendaciones:[/bold] {_truncate(vuln['recomendaciones'])}")
                 
-                console.print("   " + "-" * 50)
+                lines.append("   " + "-" * 50)
         
         # Mostrar JSON completo si se desea (opcional)
-        console.print(f"\n[dim]💡 Tip: Use --output para guardar el reporte completo en un archivo[/dim]")
+        lines.append(f"\n[dim]💡 Tip: Use --output para guardar el reporte completo en un archivo[/dim]")
+        console.print("\n".join(lines))
         
     except json.JSONDecodeError:
         console.print("[red]❌ Error: No se pudo parsear el JSON del reporte[/red]")
         # Fallback al formato original
-        syntax = Syntax(json_result, "json", theme="monokai", line_numbers=True)
-        console.print(Panel(syntax, title="📊 Reporte de Triage (JSON)", border_style="green"))
+        _print_json_panel(json_result, "📊 Reporte de Triage (JSON)")
     except Exception as e:
         console.print(f"[red]❌ Error mostrando el reporte: {str(e)}[/red]")
         # Fallback al formato original
-        syntax = Syntax(json_result, "json", theme="monokai", line_numbers=True)
-        console.print(Panel(syntax, title="📊 Reporte de Triage (JSON)", border_style="green"))
+        _print_json_panel(json_result, "📊 Reporte de Triage (JSON)")
 
 
 @app.command("test-mongodb")
@@ -872,6 +1538,7 @@ def test_mongodb():
     """Prueba la conexión con MongoDB."""
     try:
         with LoadingSpinner("Probando conexión con MongoDB...") as spinner:
+            from ..infrastructure.utils.mongodb_client import MongoDBClient
             mongo_client = MongoDBClient()
             success = mongo_client.test_connection()
             
@@ -880,14 +1547,19 @@ def test_mongodb():
             console.print(f"[blue]Base de datos: {mongo_client.database_name}[/blue]")
             console.print(f"[blue]Colección: {mongo_client.collection_name}[/blue]")
         else:
-            console.print("[red]✗ Error conectando con MongoDB[/red]")
-            console.print("[yellow]Verifica la configuración en .env y que MongoDB esté ejecutándose[/yellow]")
-            raise typer.Exit(1)
+            raise _die(
+                "✗ Error conectando con MongoDB",
+                "Verifica la configuración en .env y que MongoDB esté ejecutándose"
+            )
             
+    except typer.Exit:
+        # Salida controlada (errores ya informados con _die)
+        raise
     except Exception as e:
-        console.print(f"[red]Error de conexión con MongoDB: {str(e)}[/red]")
-        console.print("[yellow]Verifica que MongoDB esté ejecutándose y la configuración en .env[/yellow]")
-        raise typer.Exit(1)
+        raise _die(
+            f"Error de conexión con MongoDB: {str(e)}",
+            "Verifica que MongoDB esté ejecutándose y la configuración en .env"
+        )
 
 
 @app.command("triage")
@@ -929,72 +1601,53 @@ def triage_vulnerabilities(
     )
 ):
     """Realiza triage de vulnerabilidades desde un reporte JSON."""
+    from ..infrastructure.utils.factory import get_factory
     try:
-        # Verificar que el archivo existe
-        if not os.path.exists(report):
-            console.print(f"[red]❌ El archivo {report} no existe[/red]")
-            raise typer.Exit(1)
-        
-        # Parsear modelo
-        try:
-            provider, model_name = LLMFactory.parse_model_string(model)
-        except Exception:
-            console.print(f"[red]Error: Formato de modelo inválido: {model}[/red]")
-            console.print("[yellow]Formato válido: 'proveedor' o 'proveedor:modelo'[/yellow]")
-            console.print(f"[yellow]Proveedores soportados: {', '.join(LLMFactory.get_supported_providers())}[/yellow]")
-            raise typer.Exit(1)
-        
-        # Validar configuración
-        if not validate_environment(provider):
-            available = get_available_providers()
-            console.print(f"[red]Error: API key para {provider} no está configurada[/red]")
-            if available:
-                console.print(f"[yellow]Proveedores disponibles: {', '.join(available)}[/yellow]")
-            else:
-                console.print("[yellow]Configure al menos una API key en el archivo .env[/yellow]")
-            raise typer.Exit(1)
+        # Parsear modelo y validar que el proveedor está configurado
+        provider, model_name = _parse_model(model)
         
-        console.print(f"[blue]🎯 Iniciando triage de vulnerabilidades...[/blue]")
-        console.print(f"[blue]📄 Archivo: {report}[/blue]")
-        console.print(f"[blue]🤖 Modelo: {model}[/blue]")
+        console.print(
+            "[blue]🎯 Iniciando triage de vulnerabilidades...[/blue]\n"
+            f"[blue]📄 Archivo: {report}[/blue]\n"
+            f"[blue]🤖 Modelo: {model}[/blue]"
+        )
         
-        with LoadingSpinner("Cargando reporte de seguridad..."):
-            # Cargar reporte JSON
-            import json
-            with open(report, 'r', encoding='utf-8') as f:
-                security_report = json.load(f)
+        # Cargar reporte JSON; la existencia del archivo se valida al abrirlo
+        try:
+            with LoadingSpinner("Cargando reporte de seguridad..."):
+                security_report = _load_json_file(report)
+        except FileNotFoundError:
+            raise _die(f"❌ El archivo {report} no existe")
+        except IsADirectoryError:
+            raise _die(f"❌ {report} no es un archivo")
         
         with LoadingSpinner("Inicializando agente de triage..."):
             # Crear factory y obtener LLM
             factory = get_factory()
             llm_adapter = factory.create_llm(provider, model_name, temperature)
             
-            # Crear caso de uso de triage
-            from ..application.use_cases import TriageVulnerabilitiesUseCase
-            triage_use_case = TriageVulnerabilitiesUseCase(llm_adapter)
+            # Crear caso de uso de triage (agente + servicios de dominio) con el factory
+            triage_use_case = factory.create_triage_use_case(llm=llm_adapter)
         
         with LoadingSpinner("Realizando análisis de triage..."):
-            # Ejecutar triage
-            if output:
-                result_path = triage_use_case.execute_and_export(security_report, output)
-                console.print(f"[green]✅ Triage completado y guardado en: {result_path}[/green]")
-            else:
-                result = triage_use_case.execute_as_json(security_report)
-                console.print("[green]✅ Triage completado[/green]")
-                
-                # Mostrar resultado formateado
-                _display_triage_report(result)
+            # Ejecutar triage una sola vez; la salida y MongoDB reutilizan el resultado
+            triage_data = triage_use_case.execute(security_report)
+            result_json = _dumps_json(triage_data)
+        
+        if output:
+            _write_json_text(result_json, output)
+            console.print(f"[green]✅ Triage completado y guardado en: {output}[/green]")
+        else:
+            console.print("[green]✅ Triage completado[/green]")
+            
+            # Mostrar resultado formateado (las vulnerabilidades están en triage_report)
+            _display_triage_report(_dumps_json(triage_data["triage_report"]))
         
         # Guardar en MongoDB si se solicita
         if mongodb:
             try:
                 with LoadingSpinner("Guardando en MongoDB..."):
-                    client = MongoDBClient()
-                    client.connect()
-                    triage_data = triage_use_case.execute(security_report)
-                    
-                    import json
-                    result_json = json.dumps(triage_data, indent=2, ensure_ascii=False)
+                    client = _get_mongo()
                     document_id = client.save_report(
                         report, 
                         result_json,
@@ -1005,7 +1658,6 @@ def triage_vulnerabilities(
                             'analysis_type': 'triage'
                         }
                     )
-                    client.disconnect()
                     console.print(f"[green]✅ Guardado en MongoDB con ID: {document_id}[/green]")
                     
             except Exception as e:
@@ -1013,13 +1665,14 @@ def triage_vulnerabilities(
         
     except (ReportAnalysisError, LLMConnectionError, JSONParsingError) as e:
         console.print(f"[red]❌ Error de análisis: {str(e)}[/red]")
-        if verbose:
-            console.print_exception()
+        _print_tb(verbose)
         raise typer.Exit(1)
+    except typer.Exit:
+        # Salida controlada (errores ya informados con _die)
+        raise
     except Exception as e:
         console.print(f"[red]❌ Error inesperado: {str(e)}[/red]")
-        if verbose:
-            console.print_exception()
+        _print_tb(verbose)
         raise typer.Exit(1)
 
 
@@ -1071,53 +1724,39 @@ def complete_analysis(
         False,
         "--mongodb",
         help="Guardar el resultado en MongoDB (requiere configuración en .env)"
+    ),
+    pretty: bool = typer.Option(
+        True,
+        "--pretty/--compact",
+        help="JSON de salida indentado (--compact lo genera en una sola línea, más rápido y pequeño)"
     )
 ):
     """Realiza análisis completo: PDF + Análisis Estático + Análisis Dinámico + Triage de vulnerabilidades."""
+    import asyncio
+    from ..infrastructure.utils.factory import get_factory
     try:
-        # Verificar que los archivos y directorios existen
-        if not os.path.exists(pdf):
-            console.print(f"[red]❌ El archivo PDF {pdf} no existe[/red]")
-            raise typer.Exit(1)
+        # Verificar que los archivos y directorios existen y son del tipo esperado
+        _require_path(pdf, False, f"❌ El archivo PDF {pdf} no existe")
+        _require_path(source, True, f"❌ El directorio de código fuente {source} no existe")
         
-        if not os.path.exists(source):
-            console.print(f"[red]❌ El directorio de código fuente {source} no existe[/red]")
-            raise typer.Exit(1)
+        # Parsear modelo y validar que el proveedor está configurado
+        provider, model_name = _parse_model(model)
         
-        # Parsear modelo
-        try:
-            provider, model_name = LLMFactory.parse_model_string(model)
-        except Exception:
-            console.print(f"[red]Error: Formato de modelo inválido: {model}[/red]")
-            console.print("[yellow]Formato válido: 'proveedor' o 'proveedor:modelo'[/yellow]")
-            console.print(f"[yellow]Proveedores soportados: {', '.join(LLMFactory.get_supported_providers())}[/yellow]")
-            raise typer.Exit(1)
-        
-        # Validar configuración
-        if not validate_environment(provider):
-            available = get_available_providers()
-            console.print(f"[red]Error: API key para {provider} no está configurada[/red]")
-            if available:
-                console.print(f"[yellow]Proveedores disponibles: {', '.join(available)}[/yellow]")
-            else:
-                console.print("[yellow]Configure al menos una API key en el archivo .env[/yellow]")
-            raise typer.Exit(1)
-        
-        console.print(f"[blue]🔍 Iniciando análisis completo de seguridad...[/blue]")
-        console.print(f"[blue]📄 PDF: {pdf}[/blue]")
-        console.print(f"[blue]📁 Código fuente: {source}[/blue]")
-        console.print(f"[blue]🌐 URL objetivo: {url}[/blue]")
-        console.print(f"[blue]🤖 Modelo: {model}[/blue]")
+        console.print(
+            "[blue]🔍 Iniciando análisis completo de seguridad...[/blue]\n"
+            f"[blue]📄 PDF: {pdf}[/blue]\n"
+            f"[blue]📁 Código fuente: {source}[/blue]\n"
+            f"[blue]🌐 URL objetivo: {url}[/blue]\n"
+            f"[blue]🤖 Modelo: {model}[/blue]"
+        )
         
         with LoadingSpinner("Inicializando componentes..."):
             # Crear factory y componentes
             factory = get_factory()
             llm_adapter = factory.create_llm(provider, model_name, temperature)
             
-            # Importar agentes
-            from ..infrastructure.services.agents.static_agent import StaticAnalysisAgent
-            from ..infrastructure.services.agents.dynamic_agent import DynamicAnalysisAgent
-            from ..infrastructure.services.agents.triage_agent import TriageAgent
+            # Clases de los agentes
+            StaticAnalysisAgent, DynamicAnalysisAgent, TriageAgent = _agent_classes()
         
         # Paso 1: Análisis del PDF
         console.print("[blue]📄 Paso 1: Analizando reporte PDF...[/blue]")
@@ -1130,20 +1769,23 @@ def complete_analysis(
         
         console.print(f"[green]✅ PDF analizado: {len(pdf_result.get('hallazgos_principales', []))} vulnerabilidades encontradas[/green]")
         
-        # Paso 2: Análisis Estático
+        # Pasos 2 y 3: Análisis estático y dinámico en paralelo
         console.print("[blue]🔍 Paso 2: Ejecutando análisis estático...[/blue]")
-        with LoadingSpinner("Ejecutando análisis estático..."):
-            static_agent = StaticAnalysisAgent(llm_adapter)
-            static_result = static_agent.validate_vulnerabilities(pdf, source)
+        console.print("[blue]🎯 Paso 3: Ejecutando análisis dinámico...[/blue]")
         
-        console.print(f"[green]✅ Análisis estático completado: {static_result.get('vulnerabilidades_vulnerables', 0)}/{static_result.get('vulnerabilidades_reportadas', 0)} vulnerabilidades confirmadas[/green]")
+        async def run_both():
+            # Ambos agentes reutilizan el análisis del PDF del paso 1 en lugar de repetirlo
+            pdf_analysis = asyncio.get_running_loop().create_future()
+            pdf_analysis.set_result(pdf_result)
+            return await asyncio.gather(
+                StaticAnalysisAgent(llm_adapter).avalidate_vulnerabilities(pdf, source, pdf_analysis),
+                DynamicAnalysisAgent(llm_adapter).avalidate_vulnerabilities(pdf, url, pdf_analysis)
+            )
         
-        # Paso 3: Análisis Dinámico
-        console.print("[blue]🎯 Paso 3: Ejecutando análisis dinámico...[/blue]")
-        with LoadingSpinner("Ejecutando análisis dinámico..."):
-            dynamic_agent = DynamicAnalysisAgent(llm_adapter)
-            dynamic_result = dynamic_agent.validate_vulnerabilities(pdf, url)
+        with LoadingSpinner("Ejecutando análisis estático y dinámico..."):
+            static_result, dynamic_result = asyncio.run(run_both())
         
+        console.print(f"[green]✅ Análisis estático completado: {static_result.get('vulnerabilidades_vulnerables', 0)}/{static_result.get('vulnerabilidades_reportadas', 0)} vulnerabilidades confirmadas[/green]")
         console.print(f"[green]✅ Análisis dinámico completado: {dynamic_result.get('vulnerabilidades_vulnerables', 0)}/{dynamic_result.get('vulnerabilidades_reportadas', 0)} vulnerabilidades confirmadas[/green]")
         
         # Paso 4: Triage de vulnerabilidades
@@ -1154,31 +1796,40 @@ def complete_analysis(
             # Combinar evidencias de análisis estático y dinámico
             enhanced_report = pdf_result.copy()
             
-            # Enriquecer vulnerabilidades con evidencia de análisis estático y dinámico
-            for i, hallazgo in enumerate(enhanced_report.get('hallazgos_principales', [])):
+            # Enriquecer vulnerabilidades con evidencia de análisis estático y dinámico.
+            # Los nombres se pasan a minúsculas una sola vez (los vacíos coincidirían
+            # con cualquier título)
+            static_names = [
+                (v.get('nombre', '').lower(), v) for v in static_result.get('vulnerabilidades', []) if v.get('nombre')
+            ]
+            dynamic_names = [
+                (v.get('nombre', '').lower(), v) for v in dynamic_result.get('vulnerabilidades', []) if v.get('nombre')
+            ]
+            
+            for hallazgo in enhanced_report.get('hallazgos_principales', []):
+                titulo = hallazgo.get('titulo', '').lower()
+                
                 # Buscar evidencia en análisis estático
                 static_evidence = None
-                for static_vuln in static_result.get('vulnerabilidades', []):
-                    if static_vuln.get('nombre', '').lower() in hallazgo.get('titulo', '').lower():
-                        static_evidence = {
-                            'tipo': 'analisis_estatico',
-                            'estado': static_vuln.get('estado'),
-                            'evidencia': static_vuln.get('evidencia')
-                        }
-                        break
+                static_vuln = next((v for name, v in static_names if name in titulo), None)
+                if static_vuln is not None:
+                    static_evidence = {
+                        'tipo': 'analisis_estatico',
+                        'estado': static_vuln.get('estado'),
+                        'evidencia': static_vuln.get('evidencia')
+                    }
                 
                 # Buscar evidencia en análisis dinámico
                 dynamic_evidence = None
-                for dynamic_vuln in dynamic_result.get('vulnerabilidades', []):
-                    if dynamic_vuln.get('nombre', '').lower() in hallazgo.get('titulo', '').lower():
-                        dynamic_evidence = {
-                            'tipo': 'analisis_dinamico',
-                            'estado': dynamic_vuln.get('estado'),
-                            'evidencia': dynamic_vuln.get('evidencia'),
-                            'payload_usado': dynamic_vuln.get('payload_usado'),
-                            'respuesta_servidor': dynamic_vuln.get('respuesta_servidor')
-                        }
-                        break
+                dynamic_vuln = next((v for name, v in dynamic_names if name in titulo), None)
+                if dynamic_vuln is not None:
+                    dynamic_evidence = {
+                        'tipo': 'analisis_dinamico',
+                        'estado': dynamic_vuln.get('estado'),
+                        'evidencia': dynamic_vuln.get('evidencia'),
+                        'payload_usado': dynamic_vuln.get('payload_usado'),
+                        'respuesta_servidor': dynamic_vuln.get('respuesta_servidor')
+                    }
                 
                 # Agregar evidencias al hallazgo
                 if 'evidencias_adicionales' not in hallazgo:
@@ -1195,119 +1846,60 @@ def complete_analysis(
         console.print(f"[green]✅ Triage completado: {len(triage_result.vulnerabilidades)} vulnerabilidades procesadas[/green]")
         
         # Determinar estado de vulnerabilidades basado en análisis estático y dinámico
-        vulnerabilidades_con_estado = []
-        
         if verbose:
-            console.print("[blue]🔍 Debug: Comparando IDs y nombres de vulnerabilidades...[/blue]")
-            console.print(f"[dim]Vulnerabilidades del triage: {[(getattr(v, 'id', 'Sin ID'), v.nombre) for v in triage_result.vulnerabilidades]}[/dim]")
-            console.print(f"[dim]Vulnerabilidades del análisis estático: {[(v.get('id', 'Sin ID'), v.get('nombre', 'Sin nombre')) for v in static_result.get('vulnerabilidades', [])]}[/dim]")
-            console.print(f"[dim]Vulnerabilidades del análisis dinámico: {[(v.get('id', 'Sin ID'), v.get('nombre', 'Sin nombre')) for v in dynamic_result.get('vulnerabilidades', [])]}[/dim]")
-        
-        for vuln in triage_result.vulnerabilidades:
-            # Buscar si la vulnerabilidad fue confirmada por análisis estático
-            static_vulnerable = False
-            static_details = None
-            for static_vuln in static_result.get('vulnerabilidades', []):
-                # Primero intentar comparar por ID si ambos tienen ID
-                vuln_id = getattr(vuln, 'id', None)
-                static_id = static_vuln.get('id', None)
-                
-                match_found = False
-                if vuln_id and static_id and vuln_id == static_id:
-                    match_found = True
-                    if verbose:
-                        console.print(f"[green]✅ Coincidencia estática por ID: '{vuln_id}' (Estado: {static_vuln.get('estado', 'desconocido')})[/green]")
-                else:
-                    # Fallback: comparar nombres de vulnerabilidades de forma más flexible
-                    vuln_name_lower = vuln.nombre.lower().strip()
-                    static_name_lower = static_vuln.get('nombre', '').lower().strip()
-                    
-                    # Intentar múltiples formas de coincidencia
-                    if (vuln_name_lower == static_name_lower or 
-                        vuln_name_lower in static_name_lower or 
-                        static_name_lower in vuln_name_lower or
-                        # Comparar sin espacios y caracteres especiales
-                        vuln_name_lower.replace(' ', '').replace('-', '').replace('_', '') == 
-                        static_name_lower.replace(' ', '').replace('-', '').replace('_', '')):
-                        match_found = True
-                        if verbose:
-                            console.print(f"[green]✅ Coincidencia estática por nombre: '{vuln.nombre}' <-> '{static_vuln.get('nombre', '')}' (Estado: {static_vuln.get('estado', 'desconocido')})[/green]")
-                
-                if match_found:
-                    static_vulnerable = static_vuln.get('estado') == 'vulnerable'
-                    if not static_vulnerable:
-                        static_details = static_vuln.get('evidencia', 'No se encontró evidencia de vulnerabilidad en el análisis estático')
-                    break
-        
-            # Buscar si la vulnerabilidad fue confirmada por análisis dinámico
-            dynamic_vulnerable = False
-            dynamic_details = None
-            for dynamic_vuln in dynamic_result.get('vulnerabilidades', []):
-                # Primero intentar comparar por ID si ambos tienen ID
-                vuln_id = getattr(vuln, 'id', None)
-                dynamic_id = dynamic_vuln.get('id', None)
-                
-                match_found = False
-                if vuln_id and dynamic_id and vuln_id == dynamic_id:
-                    match_found = True
-                    if verbose:
-                        console.print(f"[green]✅ Coincidencia dinámica por ID: '{vuln_id}' (Estado: {dynamic_vuln.get('estado', 'desconocido')})[/green]")
-                else:
-                    # Fallback: comparar nombres de vulnerabilidades de forma más flexible
-                    vuln_name_lower = vuln.nombre.lower().strip()
-                    dynamic_name_lower = dynamic_vuln.get('nombre', '').lower().strip()
-                    
-                    # Intentar múltiples formas de coincidencia
-                    if (vuln_name_lower == dynamic_name_lower or 
-                        vuln_name_lower in dynamic_name_lower or 
-                        dynamic_name_lower in vuln_name_lower or
-                        # Comparar sin espacios y caracteres especiales
-                        vuln_name_lower.replace(' ', '').replace('-', '').replace('_', '') == 
-                        dynamic_name_lower.replace(' ', '').replace('-', '').replace('_', '')):
-                        match_found = True
-                        if verbose:
-                            console.print(f"[green]✅ Coincidencia dinámica por nombre: '{vuln.nombre}' <-> '{dynamic_vuln.get('nombre', '')}' (Estado: {dynamic_vuln.get('estado', 'desconocido')})[/green]")
-                
-                if match_found:
-                    dynamic_vulnerable = dynamic_vuln.get('estado') == 'vulnerable'
-                    if not dynamic_vulnerable:
-                        dynamic_details = dynamic_vuln.get('evidencia', 'No se encontró evidencia de vulnerabilidad en el análisis dinámico')
-                    break
+            console.print(
+                "[blue]🔍 Debug: Comparando IDs y nombres de vulnerabilidades...[/blue]\n"
+                f"[dim]Vulnerabilidades del triage: {[(getattr(v, 'id', 'Sin ID'), v.nombre) for v in triage_result.vulnerabilidades]}[/dim]\n"
+                f"[dim]Vulnerabilidades del análisis estático: {[(v.get('id', 'Sin ID'), v.get('nombre', 'Sin nombre')) for v in static_result.get('vulnerabilidades', [])]}[/dim]\n"
+                f"[dim]Vulnerabilidades del análisis dinámico: {[(v.get('id', 'Sin ID'), v.get('nombre', 'Sin nombre')) for v in dynamic_result.get('vulnerabilidades', [])]}[/dim]"
+            )
+        
+        # Índices por ID y nombre normalizado: cada búsqueda deja de recorrer las listas
+        static_index = _index_vulnerabilities(static_result.get('vulnerabilidades', []))
+        dynamic_index = _index_vulnerabilities(dynamic_result.get('vulnerabilidades', []))
+        
+        # El triage se serializa una sola vez; los estados se agregan sobre esos dicts
+        triage_final_con_estados = triage_result.model_dump()
+        
+        for vuln, vuln_dict in zip(triage_result.vulnerabilidades, triage_final_con_estados['vulnerabilidades']):
+            vuln_id = getattr(vuln, 'id', None)
+            vuln_name = vuln.nombre
+            
+            # Buscar si la vulnerabilidad fue confirmada por análisis estático y dinámico
+            static_vulnerable, static_details = _scan_status(
+                vuln_id, vuln_name, static_index, 'estática', 'estático', verbose
+            )
+            dynamic_vulnerable, dynamic_details = _scan_status(
+                vuln_id, vuln_name, dynamic_index, 'dinámica', 'dinámico', verbose
+            )
             
             # Determinar estado final
             if static_vulnerable or dynamic_vulnerable:
                 estado_final = 'vulnerable'
-                explicacion_estado = 'Vulnerabilidad confirmada por '
                 if static_vulnerable and dynamic_vulnerable:
-                    explicacion_estado += 'análisis estático y dinámico'
+                    origen = 'análisis estático y dinámico'
                 elif static_vulnerable:
-                    explicacion_estado += 'análisis estático'
+                    origen = 'análisis estático'
                 else:
-                    explicacion_estado += 'análisis dinámico'
+                    origen = 'análisis dinámico'
+                explicacion_estado = f'Vulnerabilidad confirmada por {origen}'
             else:
                 estado_final = 'no_vulnerable'
-                explicacion_estado = 'Vulnerabilidad no confirmada por ningún análisis. '
-                if static_details and dynamic_details:
-                    explicacion_estado += f'Análisis estático: {static_details}. Análisis dinámico: {dynamic_details}'
-                elif static_details:
-                    explicacion_estado += f'Análisis estático: {static_details}'
-                elif dynamic_details:
-                    explicacion_estado += f'Análisis dinámico: {dynamic_details}'
-                else:
-                    explicacion_estado += 'No se encontraron evidencias en ninguno de los análisis'
+                detalles = []
+                if static_details:
+                    detalles.append(f'Análisis estático: {static_details}')
+                if dynamic_details:
+                    detalles.append(f'Análisis dinámico: {dynamic_details}')
+                explicacion_estado = 'Vulnerabilidad no confirmada por ningún análisis. ' + (
+                    '. '.join(detalles) or 'No se encontraron evidencias en ninguno de los análisis'
+                )
             
             if verbose:
-                console.print(f"[blue]📋 Estado final para '{vuln.nombre}': {estado_final} (Estático: {static_vulnerable}, Dinámico: {dynamic_vulnerable})[/blue]")
+                console.print(f"[blue]📋 Estado final para '{vuln_name}': {estado_final} (Estático: {static_vulnerable}, Dinámico: {dynamic_vulnerable})[/blue]")
             
-            # Crear vulnerabilidad con estado
-            vuln_dict = vuln.model_dump()
+            # Agregar el estado a la vulnerabilidad serializada
             vuln_dict['estado_vulnerabilidad'] = estado_final
             vuln_dict['explicacion_estado'] = explicacion_estado
-            vulnerabilidades_con_estado.append(vuln_dict)
-    
-        # Actualizar el resultado del triage con los estados
-        triage_final_con_estados = triage_result.model_dump()
-        triage_final_con_estados['vulnerabilidades'] = vulnerabilidades_con_estado
         
         # Generar resultado final combinado
         complete_analysis = {
@@ -1329,18 +1921,22 @@ def complete_analysis(
         }
         
         # Mostrar resumen final
-        console.print("[green]✅ Análisis completo finalizado[/green]")
-        console.print("[blue]📊 Resumen del análisis:[/blue]")
-        console.print(f"  [dim]• Vulnerabilidades en PDF: {len(pdf_result.get('hallazgos_principales', []))}[/dim]")
-        console.print(f"  [dim]• Confirmadas por análisis estático: {static_result.get('vulnerabilidades_vulnerables', 0)}[/dim]")
-        console.print(f"  [dim]• Confirmadas por análisis dinámico: {dynamic_result.get('vulnerabilidades_vulnerables', 0)}[/dim]")
-        console.print(f"  [dim]• Vulnerabilidades procesadas en triage: {len(triage_result.vulnerabilidades)}[/dim]")
+        console.print(
+            "[green]✅ Análisis completo finalizado[/green]\n"
+            "[blue]📊 Resumen del análisis:[/blue]\n"
+            f"  [dim]• Vulnerabilidades en PDF: {len(pdf_result.get('hallazgos_principales', []))}[/dim]\n"
+            f"  [dim]• Confirmadas por análisis estático: {static_result.get('vulnerabilidades_vulnerables', 0)}[/dim]\n"
+            f"  [dim]• Confirmadas por análisis dinámico: {dynamic_result.get('vulnerabilidades_vulnerables', 0)}[/dim]\n"
+            f"  [dim]• Vulnerabilidades procesadas en triage: {len(triage_result.vulnerabilidades)}[/dim]"
+        )
+        
+        # Serializar una sola vez para archivo y MongoDB
+        result_json = _dumps_json(complete_analysis, indent=pretty) if output or mongodb else None
         
         # Guardar resultado
         if output:
             try:
-                with open(output, 'w', encoding='utf-8') as f:
-                    json.dump(complete_analysis, f, indent=2, ensure_ascii=False, default=str)
+                _write_json_text(result_json, output)
                 console.print(f"[green]✅ Resultado guardado en: {output}[/green]")
             except Exception as e:
                 console.print(f"[yellow]⚠️ Error guardando archivo: {str(e)}[/yellow]")
@@ -1352,10 +1948,7 @@ def complete_analysis(
         if mongodb:
             try:
                 with LoadingSpinner("Guardando en MongoDB..."):
-                    client = MongoDBClient()
-                    client.connect()
-                    
-                    result_json = json.dumps(complete_analysis, indent=2, ensure_ascii=False, default=str)
+                    client = _get_mongo()
                     document_id = client.save_report(
                             pdf, 
                             result_json,
@@ -1367,9 +1960,9 @@ def complete_analysis(
                                 'model': f"{provider}:{model_name}",
                                 'temperature': temperature,
                                 'analysis_type': 'complete_analysis_v2'
-                            }
+                            },
+                            result_data=complete_analysis
                         )
-                    client.disconnect()
                     console.print(f"[green]✅ Guardado en MongoDB con ID: {document_id}[/green]")
                     
             except Exception as e:
@@ -1377,18 +1970,18 @@ def complete_analysis(
         
     except (PDFNotFoundError, InvalidPDFError, PDFReadError) as e:
         console.print(f"[red]❌ Error con el archivo PDF: {str(e)}[/red]")
-        if verbose:
-            console.print_exception()
+        _print_tb(verbose)
         raise typer.Exit(1)
     except (ReportAnalysisError, LLMConnectionError, JSONParsingError) as e:
         console.print(f"[red]❌ Error de análisis: {str(e)}[/red]")
-        if verbose:
-            console.print_exception()
+        _print_tb(verbose)
         raise typer.Exit(1)
+    except typer.Exit:
+        # Salida controlada (errores ya informados con _die)
+        raise
     except Exception as e:
         console.print(f"[red]❌ Error inesperado: {str(e)}[/red]")
-        if verbose:
-            console.print_exception()
+        _print_tb(verbose)
         raise typer.Exit(1)
 
 
@@ -320,6 +320,28 @@ def complete_analysis(
         False,
         "--mongodb",
         help="Guardar el resultado en MongoDB"
+    ),
+    concurrency: Optional[int] = typer.Option(
+        None,
+        "--concurrency",
+        "-c",
+        min=1,
+        help="Máximo de vulnerabilidades analizadas a la vez en el triage (por defecto TRIAGE_MAX_CONCURRENCY)"
+    ),
+    batch_api: bool = typer.Option(
+        False,
+        "--batch-api",
+        help="Enviar la clasificación del triage como lote a la Batch API (OpenAI/Anthropic); más barato pero puede tardar"
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="No reutilizar respuestas del LLM guardadas en caché"
+    ),
+    fast_insert: bool = typer.Option(
+        False,
+        "--fast-insert",
+        help="Guardar en MongoDB sin esperar confirmación del servidor (write concern w=0)"
     )
 ):
     """Realizar análisis completo de seguridad."""
@@ -333,7 +355,11 @@ def complete_analysis(
             model=model,
             temperature=temperature,
             verbose=verbose,
-            mongodb=mongodb
+            mongodb=mongodb,
+            concurrency=concurrency,
+            batch_api=batch_api,
+            no_cache=no_cache,
+            fast_insert=fast_insert
         )
     except Exception as e:
         console.print(f"❌ Error: {str(e)}", style="red")
@@ -1,10 +1,15 @@
 """Base command class following Command pattern."""
 
+import json
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 from rich.console import Console
 from ..utils.loading_spinner import LoadingSpinner
-from ...infrastructure.utils.factory import get_simple_factory
+from ...infrastructure.utils.simple_factory import get_simple_factory
 from ...infrastructure.adapters.persistence.mongodb_client import MongoDBClient
 
 
@@ -27,24 +32,59 @@ class BaseCommand(ABC):
             return provider, model_name
         return model, None
     
+    @staticmethod
+    def _json_dumps(obj: Any) -> bytes:
+        """Serialize to indented UTF-8 JSON bytes, using orjson when available."""
+        if orjson is not None:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+    
     def _save_to_file(self, data: Dict[str, Any], output_path: str) -> None:
         """Save data to JSON file."""
-        import json
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(self._json_dumps(data))
         self.console.print(f"✅ Resultado guardado en: {output_path}", style="green")
     
-    def _save_to_mongodb(self, data: Dict[str, Any], collection: str) -> None:
-        """Save data to MongoDB."""
+    def _save_to_mongodb(self, data: Dict[str, Any], collection: str, fast: bool = False) -> Optional[str]:
+        """Save data to MongoDB and return the inserted ID (None on failure)."""
         try:
-            client = MongoDBClient()
-            result = client.insert_document(collection, data)
+            client = MongoDBClient.instance()
+            result = client.insert_document(collection, data, fast=fast)
             if result:
                 self.console.print(f"✅ Resultado guardado en MongoDB (ID: {result})", style="green")
             else:
                 self.console.print("❌ Error al guardar en MongoDB", style="red")
+            return result
+        except Exception as e:
+            self.console.print(f"❌ Error de MongoDB: {str(e)}", style="red")
+            return None
+    
+    def _save_many_to_mongodb(
+        self,
+        docs: List[Dict[str, Any]],
+        collection: str,
+        batch_size: int = 100,
+        fast: bool = False
+    ) -> List[str]:
+        """Save several documents to MongoDB with batched insert_many calls.
+        
+        These are rows derived from an already validated parent document, so
+        collection validators are bypassed for them.
+        """
+        if not docs:
+            return []
+        try:
+            client = MongoDBClient.instance()
+            inserted_ids = client.insert_documents(
+                collection, docs, batch_size=batch_size, fast=fast, bypass_validation=True
+            )
+            self.console.print(
+                f"✅ {len(inserted_ids)} documentos guardados en MongoDB ({collection})", style="green"
+            )
+            return inserted_ids
         except Exception as e:
             self.console.print(f"❌ Error de MongoDB: {str(e)}", style="red")
+            return []
     
     def _handle_error(self, error: Exception, context: str = "") -> None:
         """Handle and display errors consistently."""
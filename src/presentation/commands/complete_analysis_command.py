@@ -1,11 +1,26 @@
 """Complete analysis command implementation."""
 
+import asyncio
 from typing import Optional, Dict, Any
+from rich.console import Group
 from rich.panel import Panel
 from .base_command import BaseCommand
 from ..utils.loading_spinner import LoadingSpinner
 
 
+# Recommendation types (Spanish or English) mapped to their Spanish display name
+_TIPO_MAP = {
+    'INMEDIATA': 'INMEDIATA',
+    'IMMEDIATE': 'INMEDIATA',
+    'CORRECTIVA': 'CORRECTIVA',
+    'CORRECTIVE': 'CORRECTIVA',
+    'PREVENTIVA': 'PREVENTIVA',
+    'PREVENTIVE': 'PREVENTIVA',
+    'MITIGACIÓN': 'MITIGACIÓN',
+    'MITIGATION': 'MITIGACIÓN'
+}
+
+
 class CompleteAnalysisCommand(BaseCommand):
     """Command for complete security analysis workflow."""
     
@@ -18,12 +33,30 @@ class CompleteAnalysisCommand(BaseCommand):
         model: str = "openai",
         temperature: float = 0.1,
         verbose: bool = False,
-        mongodb: bool = False
+        mongodb: bool = False,
+        concurrency: Optional[int] = None,
+        batch_api: bool = False,
+        no_cache: bool = False,
+        fast_insert: bool = False
     ) -> Dict[str, Any]:
-        """Execute complete security analysis."""
+        """Execute complete security analysis.
+        
+        concurrency limits the simultaneous per-vulnerability triage LLM calls
+        (defaults to TRIAGE_MAX_CONCURRENCY). batch_api sends the triage
+        classification through the OpenAI/Anthropic Batch API instead.
+        no_cache disables the persistent LLM response cache. fast_insert
+        writes the MongoDB documents without waiting for acknowledgement.
+        """
         
         provider, model_name = self._parse_model_parameter(model)
         
+        if batch_api and provider not in ("openai", "anthropic"):
+            self.console.print(
+                f"⚠️ --batch-api solo está disponible con OpenAI y Anthropic; "
+                f"el triage con '{provider}' usará llamadas individuales",
+                style="yellow"
+            )
+        
         if verbose:
             self._display_verbose_info({
                 "Archivo PDF": pdf,
@@ -33,32 +66,20 @@ class CompleteAnalysisCommand(BaseCommand):
                 "Modelo": model_name or "Por defecto",
                 "Temperatura": temperature,
                 "Archivo de salida": output or "No especificado",
-                "MongoDB": "Sí" if mongodb else "No"
+                "MongoDB": "Sí" if mongodb else "No",
+                "Concurrencia de triage": concurrency or "Por defecto",
+                "Batch API en triage": "Sí" if batch_api else "No",
+                "Caché de LLM": "No" if no_cache else "Sí"
             })
         
         try:
-            # Create complete analysis use case
-            from ...application.use_cases import CompleteSecurityAnalysisUseCase
-            
-            complete_use_case = self.factory.create_complete_analysis_use_case(
-                provider=provider,
-                model_name=model_name,
-                temperature=temperature
+            result = asyncio.run(
+                self._run_analysis(
+                    pdf, source, url, provider, model_name, temperature,
+                    concurrency, batch_api, no_cache
+                )
             )
             
-            with LoadingSpinner("Realizando análisis completo...") as spinner:
-                spinner.update_message("Fase 1: Análisis de PDF...")
-                # Execute complete analysis
-                result = complete_use_case.execute(pdf, source, url)
-                
-                spinner.update_message("Fase 2: Análisis estático...")
-                # Additional phases handled by use case
-                
-                spinner.update_message("Fase 3: Análisis dinámico...")
-                # Final processing
-                
-                spinner.update_message("Generando reporte consolidado...")
-            
             # Display results
             self._display_complete_results(result)
             
@@ -67,7 +88,7 @@ class CompleteAnalysisCommand(BaseCommand):
                 self._save_to_file(result, output)
             
             if mongodb:
-                self._save_to_mongodb(result, "complete_analysis")
+                self._save_analysis_to_mongodb(result, pdf, fast_insert)
             
             return result
             
@@ -75,16 +96,63 @@ class CompleteAnalysisCommand(BaseCommand):
             self._handle_error(e, "de análisis completo")
             raise
     
+    async def _run_analysis(
+        self,
+        pdf: str,
+        source: str,
+        url: str,
+        provider: str,
+        model_name: Optional[str],
+        temperature: float,
+        concurrency: Optional[int] = None,
+        batch_api: bool = False,
+        no_cache: bool = False
+    ) -> Dict[str, Any]:
+        """Run PDF analysis, static and dynamic validation concurrently, then triage."""
+        complete_use_case = self.factory.create_complete_analysis_use_case(
+            provider=provider,
+            model_name=model_name,
+            temperature=temperature,
+            triage_concurrency=concurrency,
+            triage_batch_api=batch_api,
+            use_cache=not no_cache
+        )
+        
+        with LoadingSpinner("Realizando análisis completo...") as spinner:
+            spinner.update_message("Analizando PDF, código fuente y aplicación en paralelo...")
+            try:
+                return await complete_use_case.aexecute(pdf, source, url)
+            except asyncio.CancelledError:
+                # Ctrl-C: the triage batch is awaited in a worker thread, cancel it explicitly
+                from ...infrastructure.utils.llm_batch import cancel_active_batches
+                cancel_active_batches()
+                raise
+    
+    def _save_analysis_to_mongodb(self, result: Dict[str, Any], pdf: str, fast: bool = False) -> None:
+        """Save the analysis document plus one row per vulnerability (bulk inserted)."""
+        analysis_id = self._save_to_mongodb(result, "complete_analysis", fast=fast)
+        if not analysis_id:
+            # Without the parent document the rows would be orphaned
+            return
+        
+        triage_report = result.get("detailed_analysis", {}).get("triage_report", {})
+        rows = [
+            {**vuln, "analysis_id": analysis_id, "source_file": pdf}
+            for vuln in triage_report.get("vulnerabilidades", [])
+        ]
+        self._save_many_to_mongodb(rows, "complete_analysis_vulnerabilities", fast=fast)
+    
     def _display_complete_results(self, result: Dict[str, Any]) -> None:
-        """Display complete analysis results."""
-        from rich.table import Table
+        """Display complete analysis results with a single console write."""
+        from rich.rule import Rule
+        from rich.text import Text
         
         # Display summary
         detailed_analysis = result.get("detailed_analysis", {})
         triage_report = detailed_analysis.get("triage_report", {})
-        vulnerabilities = triage_report.get("vulnerabilities", [])
+        vulnerabilities = triage_report.get("vulnerabilidades", [])
         
-        self.console.print(Panel(
+        renderables = [Panel(
             f"📊 **Análisis Completo Finalizado**\n"
             f"📄 **PDF:** Analizado\n"
             f"🔍 **Código:** Escaneado\n"
@@ -92,23 +160,27 @@ class CompleteAnalysisCommand(BaseCommand):
             f"⚠️ **Total vulnerabilidades:** {len(vulnerabilities)}",
             title="Resumen del Análisis Completo",
             border_style="magenta"
-        ))
+        )]
         
         # Display detailed vulnerabilities
         if vulnerabilities:
-            self.console.print("\n" + "="*100)
-            self.console.print("📋 **INFORME DETALLADO DE VULNERABILIDADES**", style="bold blue")
-            self.console.print("="*100 + "\n")
-            
+            renderables.append("")
+            renderables.append(Rule(
+                Text("📋 **INFORME DETALLADO DE VULNERABILIDADES**", style="bold blue"),
+                characters="=",
+                style="blue"
+            ))
+            renderables.append("")
             for i, vuln in enumerate(vulnerabilities, 1):
-                self._display_detailed_vulnerability_panel(vuln, i)
-                if i < len(vulnerabilities):
-                    self.console.print("\n")
+                if i > 1:
+                    renderables.append("\n")
+                renderables.append(self._build_detailed_vulnerability_panel(vuln, i))
         
-        self.console.print("\n🎉 Análisis completo finalizado exitosamente", style="green bold")
+        renderables.append(Text("\n🎉 Análisis completo finalizado exitosamente", style="green bold"))
+        self.console.print(Group(*renderables))
     
-    def _display_detailed_vulnerability_panel(self, vuln: Dict[str, Any], vuln_number: int) -> None:
-        """Display detailed vulnerability panel with technical evidence."""
+    def _build_detailed_vulnerability_panel(self, vuln: Dict[str, Any], vuln_number: int) -> Panel:
+        """Build detailed vulnerability panel with technical evidence."""
         from rich.text import Text
         
         # Extract vulnerability data
@@ -133,17 +205,17 @@ class CompleteAnalysisCommand(BaseCommand):
         # Description
         content_lines.append("Descripción:")
         descripcion = vuln.get('descripcion_original', 'No disponible')
-        content_lines.append(self._wrap_text(descripcion, 100))
+        content_lines.append(descripcion)
         content_lines.append("")
         
         # Severity justification
         content_lines.append("Justificación de Severidad:")
-        content_lines.append(self._wrap_text(justificacion_severidad, 100))
+        content_lines.append(justificacion_severidad)
         content_lines.append("")
         
         # Real impact
         content_lines.append("Impacto Real:")
-        content_lines.append(self._wrap_text(impacto_real, 100))
+        content_lines.append(impacto_real)
         content_lines.append("")
         
         # Analysis explanation
@@ -167,55 +239,38 @@ class CompleteAnalysisCommand(BaseCommand):
                 rec_text = self._format_recommendation(rec, i)
                 content_lines.append(rec_text)
         
-        # Create and display panel
+        # Create panel (Rich soft-wraps long lines to the terminal width)
         panel_content = "\n".join(content_lines)
-        self.console.print(Panel(
+        return Panel(
             panel_content,
             title=panel_title,
             border_style="red",
             padding=(1, 2)
-        ))
-    
-    def _wrap_text(self, text: str, width: int) -> str:
-        """Wrap text to specified width."""
-        import textwrap
-        return "\n".join(textwrap.wrap(text, width=width))
+        )
     
     def _generate_analysis_explanation(self, vuln: Dict[str, Any], evidencias: list) -> str:
         """Generate detailed explanation of how the vulnerability was confirmed."""
         explanation_parts = []
         
-        # Analyze dynamic evidence
-        dynamic_evidence = [ev for ev in evidencias if ev.get('tipo_evidencia') in ['respuesta_http', 'archivo']]
-        if dynamic_evidence:
-            dynamic_details = []
-            for ev in dynamic_evidence:
-                if ev.get('tipo_evidencia') == 'respuesta_http':
-                    if ev.get('ubicacion'):
-                        dynamic_details.append(f"pruebas HTTP en {ev.get('ubicacion')}")
-                    else:
-                        dynamic_details.append("pruebas de respuesta HTTP")
-                elif ev.get('tipo_evidencia') == 'archivo':
-                    dynamic_details.append(f"análisis de archivos ({ev.get('ubicacion', 'ubicación no especificada')})")
-            
-            if dynamic_details:
-                explanation_parts.append(f"análisis dinámico mediante {', '.join(dynamic_details)}")
+        # Split dynamic and static evidence in a single pass
+        dynamic_details, static_details = [], []
+        for ev in evidencias:
+            tipo = ev.get('tipo_evidencia')
+            if tipo == 'respuesta_http':
+                ubicacion = ev.get('ubicacion')
+                dynamic_details.append(f"pruebas HTTP en {ubicacion}" if ubicacion else "pruebas de respuesta HTTP")
+            elif tipo == 'archivo':
+                dynamic_details.append(f"análisis de archivos ({ev.get('ubicacion', 'ubicación no especificada')})")
+            elif tipo == 'código':
+                ubicacion = ev.get('ubicacion')
+                static_details.append(f"revisión de código en {ubicacion}" if ubicacion else "análisis de código fuente")
+            elif tipo == 'configuración':
+                static_details.append(f"análisis de configuración ({ev.get('ubicacion', 'ubicación no especificada')})")
         
-        # Analyze static evidence
-        static_evidence = [ev for ev in evidencias if ev.get('tipo_evidencia') in ['código', 'configuración']]
-        if static_evidence:
-            static_details = []
-            for ev in static_evidence:
-                if ev.get('tipo_evidencia') == 'código':
-                    if ev.get('ubicacion'):
-                        static_details.append(f"revisión de código en {ev.get('ubicacion')}")
-                    else:
-                        static_details.append("análisis de código fuente")
-                elif ev.get('tipo_evidencia') == 'configuración':
-                    static_details.append(f"análisis de configuración ({ev.get('ubicacion', 'ubicación no especificada')})")
-            
-            if static_details:
-                explanation_parts.append(f"análisis estático mediante {', '.join(static_details)}")
+        if dynamic_details:
+            explanation_parts.append(f"análisis dinámico mediante {', '.join(dynamic_details)}")
+        if static_details:
+            explanation_parts.append(f"análisis estático mediante {', '.join(static_details)}")
         
         # Build final explanation
         if explanation_parts:
@@ -241,13 +296,14 @@ class CompleteAnalysisCommand(BaseCommand):
         criticidad = evidencia.get('criticidad_evidencia', 'medio')
         
         # Start with basic description and criticality
-        evidence_text = f"  {index}. [{tipo.upper()}] {descripcion}"
+        header = f"  {index}. [{tipo.upper()}] {descripcion}"
         if criticidad:
-            evidence_text += f" [Criticidad: {criticidad.upper()}]"
+            header += f" [Criticidad: {criticidad.upper()}]"
+        parts = [header]
         
         # Add detailed technical information based on evidence type
         if tipo == 'respuesta_http' and contenido:
-            evidence_text += "\n     📡 Detalles HTTP:"
+            parts.append("     📡 Detalles HTTP:")
             # Format HTTP content for better readability
             if '\\n' in contenido:
                 # Replace escaped newlines with actual newlines for better formatting
@@ -259,44 +315,44 @@ class CompleteAnalysisCommand(BaseCommand):
                     if len(lines) > 10:
                         key_lines = lines[:5] + ['     [... contenido truncado ...]'] + lines[-3:]
                         formatted_content = '\n'.join(key_lines)
-                evidence_text += f"\n     {formatted_content}"
+                parts.append(f"     {formatted_content}")
             else:
-                evidence_text += f"\n     {contenido}"
+                parts.append(f"     {contenido}")
             
             if ubicacion:
-                evidence_text += f"\n     🎯 Endpoint: {ubicacion}"
+                parts.append(f"     🎯 Endpoint: {ubicacion}")
                 
         elif tipo == 'código' and contenido:
-            evidence_text += "\n     💻 Código/Payload:"
+            parts.append("     💻 Código/Payload:")
             # Format code content
             if len(contenido) > 300:
-                evidence_text += f"\n     {contenido[:300]}..."
+                parts.append(f"     {contenido[:300]}...")
             else:
-                evidence_text += f"\n     {contenido}"
+                parts.append(f"     {contenido}")
             
             if ubicacion:
-                evidence_text += f"\n     📁 Ubicación: {ubicacion}"
+                parts.append(f"     📁 Ubicación: {ubicacion}")
                 
         elif tipo == 'archivo' and ubicacion:
-            evidence_text += f"\n     📄 Archivo: {ubicacion}"
+            parts.append(f"     📄 Archivo: {ubicacion}")
             if contenido:
-                evidence_text += f"\n     📋 Contenido: {contenido[:200]}{'...' if len(contenido) > 200 else ''}"
+                parts.append(f"     📋 Contenido: {contenido[:200]}{'...' if len(contenido) > 200 else ''}")
                 
         elif tipo == 'configuración':
             if contenido:
-                evidence_text += f"\n     ⚙️ Configuración: {contenido}"
+                parts.append(f"     ⚙️ Configuración: {contenido}")
             if ubicacion:
-                evidence_text += f"\n     📍 Ubicación: {ubicacion}"
+                parts.append(f"     📍 Ubicación: {ubicacion}")
         
         # Add location info if not already included
-        elif ubicacion and not any(x in evidence_text.lower() for x in ['endpoint:', 'ubicación:', 'archivo:']):
-            evidence_text += f"\n     📍 Ubicación: {ubicacion}"
+        elif ubicacion and not any(x in header.lower() for x in ['endpoint:', 'ubicación:', 'archivo:']):
+            parts.append(f"     📍 Ubicación: {ubicacion}")
             
         # Add content if not already included and it's short enough
-        elif contenido and len(contenido) < 150 and 'contenido:' not in evidence_text.lower():
-            evidence_text += f"\n     📋 Detalles: {contenido}"
+        elif contenido and len(contenido) < 150 and 'contenido:' not in header.lower():
+            parts.append(f"     📋 Detalles: {contenido}")
         
-        return evidence_text
+        return "\n".join(parts)
     
     def _format_recommendation(self, recomendacion: Dict[str, Any], index: int) -> str:
         """Format recommendation for display."""
@@ -304,16 +360,5 @@ class CompleteAnalysisCommand(BaseCommand):
         descripcion = recomendacion.get('descripcion', 'Sin descripción')
         
         # Map recommendation types to Spanish
-        tipo_map = {
-            'INMEDIATA': 'INMEDIATA',
-            'IMMEDIATE': 'INMEDIATA', 
-            'CORRECTIVA': 'CORRECTIVA',
-            'CORRECTIVE': 'CORRECTIVA',
-            'PREVENTIVA': 'PREVENTIVA',
-            'PREVENTIVE': 'PREVENTIVA',
-            'MITIGACIÓN': 'MITIGACIÓN',
-            'MITIGATION': 'MITIGACIÓN'
-        }
-        
-        tipo_display = tipo_map.get(tipo, tipo)
+        tipo_display = _TIPO_MAP.get(tipo, tipo)
         return f"  {index}. [{tipo_display}] {descripcion}"
\ No newline at end of file